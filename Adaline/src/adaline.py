@@ -4,6 +4,12 @@
 
 import random
 import math
+import numpy as np
+
+def _bits_de_valores(valores, num_bits):
+    """Desempaqueta cada entero de 'valores' en sus 'num_bits' bits (el más significativo primero)."""
+    desplazamientos = np.arange(num_bits - 1, -1, -1, dtype=np.int64)
+    return ((valores[:, None] >> desplazamientos) & 1).astype(np.uint8)
 
 def generar_datos_binarios(num_bits):
     """
@@ -13,24 +19,28 @@ def generar_datos_binarios(num_bits):
         num_bits (int): El número de bits de entrada (ej. 2, 3, 4).
 
     Returns:
-        tuple: Una tupla con la lista de entradas (X) y la lista de salidas (Y).
+        tuple: (X, Y) como arrays de NumPy: X es (2^num_bits x num_bits) con los
+               bits de cada número (uint8) e Y su valor decimal.
+    """
+    # --- MODIFICADO: Desempaquetado de bits de np.arange en lugar de format()/zfill por patrón ---
+    if not 1 <= num_bits <= 62:
+        raise ValueError("num_bits debe estar entre 1 y 62.")
+    Y_data = np.arange(2**num_bits, dtype=np.int64)
+    return _bits_de_valores(Y_data, num_bits), Y_data
+
+# --- NUEVO: Generación por bloques para muchos bits ---
+def generar_datos_binarios_por_bloques(num_bits, tamano_bloque=65536):
     """
-    X_data = []
-    Y_data = []
+    Igual que generar_datos_binarios, pero entrega los 2^num_bits patrones en
+    bloques (X_bloque, Y_bloque) de como máximo 'tamano_bloque' filas, así nunca
+    hay más de un bloque en memoria.
+    """
+    if not 1 <= num_bits <= 62:
+        raise ValueError("num_bits debe estar entre 1 y 62.")
     num_patrones = 2**num_bits
-    for i in range(num_patrones):
-        # La salida deseada es simplemente el valor decimal.
-        Y_data.append(i)
-        
-        # Convierte el número a su representación binaria en texto.
-        # .zfill(num_bits) asegura que tenga el número correcto de bits (ej. '01' en vez de '1').
-        binario_str = format(i, 'b').zfill(num_bits)
-        
-        # Convierte el texto binario en una lista de enteros (ej. '01' -> [0, 1]).
-        patron_actual = [int(bit) for bit in binario_str]
-        X_data.append(patron_actual)
-        
-    return X_data, Y_data
+    for inicio in range(0, num_patrones, tamano_bloque):
+        Y_bloque = np.arange(inicio, min(inicio + tamano_bloque, num_patrones), dtype=np.int64)
+        yield _bits_de_valores(Y_bloque, num_bits), Y_bloque
 
 class Adaline:
     """
@@ -55,9 +65,17 @@ class Adaline:
 
     def _suma_ponderada(self, entradas):
         """Calcula la salida lineal de la neurona (sin función de activación)."""
-        entradas_con_sesgo = [self.valor_sesgo] + entradas
-        suma = sum(p * e for p, e in zip(self.pesos, entradas_con_sesgo))
-        return suma
+        return self.valor_sesgo * self.pesos[0] + float(np.dot(self.pesos[1:], entradas))
+
+    # --- NUEVO: Matriz de entradas con la columna del sesgo ---
+    def _matriz_con_sesgo(self, X):
+        """Convierte X (lista de patrones o array N x D) en una matriz N x (D+1) con el sesgo en la columna 0."""
+        X = np.asarray(X, dtype=np.float64).reshape(-1, self.num_entradas)
+        return np.hstack([np.full((len(X), 1), float(self.valor_sesgo)), X])
+
+    def predecir_lote(self, X):
+        """Salida lineal para todos los patrones de X a la vez."""
+        return self._matriz_con_sesgo(X) @ np.asarray(self.pesos, dtype=np.float64)
 
     def predecir(self, entradas):
         """
@@ -66,10 +84,43 @@ class Adaline:
         """
         return self._suma_ponderada(entradas)
 
-    def entrenar(self, X_entrenamiento, Y_entrenamiento, error_deseado, callback=None):
+    def entrenar(self, X_entrenamiento, Y_entrenamiento, error_deseado, callback=None, modo="gradiente",
+                 imprimir_cada=1):
         """
         Ejecuta el algoritmo de entrenamiento de Adaline usando la Regla Delta por lotes.
+
+        Args:
+            modo (str): 'gradiente' (Regla Delta por lotes, una actualización por época)
+                        o 'minimos_cuadrados' (solución cerrada por QR, una sola "época").
+            imprimir_cada (int): Cada cuántas épocas se imprime el progreso (0 = nunca).
         """
+        # --- MODIFICADO: Todo el lote se procesa con operaciones matriciales ---
+        X = self._matriz_con_sesgo(X_entrenamiento)
+        Y = np.asarray(Y_entrenamiento, dtype=np.float64).reshape(-1)
+        if modo == "minimos_cuadrados":
+            return self._entrenar_minimos_cuadrados(X, Y, error_deseado, callback)
+        if modo != "gradiente":
+            raise ValueError(f"Modo '{modo}' no reconocido. Use 'gradiente' o 'minimos_cuadrados'.")
+
+        return self._bucle_regla_delta(lambda: [(X, Y)], error_deseado, callback, imprimir_cada)
+
+    # --- NUEVO: Entrenamiento sin tener todos los patrones en memoria ---
+    def entrenar_por_bloques(self, crear_bloques, error_deseado, callback=None, imprimir_cada=1):
+        """
+        Regla Delta por lotes sobre datos que llegan en bloques. 'crear_bloques' es una
+        función sin argumentos que devuelve un iterador nuevo de (X_bloque, Y_bloque) en
+        cada época, ej.: lambda: generar_datos_binarios_por_bloques(20).
+        El gradiente y el error se acumulan sobre todos los bloques y los pesos se
+        actualizan una vez por época, igual que en entrenar().
+        """
+        def bloques_con_sesgo():
+            for X_bloque, Y_bloque in crear_bloques():
+                yield self._matriz_con_sesgo(X_bloque), np.asarray(Y_bloque, dtype=np.float64).reshape(-1)
+        return self._bucle_regla_delta(bloques_con_sesgo, error_deseado, callback, imprimir_cada)
+
+    def _bucle_regla_delta(self, crear_bloques, error_deseado, callback, imprimir_cada):
+        """Bucle de épocas común a entrenar() y entrenar_por_bloques()."""
+        pesos = np.asarray(self.pesos, dtype=np.float64)
         epoca = 0
         mse_inicial = math.inf # Se inicializa el MSE en infinito
         mse_anterior = math.inf # Variable para guardar el MSE de la época pasada
@@ -80,34 +131,27 @@ class Adaline:
             
             # --- Fase 1: Calcular errores y gradientes para todo el lote ---
             errores_cuadraticos_sum = 0.0
-            ajustes_para_pesos = [0.0] * len(self.pesos) # Acumulador para los ajustes
-
-            for entradas, y_esperada in zip(X_entrenamiento, Y_entrenamiento):
+            ajustes_para_pesos = np.zeros_like(pesos) # Acumulador para los ajustes
+            num_patrones = 0
+            for X, Y in crear_bloques():
                 # La salida para el cálculo del error es la suma ponderada (lineal).
-                salida_lineal = self._suma_ponderada(entradas)
-                
-                # El error es la diferencia entre lo deseado y la salida lineal.
-                error = y_esperada - salida_lineal
-                
-                errores_cuadraticos_sum += error**2
-                
-                # Acumula el ajuste para cada peso (Regla Delta).
-                # No se aplican todavía.
-                ajustes_para_pesos[0] += self.tasa_aprendizaje * error * self.valor_sesgo
-                for i in range(self.num_entradas):
-                    ajustes_para_pesos[i + 1] += self.tasa_aprendizaje * error * entradas[i]
-
-            # --- Fase 2: Actualizar los pesos (una sola vez por época) ---
-            for i in range(len(self.pesos)):
-                self.pesos[i] += ajustes_para_pesos[i]
+                errores = Y - X @ pesos
+                errores_cuadraticos_sum += float(errores @ errores)
+                ajustes_para_pesos += self.tasa_aprendizaje * (X.T @ errores)
+                num_patrones += len(X)
+
+            # --- Fase 2: Actualizar los pesos (una sola vez por época, Regla Delta) ---
+            pesos += ajustes_para_pesos
+            self.pesos = pesos.tolist()
             
             # --- Fase 3: Calcular el MSE y comprobar las condiciones de parada ---
-            mse_actual = errores_cuadraticos_sum / len(X_entrenamiento)
+            mse_actual = errores_cuadraticos_sum / num_patrones
             
             if epoca == 1:
                 mse_inicial = mse_actual
 
-            print(f"> Epoca: {epoca}, MSE: {mse_actual:.6f}, Pesos: {[round(p, 4) for p in self.pesos]}")
+            if imprimir_cada and epoca % imprimir_cada == 0:
+                print(f"> Epoca: {epoca}, MSE: {mse_actual:.6f}, Pesos: {[round(p, 4) for p in self.pesos]}")
 
             # Llamar al callback de la GUI para la visualización en tiempo real
             if callback:
@@ -132,6 +176,36 @@ class Adaline:
             
         return self.pesos
 
+    # --- NUEVO: Solución cerrada de mínimos cuadrados ---
+    def _entrenar_minimos_cuadrados(self, X, Y, error_deseado, callback=None):
+        """
+        Resuelve min ||X w - Y||^2 directamente con una factorización QR (más estable
+        que las ecuaciones normales X^T X w = X^T Y). Si X no tiene rango completo
+        se usa lstsq (SVD). Se informa como una única época: 'mse_inicial' es el MSE
+        de los pesos aleatorios iniciales, para que la precisión del callback tenga sentido.
+        """
+        errores_iniciales = Y - X @ np.asarray(self.pesos, dtype=np.float64)
+        mse_inicial = float(errores_iniciales @ errores_iniciales) / len(X)
+
+        Q, R = np.linalg.qr(X)
+        diagonal = np.abs(np.diag(R))
+        if len(X) >= X.shape[1] and diagonal.min() > 1e-10 * diagonal.max():
+            pesos = np.linalg.solve(R, Q.T @ Y)
+        else:
+            pesos = np.linalg.lstsq(X, Y, rcond=None)[0]
+        self.pesos = pesos.tolist()
+
+        errores = Y - X @ pesos
+        mse_actual = float(errores @ errores) / len(X)
+        print(f"> Mínimos cuadrados (QR): MSE: {mse_actual:.6f}, Pesos: {[round(p, 4) for p in self.pesos]}")
+        if callback:
+            callback(epoca=1, pesos=self.pesos.copy(), mse=mse_actual, mse_inicial=mse_inicial)
+        if mse_actual <= error_deseado:
+            print(f"Entrenamiento completado con un MSE de {mse_actual:.6f}")
+        else:
+            print(f"La solución exacta de mínimos cuadrados tiene MSE {mse_actual:.6f} > {error_deseado} (no se puede mejorar).")
+        return self.pesos
+
     def guardar_pesos(self, ruta_archivo="pesos_adaline.txt"):
         try:
             with open(ruta_archivo, 'w') as f:
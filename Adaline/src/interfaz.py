@@ -6,6 +6,10 @@ from PIL import Image, ImageTk
 import random
 import sys
 import os
+import time
+import queue
+import threading
+import numpy as np
 
 from adaline import Adaline, generar_datos_binarios
 
@@ -13,15 +17,21 @@ from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.pyplot as plt
 
+# --- NUEVO: Entrenamiento en un hilo aparte ---
+INTERVALO_COLA_MS = 33              # Cada cuánto la GUI atiende la cola del hilo (~30 fps)
+PRESUPUESTO_COLA_S = 0.02           # Tiempo máximo por tick para vaciar la cola
+INTERVALO_INSTANTANEA_S = 1 / 30    # El hilo envía como mucho ~30 instantáneas por segundo
+EPOCAS_PAUSA = 500                  # Cada cuántas épocas se pregunta si continuar
+
 def resource_path(relative_path):
     try: base_path = sys._MEIPASS
     except Exception: base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
-class TextRedirector:
-    def __init__(self, widget): self.widget = widget
-    def write(self, text_string):
-        self.widget.insert(tk.END, text_string); self.widget.see(tk.END); self.widget.update_idletasks()
+class ColaRedirector:
+    """Redirige stdout a la cola de la GUI; solo el hilo de Tk escribe en el widget."""
+    def __init__(self, cola): self.cola = cola
+    def write(self, text_string): self.cola.put(("log_message", text_string))
     def flush(self): pass
 
 class App(tk.Tk):
@@ -38,6 +48,10 @@ class App(tk.Tk):
         self.notebook.pack(expand=True, fill="both", padx=10, pady=10)
         
         self.entrenamiento_cancelado = False
+        self.cola_gui = queue.Queue()
+        self.hilo_entrenamiento = None
+        self.stdout_original = sys.stdout
+        self.respuesta_pausa = threading.Event(); self.continuar_tras_pausa = True
         self.adaline_actual = None
         self.adaline_uso = None
         self.historial_mse = []; self.historial_precision = []
@@ -46,8 +60,13 @@ class App(tk.Tk):
         self.crear_tab_uso()
         self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_change)
         self.after(100, self.cargar_modelo_para_uso)
+        self.procesar_cola_gui()
 
-    def cerrar_aplicacion(self): self.destroy(); self.quit()
+    def cerrar_aplicacion(self):
+        self.entrenamiento_cancelado = True
+        self.continuar_tras_pausa = False; self.respuesta_pausa.set() # Libera al hilo si espera una pausa
+        sys.stdout = self.stdout_original
+        self.destroy(); self.quit()
 
     def crear_cabecera(self):
         frame_cabecera = ttk.Frame(self, height=100); frame_cabecera.pack(fill="x", padx=10, pady=5)
@@ -125,12 +144,16 @@ class App(tk.Tk):
         self.canvas.draw()
         
     def iniciar_entrenamiento(self):
-        self.btn_iniciar.config(state="disabled"); self.btn_cancelar.config(state="normal"); self.entrenamiento_cancelado = False
-        original_stdout = sys.stdout; sys.stdout = TextRedirector(self.log_texto)
         try:
             num_bits = self.num_bits_var.get(); tasa = float(self.tasa_aprendizaje_var.get()); error_deseado = float(self.error_deseado_var.get())
+        except ValueError: messagebox.showerror("Error de Entrada", "Por favor, revise los valores numéricos."); return
+        self.btn_iniciar.config(state="disabled"); self.btn_cancelar.config(state="normal"); self.entrenamiento_cancelado = False
+        self.stdout_original = sys.stdout; sys.stdout = ColaRedirector(self.cola_gui)
+        try:
             X_data, Y_data = generar_datos_binarios(num_bits)
             self.adaline_actual = Adaline(num_entradas=num_bits, tasa_aprendizaje=tasa)
+            # Se reutiliza en cada instantánea para la gráfica de predicciones
+            self.X_entrenamiento_con_sesgo = self.adaline_actual._matriz_con_sesgo(X_data)
             self.log_texto.delete("1.0", tk.END); self.limpiar_graficas(); self.historial_mse = []; self.historial_precision = []
             
             # --- CORRECCIÓN 1: Mostrar resumen de datos iniciales en la consola de la GUI ---
@@ -144,42 +167,113 @@ class App(tk.Tk):
             self.ax3.plot([min(Y_data), max(Y_data)], [min(Y_data), max(Y_data)], 'k--', label='Predicción Perfecta')
             self.puntos_prediccion, = self.ax3.plot(Y_data, [0]*len(Y_data), 'bo', label='Predicciones')
             self.ax3.legend()
-            
-            pesos_finales = self.adaline_actual.entrenar(X_data, Y_data, error_deseado, callback=self.actualizar_en_tiempo_real)
-            
-            if self.historial_mse:
-                mse_final = self.historial_mse[-1]; precision_final = self.historial_precision[-1]
-                print(f"\n--- Resumen Final ---"); print(f"Pesos: {[round(w, 4) for w in pesos_finales]}")
-                print(f"MSE Final: {mse_final:.6f}"); print(f"Precisión Final: {precision_final:.2%}")
-
-            self.adaline_actual.guardar_pesos()
-            if not self.entrenamiento_cancelado: messagebox.showinfo("Éxito", "Entrenamiento finalizado y pesos guardados.")
-        except ValueError: messagebox.showerror("Error de Entrada", "Por favor, revise los valores numéricos.")
-        except Exception as e: messagebox.showerror("Error Inesperado", f"Ha ocurrido un error: {e}")
+        except Exception as e:
+            messagebox.showerror("Error Inesperado", f"Ha ocurrido un error: {e}"); self.restaurar_controles(); return
+
+        # --- MODIFICADO: El entrenamiento corre en un hilo; la GUI recibe instantáneas por la cola ---
+        self.hilo_entrenamiento = threading.Thread(target=self._hilo_entrenamiento, args=(X_data, Y_data, error_deseado), daemon=True)
+        self.hilo_entrenamiento.start()
+
+    def _hilo_entrenamiento(self, X_data, Y_data, error_deseado):
+        """Se ejecuta fuera del hilo de Tk. No toca widgets: todo pasa por self.cola_gui."""
+        pendientes = {"mse": [], "precision": []}
+        estado = {"ultimo_envio": 0.0, "epoca": 0, "pesos": None}
+
+        def enviar_instantanea():
+            if not pendientes["mse"]: return
+            self.cola_gui.put(("instantanea", {
+                "epoca": estado["epoca"], "pesos": estado["pesos"],
+                "mse": pendientes["mse"], "precision": pendientes["precision"]
+            }))
+            pendientes["mse"], pendientes["precision"] = [], []
+            estado["ultimo_envio"] = time.perf_counter()
+
+        def callback(epoca, pesos, mse, mse_inicial):
+            estado["epoca"], estado["pesos"] = epoca, pesos
+            pendientes["mse"].append(mse)
+            pendientes["precision"].append(1 - (mse / mse_inicial) if mse_inicial > 0 else 1.0)
+            if time.perf_counter() - estado["ultimo_envio"] >= INTERVALO_INSTANTANEA_S:
+                enviar_instantanea()
+            if epoca > 0 and epoca % EPOCAS_PAUSA == 0 and not self.entrenamiento_cancelado:
+                enviar_instantanea()
+                if not self._esperar_respuesta_pausa(epoca): self.entrenamiento_cancelado = True
+            return not self.entrenamiento_cancelado
+
+        try:
+            pesos_finales = self.adaline_actual.entrenar(X_data, Y_data, error_deseado, callback=callback)
+            enviar_instantanea()
+            self.cola_gui.put(("entrenamiento_finalizado", pesos_finales))
+        except Exception as e:
+            self.cola_gui.put(("show_error", ("Error Inesperado", f"Ha ocurrido un error: {e}")))
+
+    def _esperar_respuesta_pausa(self, epoca):
+        """Desde el hilo de entrenamiento: pide a la GUI el diálogo de pausa y espera la respuesta."""
+        self.respuesta_pausa.clear()
+        self.cola_gui.put(("pausa", epoca))
+        self.respuesta_pausa.wait()
+        return self.continuar_tras_pausa
+
+    def procesar_cola_gui(self):
+        """Atiende los mensajes del hilo de entrenamiento (mismo patrón que la app TDI)."""
+        limite = time.perf_counter() + PRESUPUESTO_COLA_S
+        textos_log, instantaneas = [], []
+        try:
+            while time.perf_counter() < limite:
+                try: mensaje, datos = self.cola_gui.get_nowait()
+                except queue.Empty: break
+                if mensaje == "log_message": textos_log.append(datos)
+                elif mensaje == "instantanea": instantaneas.append(datos)
+                else:
+                    self._volcar_cola(textos_log, instantaneas); textos_log, instantaneas = [], []
+                    if mensaje == "pausa":
+                        self.continuar_tras_pausa = messagebox.askyesno("Entrenamiento en Pausa", f"Se han completado {datos} épocas.\n¿Desea continuar?")
+                        self.respuesta_pausa.set()
+                    elif mensaje == "entrenamiento_finalizado": self.finalizar_entrenamiento(datos)
+                    elif mensaje == "show_error":
+                        messagebox.showerror(datos[0], datos[1]); self.restaurar_controles()
         finally:
-            sys.stdout = original_stdout
-            self.btn_iniciar.config(state="normal"); self.btn_cancelar.config(state="disabled")
+            self._volcar_cola(textos_log, instantaneas)
+            self.after(INTERVALO_COLA_MS, self.procesar_cola_gui)
 
-    def actualizar_en_tiempo_real(self, epoca, pesos, mse, mse_inicial):
-        precision = 1 - (mse / mse_inicial) if mse_inicial > 0 else 1.0
-        self.historial_mse.append(mse); self.historial_precision.append(precision)
-        eje_x = range(1, epoca + 1)
+    def _volcar_cola(self, textos_log, instantaneas):
+        """Una sola inserción de texto y un solo redibujado por tick."""
+        if textos_log:
+            self.log_texto.insert(tk.END, "".join(textos_log)); self.log_texto.see(tk.END)
+        if instantaneas:
+            self.actualizar_en_tiempo_real(instantaneas)
+
+    def finalizar_entrenamiento(self, pesos_finales):
+        if self.historial_mse:
+            mse_final = self.historial_mse[-1]; precision_final = self.historial_precision[-1]
+            self.log_texto.insert(tk.END, f"\n--- Resumen Final ---\nPesos: {[round(w, 4) for w in pesos_finales]}\n"
+                                          f"MSE Final: {mse_final:.6f}\nPrecisión Final: {precision_final:.2%}\n")
+            self.log_texto.see(tk.END)
+        self.adaline_actual.guardar_pesos()
+        self.restaurar_controles()
+        if not self.entrenamiento_cancelado: messagebox.showinfo("Éxito", "Entrenamiento finalizado y pesos guardados.")
+
+    def restaurar_controles(self):
+        # Lo que el hilo aún haya escrito en la cola se muestra en el siguiente tick
+        sys.stdout = self.stdout_original
+        self.btn_iniciar.config(state="normal"); self.btn_cancelar.config(state="disabled")
+
+    def actualizar_en_tiempo_real(self, instantaneas):
+        """Aplica de una vez todas las instantáneas recibidas en este tick y redibuja."""
+        for instantanea in instantaneas:
+            self.historial_mse.extend(instantanea["mse"]); self.historial_precision.extend(instantanea["precision"])
+        epoca = instantaneas[-1]["epoca"]
+        eje_x = range(1, len(self.historial_mse) + 1)
 
         self.ax1.set_title(f"MSE vs. Épocas (Época {epoca})"); self.linea_mse.set_data(eje_x, self.historial_mse)
         self.ax1.relim(); self.ax1.autoscale_view()
         self.linea_precision.set_data(eje_x, self.historial_precision); self.ax2.relim(); self.ax2.autoscale_view()
         
-        num_bits = self.num_bits_var.get(); X_data, Y_data = generar_datos_binarios(num_bits)
-        predicciones = [self.adaline_actual.predecir(x) for x in X_data]
+        # --- MODIFICADO: Predicción con los pesos de la última instantánea (no con los que el hilo está modificando) ---
+        predicciones = self.X_entrenamiento_con_sesgo @ np.asarray(instantaneas[-1]["pesos"], dtype=np.float64)
         self.puntos_prediccion.set_ydata(predicciones)
         self.ax3.relim(); self.ax3.autoscale_view()
         
-        self.canvas.draw(); self.update()
-        
-        if epoca > 0 and epoca % 500 == 0:
-            if not messagebox.askyesno("Entrenamiento en Pausa", f"Se han completado {epoca} épocas.\n¿Desea continuar?"):
-                self.entrenamiento_cancelado = True
-        return not self.entrenamiento_cancelado
+        self.canvas.draw_idle()
 
     def crear_tab_uso(self):
         self.canvas_red = tk.Canvas(self.tab_uso, bg="white"); self.canvas_red.pack(side="left", fill="both", expand=True)
@@ -0,0 +1,106 @@
+/**
+ * @file arduino_uno_inferencia.ino
+ * @brief Inferencia de una MLP entrenada en el PC, en punto fijo, sobre un Arduino Uno.
+ * @details A diferencia de arduino_uno_5.ino, la placa NO entrena: los pesos vienen
+ * en "modelo_mlp.h", generado con Backpropagation/src/exportar_arduino.py a partir
+ * del modelo_mlp.json guardado por MLP.guardar_modelo. Los pesos viven en PROGMEM,
+ * así que la RAM solo guarda la entrada y las activaciones ocultas.
+ *
+ * Uso por Monitor Serie (9600 baudios): enviar MLP_N_ENTRADAS enteros separados por
+ * espacios o comas (ej. los 35 píxeles 0/1 de una vocal de 5x7). La placa responde
+ * con las salidas de la red y la clase predicha.
+ */
+
+#include "modelo_mlp.h" // Generar con: python exportar_arduino.py
+
+uint8_t entrada[MLP_N_ENTRADAS];
+int16_t salida[MLP_N_SALIDAS];
+
+void setup() {
+  Serial.begin(9600);
+  Serial.print(F("MLP lista. Entradas: "));
+  Serial.print(MLP_N_ENTRADAS);
+  Serial.print(F(", Ocultas: "));
+  Serial.print(MLP_N_OCULTAS);
+  Serial.print(F(", Salidas: "));
+  Serial.println(MLP_N_SALIDAS);
+}
+
+/**
+ * @brief Lee una línea del puerto serie y la guarda en entrada[].
+ * @details La línea termina en '\n' o cuando pasa Serial.getTimeout() sin recibir
+ * caracteres (Monitor Serie sin ajuste de línea). Se lee carácter a carácter para no
+ * reservar un buffer del tamaño de la línea. Serial.parseInt() no sirve aquí: al
+ * agotar el tiempo devuelve 0 y una línea corta se completaría con ceros.
+ * @return Número de valores de la línea (el patrón es válido si es MLP_N_ENTRADAS).
+ */
+int leer_patron() {
+  int n = 0;
+  long valor = 0;
+  bool en_numero = false, negativo = false;
+  unsigned long ultimo = millis();
+  while (millis() - ultimo < Serial.getTimeout()) {
+    if (Serial.available() == 0) continue;
+    char c = Serial.read();
+    ultimo = millis();
+    if (c >= '0' && c <= '9') {
+      if (valor <= MLP_VALOR_MAX_ENTRADA) valor = valor * 10 + (c - '0');
+      en_numero = true;
+      continue;
+    }
+    if (en_numero) {
+      if (n < MLP_N_ENTRADAS) {
+        if (negativo) valor = 0;
+        entrada[n] = (uint8_t)min(valor, (long)MLP_VALOR_MAX_ENTRADA);
+      }
+      n++;
+    }
+    valor = 0; en_numero = false;
+    negativo = (c == '-');
+    if (c == '\n') return n;
+  }
+  // Fin por tiempo: el último número no lleva separador
+  if (en_numero) {
+    if (n < MLP_N_ENTRADAS) entrada[n] = negativo ? 0 : (uint8_t)min(valor, (long)MLP_VALOR_MAX_ENTRADA);
+    n++;
+  }
+  return n;
+}
+
+void loop() {
+  if (Serial.available() == 0) return;
+  int n = leer_patron();
+  if (n != MLP_N_ENTRADAS) {
+    // Línea corta, larga o ilegible: no se clasifica
+    if (n > 0) {
+      Serial.print(F("Patron descartado: "));
+      Serial.print(n);
+      Serial.print(F(" valores, se esperaban "));
+      Serial.println(MLP_N_ENTRADAS);
+    }
+    return;
+  }
+
+  unsigned long t_inicio = micros();
+  mlp_predecir(entrada, salida);
+  unsigned long t_total = micros() - t_inicio;
+
+  Serial.print(F("Salidas: "));
+  for (int k = 0; k < MLP_N_SALIDAS; k++) {
+    Serial.print(salida[k] / 256.0, 3); // Q8 -> 0..1
+    Serial.print(' ');
+  }
+
+#if MLP_N_CLASES > 0
+  char nombre[16];
+  uint8_t clase = mlp_clase(salida);
+  strncpy_P(nombre, (PGM_P)pgm_read_word(&MLP_NOMBRES_CLASES[clase]), sizeof(nombre) - 1);
+  nombre[sizeof(nombre) - 1] = '\0';
+  Serial.print(F("| Clase: "));
+  Serial.print(nombre);
+#endif
+
+  Serial.print(F(" | Tiempo: "));
+  Serial.print(t_total);
+  Serial.println(F(" us"));
+}
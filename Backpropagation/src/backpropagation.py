@@ -2,6 +2,7 @@
 import numpy as np
 import json
 import copy
+from perfilado import reloj_de
 
 class MLP:
     def __init__(self, neuronas_entrada, neuronas_ocultas, neuronas_salida, semilla=0):
@@ -84,8 +85,10 @@ class MLP:
         return salidas_finales.flatten().tolist()
 
     # --- ENTRENAMIENTO Y MÉTRICAS ---
-    def entrenar_bloque(self, X_train, Y_train, X_val, Y_val, clases_info, tasa_aprendizaje, error_deseado, momentum, epoca_inicio, max_epocas_bloque, cancel_event,  progress_callback=None):
+    def entrenar_bloque(self, X_train, Y_train, X_val, Y_val, clases_info, tasa_aprendizaje, error_deseado, momentum, epoca_inicio, max_epocas_bloque, cancel_event,  progress_callback=None, canal_metricas=None, perfilador=None):
         if not X_train: raise ValueError("El conjunto de entrenamiento 'X_train' no puede estar vacío.")
+        # --- NUEVO: Medición opcional del tiempo por fase (ver perfilado.py); sin perfilador no se mide ---
+        reloj = reloj_de(perfilador)
         
         # ... (La lógica del bucle de épocas, logs, y early stopping no cambia) ...
         epoca = epoca_inicio
@@ -104,16 +107,21 @@ class MLP:
             # Reporta el progreso cada 5 épocas (puedes ajustar este número)
             if progress_callback and epoca % 5 == 0:
                 progress_callback(epoca)
+            if perfilador is not None: perfilador.iniciar_epoca(epoca)
+            t_conversion = t_forward = t_backward = t_actualizacion = 0.0
             
             # --- FASE DE ENTRENAMIENTO (POR PATRÓN) ---
             for entradas, y_esperada in zip(X_train, Y_train):
+                t0 = reloj()
                 # Convertimos las listas de Python a vectores columna de NumPy para el cálculo
                 entradas_vec = np.array(entradas).reshape(-1, 1)
                 y_esperada_vec = np.array(y_esperada).reshape(-1, 1)
+                t1 = reloj()
 
                 # --- 1. FEEDFORWARD ---
                 # Propagamos la entrada a través de la red para obtener las activaciones
                 salidas_ocultas, salidas_finales = self._forward_pass(entradas_vec)
+                t2 = reloj()
 
                 # --- 2. BACKPROPAGATION (CÁLCULO DEL ERROR) ---
                 # Error en la capa de salida (δ_o)
@@ -126,6 +134,7 @@ class MLP:
                 # Se propaga el error hacia atrás: (pesos_ho^T @ δ_o) * derivada_sigmoide(activación_oculta)
                 error_oculto = self.pesos_ho.T @ deltas_salida
                 deltas_ocultos = error_oculto * self._sigmoide_derivada(salidas_ocultas)
+                t3 = reloj()
 
                 # --- 3. ACTUALIZACIÓN DE PESOS Y SESGOS (CON MOMENTUM) ---
                 # Cambio para pesos de la capa de salida (ho)
@@ -147,10 +156,14 @@ class MLP:
                 cambio_sesgos_h = (tasa_aprendizaje * deltas_ocultos) + (momentum * self.cambio_anterior_sesgos_h)
                 self.sesgos_h += cambio_sesgos_h
                 self.cambio_anterior_sesgos_h = cambio_sesgos_h
+                t_conversion += t1 - t0; t_forward += t2 - t1; t_backward += t3 - t2; t_actualizacion += reloj() - t3
 
             # --- FASE DE EVALUACIÓN ---
+            t0 = reloj()
             mse_train, matriz_train = self._calcular_metricas(X_train, Y_train, clases_info)
+            t1 = reloj()
             mse_val, matriz_val = self._calcular_metricas(X_val, Y_val, clases_info)
+            t2 = reloj()
             
             # ... (El resto de la lógica de logs, early stopping, etc., no cambia) ...
             historial_mse_train_bloque.append(mse_train)
@@ -162,6 +175,19 @@ class MLP:
                 precision_train = np.trace(matriz_train) / len(X_train) if X_train else 0
                 log_line += f" | Precisión (Ent): {precision_train:.2%} | Precisión (Val): {precision_val:.2%}"
             log_bloque.append(log_line)
+            # --- NUEVO: Métricas de la época para las gráficas en vivo de la GUI ---
+            if canal_metricas is not None:
+                registro = {"epoca": epoca, "mse_train": float(mse_train), "mse_val": float(mse_val)}
+                if epoca % 25 == 0 or epoca == epoca_limite or mse_train <= error_deseado:
+                    registro["precision_val"] = float(precision_val)
+                    registro["matriz_val"] = matriz_val
+                canal_metricas.publicar(registro)
+            if perfilador is not None:
+                for fase, segundos in (("conversion_datos", t_conversion), ("forward", t_forward), ("backward", t_backward),
+                                       ("actualizacion", t_actualizacion), ("metricas_train", t1 - t0),
+                                       ("metricas_val", t2 - t1), ("registro", reloj() - t2)):
+                    perfilador.agregar(fase, segundos)
+                perfilador.terminar_epoca()
             if precision_val > self.best_val_accuracy:
                 self.best_val_accuracy = precision_val
                 self.best_weights = {
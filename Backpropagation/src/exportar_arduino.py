@@ -0,0 +1,398 @@
+# exportar_arduino.py
+"""
+Exporta un modelo guardado por MLP.guardar_modelo (modelo_mlp.json) a un
+header de C (.h) para Arduino:
+
+- Pesos en punto fijo int8 o int16 (formato Q con desplazamiento por capa),
+  sesgos en int32, todo en PROGMEM.
+- Una pasada hacia adelante de referencia en aritmética entera (acumulador
+  int32, activaciones en Q8) con la sigmoide como tabla (LUT) de 256 valores.
+- Un emulador en Python que reproduce bit a bit la misma aritmética, para
+  verificar las salidas (y, si hay gcc en el PC, compilar el header y comparar).
+
+Así la placa solo ejecuta la inferencia de una red entrenada en el PC.
+"""
+import os
+import json
+import shutil
+import logging
+import subprocess
+import tempfile
+import numpy as np
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', datefmt='%H:%M:%S')
+
+# --- CONFIGURACIÓN ---
+RUTA_MODELO = "./modelo_mlp.json"
+RUTA_HEADER = "../hardware/arduino_uno_inferencia/modelo_mlp.h"
+ANCHO_PESOS = 8           # 8 -> int8_t, 16 -> int16_t
+VALOR_MAX_ENTRADA = 255   # 255 para píxeles (modelo entrenado con x/255), 1 para patrones 0/1
+PATRONES_VERIFICACION = 200
+LIMITE_FLASH_UNO = 30 * 1024 # Bytes aproximados disponibles en el Uno para el modelo
+# ---------------------
+
+BITS_Q = 8                 # Las activaciones viajan en Q8 (1.0 == 256)
+LUT_MIN = -8 * (1 << BITS_Q) # La LUT de la sigmoide cubre z en [-8, 8)
+LUT_PASO_BITS = 4          # 256 entradas * 16 = 4096 = 16.0 en Q8
+MAX_INT32 = 2**31 - 1
+MAX_ACTIVACION = 32767     # Las activaciones ocultas se guardan en int16_t
+
+def _tabla_sigmoide():
+    """LUT de la sigmoide: índice = (z_q8 - LUT_MIN) >> LUT_PASO_BITS, valor en Q8 (0..255)."""
+    paso = 1 << LUT_PASO_BITS
+    centros = (LUT_MIN + np.arange(256) * paso + paso / 2) / float(1 << BITS_Q)
+    valores = np.round(256.0 / (1.0 + np.exp(-centros)))
+    return np.clip(valores, 0, 255).astype(np.int64)
+
+TABLA_SIGMOIDE = _tabla_sigmoide()
+
+def _elegir_bits_fraccion(pesos, sesgos_float, ancho, max_entrada, bits_entrada):
+    """
+    Mayor número de bits fraccionarios (puede ser negativo) tal que los pesos
+    quepan en 'ancho' bits y ninguna suma ponderada desborde el acumulador int32.
+    """
+    limite = (1 << (ancho - 1)) - 1
+    max_abs = float(np.max(np.abs(pesos))) if pesos.size else 0.0
+    bits = 14 if max_abs == 0 else int(np.floor(np.log2(limite / max_abs)))
+    bits = max(-16, min(bits, 24))
+    while bits > -16:
+        pesos_q = np.round(pesos * 2.0 ** bits)
+        sesgos_q = np.round(sesgos_float * 2.0 ** (bits + bits_entrada))
+        peor_caso = np.sum(np.abs(pesos_q), axis=1) * max_entrada + np.abs(sesgos_q)
+        if np.max(np.abs(pesos_q)) <= limite and np.max(peor_caso) < MAX_INT32:
+            break
+        bits -= 1
+    return bits
+
+def _cuantizar_capa(pesos, sesgos, ancho, max_entrada, bits_entrada):
+    """
+    Devuelve (pesos_q, sesgos_q, desplazamiento). El acumulador
+    sesgos_q + pesos_q @ x queda en Q(bits + bits_entrada); 'desplazamiento'
+    es lo que hay que desplazar a la derecha para pasarlo a Q8 (si es
+    negativo, se multiplica por 2^-desplazamiento).
+    """
+    bits = _elegir_bits_fraccion(pesos, sesgos, ancho, max_entrada, bits_entrada)
+    limite = (1 << (ancho - 1)) - 1
+    pesos_q = np.clip(np.round(pesos * 2.0 ** bits), -limite, limite).astype(np.int64)
+    sesgos_q = np.round(sesgos * 2.0 ** (bits + bits_entrada)).astype(np.int64)
+    return pesos_q, sesgos_q, bits + bits_entrada - BITS_Q
+
+def cuantizar_modelo_punto_fijo(modelo_json, ancho=ANCHO_PESOS, valor_max_entrada=VALOR_MAX_ENTRADA):
+    """Convierte el diccionario de modelo_mlp.json al modelo en punto fijo (diccionario)."""
+    arq = modelo_json['arquitectura']
+    pesos = modelo_json['pesos']
+    act_oculta = arq.get('activacion_oculta', 'sigmoide')
+    act_salida = arq.get('activacion_salida', 'sigmoide')
+
+    pesos_ih = np.array(pesos['pesos_ih'], dtype=np.float64)
+    sesgos_h = np.array(pesos['sesgos_h'], dtype=np.float64).flatten()
+    pesos_ho = np.array(pesos['pesos_ho'], dtype=np.float64)
+    sesgos_o = np.array(pesos['sesgos_o'], dtype=np.float64).flatten()
+
+    # La entrada llega como entero 0..valor_max_entrada: la división se pliega en los pesos
+    pesos_ih_q, sesgos_h_q, desp_ih = _cuantizar_capa(pesos_ih / valor_max_entrada, sesgos_h, ancho, valor_max_entrada, 0)
+    max_oculta = 255 if act_oculta == 'sigmoide' else MAX_ACTIVACION
+    pesos_ho_q, sesgos_o_q, desp_ho = _cuantizar_capa(pesos_ho, sesgos_o, ancho, max_oculta, BITS_Q)
+
+    clases_info = modelo_json.get('clases_info') or {}
+    return {
+        "n_entradas": pesos_ih.shape[1], "n_ocultas": pesos_ih.shape[0], "n_salidas": pesos_ho.shape[0],
+        "activacion_oculta": act_oculta, "activacion_salida": act_salida,
+        "ancho": ancho, "valor_max_entrada": valor_max_entrada,
+        "pesos_ih": pesos_ih_q, "sesgos_h": sesgos_h_q, "desplazamiento_ih": desp_ih,
+        "pesos_ho": pesos_ho_q, "sesgos_o": sesgos_o_q, "desplazamiento_ho": desp_ho,
+        "clases": list(clases_info.keys()),
+        "targets_q8": np.round(np.array(list(clases_info.values()), dtype=np.float64) * (1 << BITS_Q)).astype(np.int64)
+    }
+
+# --- EMULADOR BIT A BIT (misma aritmética que el código C generado) ---
+
+def _desplazar_a_q8(acumulado, desplazamiento):
+    """Pasa el acumulado a Q8: desplazamiento aritmético a la derecha (igual que en avr-gcc) o producto."""
+    if desplazamiento >= 0:
+        return acumulado >> desplazamiento
+    return acumulado * (1 << -desplazamiento)
+
+def _activar(z_q8, activacion):
+    if activacion == 'sigmoide':
+        indice = np.clip((z_q8 - LUT_MIN) >> LUT_PASO_BITS, 0, 255)
+        return TABLA_SIGMOIDE[indice]
+    return np.clip(z_q8, 0, MAX_ACTIVACION)
+
+def emular_punto_fijo(modelo_fijo, entradas):
+    """
+    Emula mlp_predecir() del header. 'entradas' es (N x D) o (D,) de enteros
+    0..valor_max_entrada. Devuelve las salidas en Q8 (int) con forma (N x salidas).
+    """
+    X = np.atleast_2d(np.asarray(entradas, dtype=np.int64))
+    acumulado = modelo_fijo['sesgos_h'][None, :] + X @ modelo_fijo['pesos_ih'].T
+    ocultas = _activar(_desplazar_a_q8(acumulado, modelo_fijo['desplazamiento_ih']), modelo_fijo['activacion_oculta'])
+    acumulado = modelo_fijo['sesgos_o'][None, :] + ocultas @ modelo_fijo['pesos_ho'].T
+    return _activar(_desplazar_a_q8(acumulado, modelo_fijo['desplazamiento_ho']), modelo_fijo['activacion_salida'])
+
+def clase_punto_fijo(modelo_fijo, salidas_q8):
+    """Igual que mlp_clase(): índice del vector objetivo más cercano (distancia al cuadrado)."""
+    targets = modelo_fijo['targets_q8']
+    if len(targets) == 0: return np.zeros(len(salidas_q8), dtype=np.int64)
+    distancias = np.sum((np.atleast_2d(salidas_q8)[:, None, :] - targets[None, :, :]) ** 2, axis=2)
+    return np.argmin(distancias, axis=1)
+
+# --- GENERACIÓN DEL HEADER ---
+
+def _formatear_matriz(matriz, por_linea=16):
+    filas = []
+    for fila in np.atleast_2d(matriz):
+        valores = [str(int(v)) for v in fila]
+        trozos = [", ".join(valores[i:i + por_linea]) for i in range(0, len(valores), por_linea)]
+        filas.append("  {" + ",\n   ".join(trozos) + "}")
+    return ",\n".join(filas)
+
+def _formatear_vector(vector, por_linea=16):
+    valores = [str(int(v)) for v in vector]
+    return ",\n  ".join(", ".join(valores[i:i + por_linea]) for i in range(0, len(valores), por_linea))
+
+def _codigo_desplazamiento(desplazamiento):
+    if desplazamiento >= 0:
+        return f"((a) >> {desplazamiento})"
+    return f"((a) * {1 << -desplazamiento}L)"
+
+def _codigo_activacion(nombre_funcion, activacion):
+    if activacion == 'sigmoide':
+        return (f"static inline int16_t {nombre_funcion}(int32_t z) {{\n"
+                f"  int32_t indice = (z - (MLP_LUT_MIN)) >> MLP_LUT_PASO_BITS;\n"
+                f"  if (indice < 0) indice = 0;\n"
+                f"  if (indice > 255) indice = 255;\n"
+                f"  return (int16_t)pgm_read_byte(&MLP_LUT_SIGMOIDE[indice]);\n"
+                f"}}\n")
+    return (f"static inline int16_t {nombre_funcion}(int32_t z) {{\n"
+            f"  if (z < 0) return 0;\n"
+            f"  if (z > {MAX_ACTIVACION}) return {MAX_ACTIVACION};\n"
+            f"  return (int16_t)z;\n"
+            f"}}\n")
+
+def tamano_flash(modelo_fijo):
+    """Bytes de PROGMEM que ocupan los parámetros, la LUT y los objetivos."""
+    bytes_peso = modelo_fijo['ancho'] // 8
+    return (modelo_fijo['pesos_ih'].size * bytes_peso + modelo_fijo['pesos_ho'].size * bytes_peso +
+            4 * (modelo_fijo['sesgos_h'].size + modelo_fijo['sesgos_o'].size) + 256 +
+            2 * modelo_fijo['targets_q8'].size)
+
+def generar_header(modelo_fijo, ruta_modelo=RUTA_MODELO):
+    """Devuelve el texto del header .h para el modelo en punto fijo."""
+    tipo = "int8_t" if modelo_fijo['ancho'] == 8 else "int16_t"
+    leer = "(int8_t)pgm_read_byte" if modelo_fijo['ancho'] == 8 else "(int16_t)pgm_read_word"
+    n_in, n_h, n_out = modelo_fijo['n_entradas'], modelo_fijo['n_ocultas'], modelo_fijo['n_salidas']
+    n_clases = len(modelo_fijo['clases'])
+
+    lineas = [
+        "/**",
+        " * @file modelo_mlp.h",
+        f" * @brief Red MLP exportada desde {os.path.basename(ruta_modelo)} en punto fijo (generado por exportar_arduino.py).",
+        f" * @details Arquitectura {n_in}-{n_h}-{n_out}, pesos {tipo}, acumulador int32_t, activaciones en Q8 (1.0 = 256).",
+        f" * Oculta: {modelo_fijo['activacion_oculta']}, Salida: {modelo_fijo['activacion_salida']}.",
+        f" * Entradas enteras en [0, {modelo_fijo['valor_max_entrada']}]. Tamaño en Flash: {tamano_flash(modelo_fijo)} bytes.",
+        " * NO EDITAR A MANO: volver a generar con exportar_arduino.py.",
+        " */",
+        "#ifndef MODELO_MLP_H",
+        "#define MODELO_MLP_H",
+        "",
+        "#include <stdint.h>",
+        "",
+        "#ifdef __AVR__",
+        "#include <avr/pgmspace.h>",
+        "#else",
+        "// Compilación en PC (verificación): PROGMEM es memoria normal",
+        "#define PROGMEM",
+        "#define pgm_read_byte(p) (*(const uint8_t *)(p))",
+        "#define pgm_read_word(p) (*(const uint16_t *)(p))",
+        "#define pgm_read_dword(p) (*(const uint32_t *)(p))",
+        "#endif",
+        "",
+        f"#define MLP_N_ENTRADAS {n_in}",
+        f"#define MLP_N_OCULTAS {n_h}",
+        f"#define MLP_N_SALIDAS {n_out}",
+        f"#define MLP_N_CLASES {n_clases}",
+        f"#define MLP_VALOR_MAX_ENTRADA {modelo_fijo['valor_max_entrada']}",
+        "// Paso del acumulador int32 a Q8 en cada capa",
+        f"#define MLP_A_Q8_IH(a) {_codigo_desplazamiento(modelo_fijo['desplazamiento_ih'])}",
+        f"#define MLP_A_Q8_HO(a) {_codigo_desplazamiento(modelo_fijo['desplazamiento_ho'])}",
+        f"#define MLP_LUT_MIN ({LUT_MIN}L)",
+        f"#define MLP_LUT_PASO_BITS {LUT_PASO_BITS}",
+        "",
+        "// --- PARÁMETROS (Memoria Flash) ---",
+        f"const {tipo} MLP_PESOS_IH[MLP_N_OCULTAS][MLP_N_ENTRADAS] PROGMEM = {{",
+        _formatear_matriz(modelo_fijo['pesos_ih']),
+        "};",
+        "",
+        "const int32_t MLP_SESGOS_H[MLP_N_OCULTAS] PROGMEM = {",
+        "  " + _formatear_vector(modelo_fijo['sesgos_h']),
+        "};",
+        "",
+        f"const {tipo} MLP_PESOS_HO[MLP_N_SALIDAS][MLP_N_OCULTAS] PROGMEM = {{",
+        _formatear_matriz(modelo_fijo['pesos_ho']),
+        "};",
+        "",
+        "const int32_t MLP_SESGOS_O[MLP_N_SALIDAS] PROGMEM = {",
+        "  " + _formatear_vector(modelo_fijo['sesgos_o']),
+        "};",
+        "",
+        "// Sigmoide tabulada: z en Q8 dentro de [-8, 8), 16 pasos por unidad",
+        "const uint8_t MLP_LUT_SIGMOIDE[256] PROGMEM = {",
+        "  " + _formatear_vector(TABLA_SIGMOIDE),
+        "};",
+        "",
+    ]
+    if n_clases:
+        lineas += [
+            "// Vectores objetivo de cada clase en Q8 (para decodificar la salida)",
+            "const int16_t MLP_TARGETS[MLP_N_CLASES][MLP_N_SALIDAS] PROGMEM = {",
+            _formatear_matriz(modelo_fijo['targets_q8']),
+            "};",
+            "",
+        ]
+        for c, nombre in enumerate(modelo_fijo['clases']):
+            nombre_c = str(nombre).replace("\\", "\\\\").replace('"', '\\"')
+            lineas.append(f"const char MLP_NOMBRE_CLASE_{c}[] PROGMEM = \"{nombre_c}\";")
+        lineas += [
+            "const char *const MLP_NOMBRES_CLASES[MLP_N_CLASES] PROGMEM = {",
+            "  " + ", ".join(f"MLP_NOMBRE_CLASE_{c}" for c in range(n_clases)),
+            "};",
+            "",
+        ]
+
+    lineas += [
+        "// --- FUNCIONES DE ACTIVACIÓN (enteras) ---",
+        _codigo_activacion("mlp_activacion_oculta", modelo_fijo['activacion_oculta']),
+        _codigo_activacion("mlp_activacion_salida", modelo_fijo['activacion_salida']),
+        "/**",
+        " * @brief Propagación hacia adelante en punto fijo.",
+        " * @param entrada Vector de MLP_N_ENTRADAS enteros en [0, MLP_VALOR_MAX_ENTRADA].",
+        " * @param salida Vector de MLP_N_SALIDAS resultados en Q8 (dividir entre 256.0 para obtener 0..1).",
+        " */",
+        "static void mlp_predecir(const uint8_t entrada[MLP_N_ENTRADAS], int16_t salida[MLP_N_SALIDAS]) {",
+        "  int16_t ocultas[MLP_N_OCULTAS];",
+        "  for (int j = 0; j < MLP_N_OCULTAS; j++) {",
+        "    int32_t acumulado = (int32_t)pgm_read_dword(&MLP_SESGOS_H[j]);",
+        "    for (int i = 0; i < MLP_N_ENTRADAS; i++) {",
+        f"      acumulado += (int32_t){leer}(&MLP_PESOS_IH[j][i]) * (int32_t)entrada[i];",
+        "    }",
+        "    ocultas[j] = mlp_activacion_oculta(MLP_A_Q8_IH(acumulado));",
+        "  }",
+        "  for (int k = 0; k < MLP_N_SALIDAS; k++) {",
+        "    int32_t acumulado = (int32_t)pgm_read_dword(&MLP_SESGOS_O[k]);",
+        "    for (int j = 0; j < MLP_N_OCULTAS; j++) {",
+        f"      acumulado += (int32_t){leer}(&MLP_PESOS_HO[k][j]) * (int32_t)ocultas[j];",
+        "    }",
+        "    salida[k] = mlp_activacion_salida(MLP_A_Q8_HO(acumulado));",
+        "  }",
+        "}",
+        "",
+    ]
+    if n_clases:
+        lineas += [
+            "/**",
+            " * @brief Devuelve el índice de la clase cuyo vector objetivo está más cerca de la salida.",
+            " */",
+            "static uint8_t mlp_clase(const int16_t salida[MLP_N_SALIDAS]) {",
+            "  uint8_t mejor = 0;",
+            "  int32_t mejor_distancia = INT32_MAX;",
+            "  for (uint8_t c = 0; c < MLP_N_CLASES; c++) {",
+            "    int32_t distancia = 0;",
+            "    for (int k = 0; k < MLP_N_SALIDAS; k++) {",
+            "      int32_t d = (int32_t)salida[k] - (int16_t)pgm_read_word(&MLP_TARGETS[c][k]);",
+            "      distancia += d * d;",
+            "    }",
+            "    if (distancia < mejor_distancia) { mejor_distancia = distancia; mejor = c; }",
+            "  }",
+            "  return mejor;",
+            "}",
+            "",
+        ]
+    lineas.append("#endif // MODELO_MLP_H")
+    return "\n".join(lineas) + "\n"
+
+# --- VERIFICACIÓN ---
+
+def salidas_float(modelo_json, entradas, valor_max_entrada=VALOR_MAX_ENTRADA):
+    """Salidas del modelo original en float64 para comparar con el punto fijo."""
+    arq, pesos = modelo_json['arquitectura'], modelo_json['pesos']
+    funciones = {'sigmoide': lambda z: 1 / (1 + np.exp(-np.clip(z, -500, 500))), 'relu': lambda z: np.maximum(0, z)}
+    X = np.atleast_2d(np.asarray(entradas, dtype=np.float64)) / valor_max_entrada
+    ocultas = funciones[arq.get('activacion_oculta', 'sigmoide')](X @ np.array(pesos['pesos_ih']).T + np.array(pesos['sesgos_h']).T)
+    return funciones[arq.get('activacion_salida', 'sigmoide')](ocultas @ np.array(pesos['pesos_ho']).T + np.array(pesos['sesgos_o']).T)
+
+def verificar_con_gcc(ruta_header, modelo_fijo, entradas):
+    """
+    Compila el header con el gcc del PC y compara sus salidas con el emulador.
+    Devuelve True/False, o None si no hay compilador disponible.
+    """
+    compilador = shutil.which("gcc") or shutil.which("cc")
+    if compilador is None:
+        return None
+    X = np.atleast_2d(np.asarray(entradas, dtype=np.int64))
+    programa = (
+        "#include <stdio.h>\n"
+        f"#include \"{os.path.abspath(ruta_header)}\"\n"
+        "int main(void) {\n"
+        "  uint8_t entrada[MLP_N_ENTRADAS]; int16_t salida[MLP_N_SALIDAS]; int v;\n"
+        "  while (1) {\n"
+        "    for (int i = 0; i < MLP_N_ENTRADAS; i++) { if (scanf(\"%d\", &v) != 1) return 0; entrada[i] = (uint8_t)v; }\n"
+        "    mlp_predecir(entrada, salida);\n"
+        "    for (int k = 0; k < MLP_N_SALIDAS; k++) printf(\"%d \", salida[k]);\n"
+        "    printf(\"\\n\");\n"
+        "  }\n"
+        "}\n"
+    )
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta_c = os.path.join(carpeta, "verificar.c")
+        ruta_bin = os.path.join(carpeta, "verificar")
+        with open(ruta_c, 'w') as f:
+            f.write(programa)
+        subprocess.run([compilador, "-O2", "-std=c99", "-o", ruta_bin, ruta_c], check=True)
+        datos = "\n".join(" ".join(str(int(v)) for v in fila) for fila in X) + "\n"
+        resultado = subprocess.run([ruta_bin], input=datos, capture_output=True, text=True, check=True)
+    salidas_c = np.array([[int(v) for v in linea.split()] for linea in resultado.stdout.strip().splitlines()])
+    return bool(np.array_equal(salidas_c, emular_punto_fijo(modelo_fijo, X)))
+
+def exportar_modelo():
+    logging.info(f"Exportando {RUTA_MODELO} a {RUTA_HEADER} (pesos int{ANCHO_PESOS})...")
+    try:
+        with open(RUTA_MODELO, 'r') as f:
+            modelo_json = json.load(f)
+    except FileNotFoundError:
+        logging.error(f"No se encontró el modelo: {RUTA_MODELO}")
+        return
+
+    modelo_fijo = cuantizar_modelo_punto_fijo(modelo_json, ANCHO_PESOS, VALOR_MAX_ENTRADA)
+    os.makedirs(os.path.dirname(os.path.abspath(RUTA_HEADER)), exist_ok=True)
+    with open(RUTA_HEADER, 'w') as f:
+        f.write(generar_header(modelo_fijo, RUTA_MODELO))
+
+    flash = tamano_flash(modelo_fijo)
+    logging.info(f"Header generado. Desplazamientos a Q8: IH={modelo_fijo['desplazamiento_ih']}, HO={modelo_fijo['desplazamiento_ho']}. Flash: {flash} bytes.")
+    if flash > LIMITE_FLASH_UNO:
+        logging.warning(f"El modelo ({flash} B) no cabe en la Flash de un Arduino Uno (~{LIMITE_FLASH_UNO} B).")
+
+    # Verificación con entradas aleatorias en el rango de la placa
+    rng = np.random.default_rng(0)
+    entradas = rng.integers(0, VALOR_MAX_ENTRADA + 1, size=(PATRONES_VERIFICACION, modelo_fijo['n_entradas']))
+    salidas_q8 = emular_punto_fijo(modelo_fijo, entradas)
+    referencia = salidas_float(modelo_json, entradas, VALOR_MAX_ENTRADA)
+    error_max = float(np.max(np.abs(salidas_q8 / 256.0 - referencia)))
+    logging.info(f"Error máx. punto fijo vs float: {error_max:.4f}")
+    if modelo_fijo['clases']:
+        float_fijo = {"targets_q8": modelo_fijo['targets_q8']}
+        coincidencia = np.mean(clase_punto_fijo(modelo_fijo, salidas_q8) ==
+                               clase_punto_fijo(float_fijo, np.round(referencia * 256).astype(np.int64)))
+        logging.info(f"Coincidencia de clase punto fijo vs float: {coincidencia:.2%}")
+
+    exacto = verificar_con_gcc(RUTA_HEADER, modelo_fijo, entradas)
+    if exacto is None:
+        logging.info("No hay gcc disponible: se omite la verificación del código C.")
+    elif exacto:
+        logging.info("Verificación C vs emulador: salidas idénticas bit a bit.")
+    else:
+        logging.error("Verificación C vs emulador: las salidas NO coinciden.")
+
+if __name__ == "__main__":
+    exportar_modelo()
@@ -9,16 +9,40 @@ import os
 import numpy as np
 from collections import OrderedDict
 import threading
+import time
 import queue
 import itertools
+import contextlib
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import logging
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', datefmt='%H:%M:%S')
 
+# --- NUEVO: Despacho de la cola de la GUI ---
+INTERVALO_COLA_MS = 50      # Cada cuánto se revisa la cola de mensajes de los hilos
+PRESUPUESTO_COLA_S = 0.03   # Tiempo máximo por tick; lo que no quepa se procesa en el siguiente
+
+# --- NUEVO: Consola de entrenamiento acotada + log completo en disco ---
+MAX_LINEAS_CONSOLA = 2000                 # Líneas visibles en la consola (las más antiguas se borran)
+RUTA_LOG_CONSOLA = "./consola_entrenamiento.log"
+TAMANO_MAX_LOG_BYTES = 5 * 1024 * 1024    # Al superarlo, el archivo rota
+ARCHIVOS_LOG_ROTACION = 3                 # consola_entrenamiento.log.1 ... .3
+
+# --- NUEVO: Perfilado del entrenamiento ---
+DIR_PERFILES = "./perfiles"   # Tiempos por fase (JSON/CSV) y perfil de llamadas de cada bloque
+MOTOR_PERFIL = "cprofile"     # 'cprofile' o 'pyinstrument' (si está instalado; si no, se usa cProfile)
+
+# --- NUEVO: Diagrama de la red en la pestaña de Uso ---
+RUTA_MODELO_USO = "modelo_mlp.json"
+MAX_ETIQUETAS_PESOS = 300   # Con más pesos oculta->salida que esto, no se rotulan (serían ilegibles)
+RETARDO_REDIBUJO_RED_MS = 100
+
 from backpropagation import MLP
 from procesador_datos import cargar_y_convertir_dataset, convertir_imagen_individual
+from graficas_vivas import GraficaEnVivo, CanalMetricas
+from perfilado import PerfiladorFases, CapturaPerfil
 
 def resource_path(relative_path):
     """ Obtiene la ruta absoluta al recurso, funciona para desarrollo y para PyInstaller """
@@ -88,6 +112,56 @@ class OpcionesDialog(tk.Toplevel):
         self.protocol("WM_DELETE_WINDOW", lambda: self.set_result("stop")); self.wait_window(self)
     def set_result(self, result): self.result = result; self.destroy()
 
+class ConsolaAcotada:
+    """
+    Consola sobre un widget Text que conserva como máximo 'max_lineas' líneas.
+    Todo lo escrito se guarda también en un archivo de log rotativo; la escritura
+    a disco la hace un hilo en segundo plano (QueueListener) para no frenar la GUI.
+    """
+    def __init__(self, widget, max_lineas=MAX_LINEAS_CONSOLA, ruta_log=RUTA_LOG_CONSOLA):
+        self.widget = widget
+        self.max_lineas = max_lineas
+        self.lineas = 0
+        self.logger = logging.getLogger(f"consola.{id(self)}")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False # No se repite en la salida estándar
+        self.listener = None
+        try:
+            manejador = RotatingFileHandler(ruta_log, maxBytes=TAMANO_MAX_LOG_BYTES,
+                                            backupCount=ARCHIVOS_LOG_ROTACION, encoding="utf-8")
+            manejador.setFormatter(logging.Formatter('%(asctime)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S'))
+            cola_log = queue.SimpleQueue()
+            self.listener = QueueListener(cola_log, manejador)
+            self.listener.start()
+            self.logger.addHandler(QueueHandler(cola_log))
+        except OSError as e:
+            logging.warning(f"No se pudo abrir el log de la consola '{ruta_log}': {e}")
+
+    def escribir(self, mensaje):
+        self.logger.info(mensaje)
+        lineas = mensaje.split("\n")
+        # Un volcado más largo que la consola solo inserta su final
+        if len(lineas) > self.max_lineas: lineas = lineas[-self.max_lineas:]
+        self.widget.config(state="normal")
+        self.widget.insert(tk.END, "\n".join(lineas) + "\n")
+        self.lineas += len(lineas)
+        sobrantes = self.lineas - self.max_lineas
+        if sobrantes > 0:
+            self.widget.delete("1.0", f"{sobrantes + 1}.0")
+            self.lineas -= sobrantes
+        self.widget.see(tk.END)
+        self.widget.config(state="disabled")
+
+    def vaciar(self):
+        self.widget.config(state="normal")
+        self.widget.delete("1.0", tk.END)
+        self.widget.config(state="disabled")
+        self.lineas = 0
+
+    def cerrar(self):
+        """Escribe lo pendiente en disco y detiene el hilo del log."""
+        if self.listener: self.listener.stop(); self.listener = None
+
 class App(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -116,7 +190,13 @@ class App(tk.Tk):
         self.mlp_uso = None; 
         self.clases_info = OrderedDict()
         self.clases_info_uso = OrderedDict()
+        # --- NUEVO: Cachés de la pestaña de Uso ---
+        self.firma_modelo_uso = None          # (mtime, tamaño) del modelo cargado
+        self.version_modelo_uso = 0           # Aumenta con cada modelo cargado
+        self.firma_dibujo_red = None          # (versión del modelo, ancho, alto) del último dibujo
+        self.after_redibujo_red = None
         self.cola_gui = queue.Queue()
+        self.canal_metricas = CanalMetricas()
         self.crear_tab_entrenamiento(); self.crear_tab_uso(); self.procesar_cola_gui()
         self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
         self.rutas_imagenes_totales = []
@@ -125,6 +205,7 @@ class App(tk.Tk):
         self.entrenamiento_cancelado = True
         self.animacion_activa = False
         if self.hilo_entrenamiento and self.hilo_entrenamiento.is_alive(): self.hilo_entrenamiento.join(timeout=1)
+        self.consola.cerrar()
         self.destroy()
         self.quit()
 
@@ -189,6 +270,13 @@ class App(tk.Tk):
         slider.pack(side="left", expand=True, fill="x")
         ttk.Label(frame_slider, textvariable=self.division_label_var, width=10).pack(side="left")
 
+        # --- NUEVO: Perfilado opcional (tiempos por fase y perfil de llamadas por bloque, por separado) ---
+        # El perfil de llamadas infla las fases con más llamadas de Python: conviene medir las fases sin él.
+        self.perfilar_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(frame_config, text="Perfilar entrenamiento (tiempos por fase)", variable=self.perfilar_var).grid(row=9, column=0, columnspan=2, sticky="w", padx=5, pady=5)
+        self.capturar_perfil_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(frame_config, text=f"Capturar perfil de llamadas ({MOTOR_PERFIL})", variable=self.capturar_perfil_var).grid(row=10, column=0, columnspan=2, sticky="w", padx=5, pady=5)
+
         self.btn_iniciar = ttk.Button(frame_izquierdo, text="Iniciar Entrenamiento", command=self.iniciar_entrenamiento_nuevo); self.btn_iniciar.pack(pady=10, fill="x")
         self.btn_cancelar = ttk.Button(frame_izquierdo, text="Cancelar Entrenamiento", command=self.detener_entrenamiento, state="disabled"); self.btn_cancelar.pack(pady=5, fill="x")
         self.label_animacion = ttk.Label(frame_izquierdo, text="", font=("Arial", 10, "italic"))
@@ -197,9 +285,11 @@ class App(tk.Tk):
         frame_consola.pack(fill="both", expand=True, pady=10)
         self.log_consola = tk.Text(frame_consola, height=10, state="disabled")
         self.log_consola.pack(fill="both", expand=True, padx=5, pady=5)
+        self.consola = ConsolaAcotada(self.log_consola)
 
         self.fig, (self.ax1, self.ax2, self.ax3) = plt.subplots(3, 1, figsize=(9, 7), tight_layout=True)
         self.canvas = FigureCanvasTkAgg(self.fig, master=frame_graficas); self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.graficas_vivas = GraficaEnVivo(self.canvas)
         self.limpiar_graficas()
     
     def editar_patrones_salida(self):
@@ -235,17 +325,17 @@ class App(tk.Tk):
 
     def iniciar_entrenamiento_nuevo(self):
         self.limpiar_graficas()
-        self.log_consola.config(state="normal")
-        self.log_consola.delete("1.0", tk.END)
-        self.log_consola.config(state="disabled")
+        self.consola.vaciar()
         try:
             porcentaje_entrenamiento = self.division_var.get() / 100.0
+            perfilador_carga = PerfiladorFases() if self.perfilar_var.get() else None
 
             self.X_train, self.Y_train, self.X_val, self.Y_val, n_in, n_out, _, self.rutas_imagenes_totales = cargar_y_convertir_dataset(
                 self.ruta_dataset.get(), 
                 self.ruta_targets.get(),
                 porcentaje_entrenamiento,
-                semilla=self.semilla_var.get()
+                semilla=self.semilla_var.get(),
+                perfilador=perfilador_carga
             )
             
             if not self.X_train: messagebox.showerror("Error", "No se cargaron datos de entrenamiento."); return
@@ -277,6 +367,7 @@ class App(tk.Tk):
                 f"----------------------------------"
             )
             self.log_to_console(resumen_inicial)
+            if perfilador_carga is not None: self.log_to_console("Carga del dataset. " + perfilador_carga.texto_resumen())
 
             self.continuar_entrenamiento()
         except Exception as e:
@@ -291,23 +382,44 @@ class App(tk.Tk):
         self.hilo_entrenamiento = threading.Thread(target=self._hilo_entrenamiento_bloque, daemon=True)
         self.hilo_entrenamiento.start()
 
+    # --- NUEVO: Exportación del perfil de un bloque ---
+    def _guardar_perfil_bloque(self, perfilador, captura, epoca_final):
+        """
+        Se ejecuta en el hilo de entrenamiento: guarda los tiempos por fase (JSON/CSV)
+        y/o el perfil de llamadas, según cuál de los dos se haya activado (el otro es None).
+        """
+        os.makedirs(DIR_PERFILES, exist_ok=True)
+        ruta_base = os.path.join(DIR_PERFILES, f"bloque_{self.epoca_inicial_bloque + 1}-{epoca_final}_{time.strftime('%Y%m%d_%H%M%S')}")
+        resumenes = []
+        if perfilador is not None:
+            perfilador.exportar_json(ruta_base + "_fases.json")
+            perfilador.exportar_csv(ruta_base + "_fases.csv")
+            resumenes.append(perfilador.texto_resumen())
+        if captura is not None:
+            resumenes.append(f"Perfil de llamadas ({captura.motor}):\n" + captura.guardar(ruta_base))
+        logging.info(f"Perfil del bloque guardado en {ruta_base}*")
+        self.cola_gui.put(("log_message", "\n".join(resumenes) + f"\nPerfil guardado en: {ruta_base}*"))
+
     def _hilo_entrenamiento_bloque(self):
         try:
-            def reportar_progreso(epoca_actual):
-                self.cola_gui.put(("progress_update", epoca_actual))
-            
-            epoca, h_mse_train, h_mse_val, h_matrices, log_b, completo = self.mlp_actual.entrenar_bloque(
-                X_train=self.X_train, Y_train=self.Y_train,
-                X_val=self.X_val, Y_val=self.Y_val,
-                clases_info=self.clases_info,
-                tasa_aprendizaje=float(self.tasa_aprendizaje_var.get()),
-                error_deseado=float(self.error_deseado_var.get()),
-                momentum=float(self.momentum_var.get()) if self.momentum_activado.get() else 0.0,
-                epoca_inicio=self.epoca_inicial_bloque,
-                max_epocas_bloque=self.epocas_bloque_var.get(),
-                cancel_event=lambda: self.entrenamiento_cancelado,
-                progress_callback=reportar_progreso
-            )
+            # --- NUEVO: Perfilado opcional del bloque ---
+            capturar = self.capturar_perfil_var.get()
+            perfilador = PerfiladorFases() if self.perfilar_var.get() else None
+            with (CapturaPerfil(MOTOR_PERFIL) if capturar else contextlib.nullcontext()) as captura:
+                epoca, h_mse_train, h_mse_val, h_matrices, log_b, completo = self.mlp_actual.entrenar_bloque(
+                    X_train=self.X_train, Y_train=self.Y_train,
+                    X_val=self.X_val, Y_val=self.Y_val,
+                    clases_info=self.clases_info,
+                    tasa_aprendizaje=float(self.tasa_aprendizaje_var.get()),
+                    error_deseado=float(self.error_deseado_var.get()),
+                    momentum=float(self.momentum_var.get()) if self.momentum_activado.get() else 0.0,
+                    epoca_inicio=self.epoca_inicial_bloque,
+                    max_epocas_bloque=self.epocas_bloque_var.get(),
+                    cancel_event=lambda: self.entrenamiento_cancelado,
+                    canal_metricas=self.canal_metricas,
+                    perfilador=perfilador
+                )
+            if perfilador is not None or capturar: self._guardar_perfil_bloque(perfilador, captura, epoca)
             
             # <--- CAMBIO: El diccionario de resultado ahora incluye ambos historiales de MSE ---
             resultado = {
@@ -324,23 +436,41 @@ class App(tk.Tk):
             self.cola_gui.put(("show_error", ("Error en Entrenamiento", str(e))))
 
     def procesar_cola_gui(self):
+        # --- MODIFICADO: Se vacía la cola entera en cada tick (con presupuesto de tiempo) ---
+        # Los 'log_message' se juntan en una sola inserción; el resto de mensajes se
+        # atiende en orden. La época en curso la muestra _drenar_metricas.
+        limite = time.perf_counter() + PRESUPUESTO_COLA_S
+        lineas_log = []
         try:
-            mensaje, datos = self.cola_gui.get_nowait()
-            self.animar_carga(stop=True)
-            if mensaje == "show_error":
-                messagebox.showerror(datos[0], datos[1]); self.detener_entrenamiento()
-            elif mensaje == "progress_update":
-                self.label_animacion.config(text=f"Entrenando... Época {datos}")
-            elif mensaje == "log_message":
-                self.log_to_console(datos) 
-            elif mensaje in ["bloque_finalizado", "entrenamiento_finalizado"]:
-                if datos["log_del_bloque"]:
-                    self.log_to_console("\n".join(datos["log_del_bloque"]))
-                
-                callback = self.mostrar_dialogo_opciones if mensaje == "bloque_finalizado" else self.mostrar_mensaje_final
-                self.animar_graficas(datos, callback)
-        except queue.Empty: pass
-        finally: self.after(100, self.procesar_cola_gui)
+            self._drenar_metricas()
+            while time.perf_counter() < limite:
+                try: mensaje, datos = self.cola_gui.get_nowait()
+                except queue.Empty: break
+                if mensaje == "log_message": lineas_log.append(datos)
+                else:
+                    # Antes de un diálogo o cambio de estado se vuelca lo acumulado
+                    self._volcar_lineas_log(lineas_log)
+                    lineas_log = []
+                    self._despachar_mensaje(mensaje, datos)
+        finally:
+            self._volcar_lineas_log(lineas_log)
+            self.after(INTERVALO_COLA_MS, self.procesar_cola_gui)
+
+    def _volcar_lineas_log(self, lineas_log):
+        if lineas_log:
+            self.log_to_console("\n".join(lineas_log))
+
+    def _despachar_mensaje(self, mensaje, datos):
+        self.animar_carga(stop=True)
+        if mensaje == "show_error":
+            messagebox.showerror(datos[0], datos[1]); self.detener_entrenamiento()
+        elif mensaje in ["bloque_finalizado", "entrenamiento_finalizado"]:
+            self._drenar_metricas() # Lo que quede del bloque, antes del estado final
+            if datos["log_del_bloque"]:
+                self.log_to_console("\n".join(datos["log_del_bloque"]))
+            
+            callback = self.mostrar_dialogo_opciones if mensaje == "bloque_finalizado" else self.mostrar_mensaje_final
+            self.finalizar_bloque_graficas(datos, callback)
 
     def mostrar_dialogo_opciones(self):
         dialog = OpcionesDialog(self); resultado = dialog.result
@@ -389,11 +519,8 @@ class App(tk.Tk):
 
     # --- CAMBIO: Nueva función helper para escribir en la consola ---
     def log_to_console(self, message):
-        """Inserta un mensaje en el widget de la consola de forma segura."""
-        self.log_consola.config(state="normal")
-        self.log_consola.insert(tk.END, message + "\n")
-        self.log_consola.see(tk.END)
-        self.log_consola.config(state="disabled")
+        """Inserta un mensaje en la consola (acotada) y lo guarda en el log en disco."""
+        self.consola.escribir(message)
 
     def animar_carga(self, stop=False):
         if stop:
@@ -403,92 +530,61 @@ class App(tk.Tk):
         self.epoca_inicial_bloque = 0
         self.historial_mse_train, self.historial_mse_val = [], []
         self.historial_matrices = []
-        self.linea_mse_train, self.linea_mse_val = None, None
-        self.linea_precision_train, self.linea_precision_val = None, None
+        self.linea_precision_train = None
         
         for ax in [self.ax1, self.ax2, self.ax3]: ax.clear(); ax.grid(True)
         
+        # --- MODIFICADO: Las líneas se crean una sola vez (animadas, con buffers preasignados) ---
+        self.graficas_vivas.reiniciar()
+        self.linea_mse_train = self.graficas_vivas.agregar_linea("mse_train", self.ax1, 'b-', label='Entrenamiento')
+        self.linea_mse_val = self.graficas_vivas.agregar_linea("mse_val", self.ax1, 'r-', label='Validación')
+        self.linea_precision_val = self.graficas_vivas.agregar_linea("precision_val", self.ax2, 'r-', label='Validación')
+
         # Gráfica de Error (ax1) se mantiene como estaba originalmente
         self.ax1.set_title("MSE vs. Épocas"); self.ax1.set_xlabel("Época"); self.ax1.set_ylabel("MSE")
-        self.ax1.legend(["Entrenamiento", "Validación"], loc="upper right")
+        self.ax1.legend(loc="upper right")
 
         self.ax2.set_title("Precisión Validación vs Épocas (cada 25 épocas)")
         self.ax2.set_xlabel("Época")
         self.ax2.set_ylabel("Precisión")
         self.ax3.set_title("Matriz de Confusión (Validación)"); self.ax3.set_xlabel("Predicción"); self.ax3.set_ylabel("Real")
         self.ax3.set_xticks([]); self.ax3.set_yticks([])
+        self.ultimo_dibujo_matriz = 0.0
+        self.canal_metricas.extraer_todo() # Se descartan métricas de un entrenamiento anterior
         self.canvas.draw()
         
-    def animar_graficas(self, datos_resultado, on_done_callback):
-        epoca_final_anterior = self.epoca_inicial_bloque
+    # --- NUEVO: Métricas en vivo (sustituye la reproducción del bloque al terminar) ---
+    def _drenar_metricas(self):
+        """Pasa a las gráficas todos los registros pendientes del canal, con un solo repintado."""
+        registros = self.canal_metricas.extraer_todo()
+        if not registros: return
+        INTERVALO_MATRIZ_S = 0.5
+        epocas = [r["epoca"] for r in registros]
+        self.graficas_vivas.agregar_puntos("mse_train", epocas, [r["mse_train"] for r in registros])
+        self.graficas_vivas.agregar_puntos("mse_val", epocas, [r["mse_val"] for r in registros])
+        con_precision = [r for r in registros if "precision_val" in r]
+        if con_precision:
+            self.graficas_vivas.agregar_puntos("precision_val", [r["epoca"] for r in con_precision],
+                                               [r["precision_val"] for r in con_precision])
+
+        # La matriz de confusión obliga a redibujar el fondo: como mucho una vez cada INTERVALO_MATRIZ_S
+        redibujar_fondo = False
+        con_matriz = [r for r in con_precision if "matriz_val" in r]
+        if con_matriz and time.perf_counter() - self.ultimo_dibujo_matriz >= INTERVALO_MATRIZ_S:
+            self.dibujar_matriz_confusion_estatica(con_matriz[-1]["matriz_val"], epoca_actual=con_matriz[-1]["epoca"])
+            self.ultimo_dibujo_matriz = time.perf_counter()
+            redibujar_fondo = True
+        self.graficas_vivas.actualizar(redibujar_fondo=redibujar_fondo)
+        self.label_animacion.config(text=f"Entrenando... Época {epocas[-1]}")
+
+    def finalizar_bloque_graficas(self, datos_resultado, on_done_callback):
+        """Guarda los historiales completos del bloque y dibuja su estado final (sin reproducirlo)."""
         self.epoca_inicial_bloque = datos_resultado["epoca_final"]
         self.historial_mse_train.extend(datos_resultado["historial_mse_train_bloque"])
         self.historial_mse_val.extend(datos_resultado["historial_mse_val_bloque"])
         self.historial_matrices.extend(datos_resultado["historial_matrices_bloque"])
-        
-        eje_x_nuevo = range(epoca_final_anterior + 1, self.epoca_inicial_bloque + 1)
-        
-        self.animacion_activa = True
-        self._bucle_animacion(
-            eje_x_nuevo,
-            datos_resultado["historial_mse_train_bloque"],
-            datos_resultado["historial_mse_val_bloque"],
-            datos_resultado["historial_matrices_bloque"],
-            0,
-            on_done_callback
-        )
-
-    def _bucle_animacion(self, x_data, mse_train_data, mse_val_data, matrices_data, index, on_done_callback):
-        if not self.animacion_activa or index >= len(x_data):
-            if self.animacion_activa: self.dibujar_estado_final_graficas(); self.after(100, on_done_callback)
-            self.animacion_activa = False; return
-
-        step = 25; delay_ms = 20; MUESTRAS_MATRIZ = 25
-        
-        if not self.linea_mse_train: self.linea_mse_train, = self.ax1.plot([], [], 'b-', label='Entrenamiento')
-        if not self.linea_mse_val: self.linea_mse_val, = self.ax1.plot([], [], 'r-', label='Validación')
-        if not self.linea_precision_train: self.linea_precision_train, = self.ax2.plot([], [], 'b-', label='Entrenamiento')
-        if not self.linea_precision_val: self.linea_precision_val, = self.ax2.plot([], [], 'r-', label='Validación')
-        
-        next_index = min(index + step, len(x_data))
-
-        # Actualizar MSE
-        self.linea_mse_train.set_data(np.append(self.linea_mse_train.get_xdata(), x_data[index:next_index]), np.append(self.linea_mse_train.get_ydata(), mse_train_data[index:next_index]))
-        self.linea_mse_val.set_data(np.append(self.linea_mse_val.get_xdata(), x_data[index:next_index]), np.append(self.linea_mse_val.get_ydata(), mse_val_data[index:next_index]))
-        
-        # Actualizar Precisión
-        if matrices_data:
-            precision_val_segmento = []
-            for i in range(index, next_index):
-                epoca_actual = x_data[i]
-                indice_matriz = (epoca_actual - 1) // MUESTRAS_MATRIZ
-                if indice_matriz < len(matrices_data):
-                    matriz = matrices_data[indice_matriz]
-                    precision = np.trace(matriz) / len(self.X_val) if len(self.X_val) > 0 else 0
-                    precision_val_segmento.append(precision)
-                else:
-                    if len(self.linea_precision_val.get_ydata()) > 0:
-                        precision_val_segmento.append(self.linea_precision_val.get_ydata()[-1])
-                    else:
-                        precision_val_segmento.append(0)
-
-            self.linea_precision_val.set_data(
-                np.append(self.linea_precision_val.get_xdata(), x_data[index:next_index]),
-                np.append(self.linea_precision_val.get_ydata(), precision_val_segmento)
-            )
-
-        # Mostrar Matriz de Confusión
-        if matrices_data:
-            indice_matriz_display = (x_data[index] - 1) // MUESTRAS_MATRIZ
-            if indice_matriz_display < len(matrices_data):
-                matriz_a_mostrar = matrices_data[indice_matriz_display]
-                self.dibujar_matriz_confusion_estatica(matriz_a_mostrar, epoca_actual=x_data[index])
-
-        self.ax1.relim(); self.ax1.autoscale_view(); self.ax1.legend()
-        self.ax2.relim(); self.ax2.autoscale_view() 
-        self.canvas.draw()
-        
-        self.after(delay_ms, self._bucle_animacion, x_data, mse_train_data, mse_val_data, matrices_data, next_index, on_done_callback)
+        self.dibujar_estado_final_graficas()
+        self.after(100, on_done_callback)
 
     def _calcular_matriz_confusion_estatica(self, X_data, Y_data):
         matriz = np.zeros((len(self.nombres_clases), len(self.nombres_clases)))
@@ -529,11 +625,9 @@ class App(tk.Tk):
         
         eje_x = range(1, len(self.historial_mse_train) + 1)
         
-        # Dibujar las líneas de MSE
-        if not self.linea_mse_train: self.linea_mse_train, = self.ax1.plot(eje_x, self.historial_mse_train, 'b-', label='Entrenamiento')
-        else: self.linea_mse_train.set_data(eje_x, self.historial_mse_train)
-        if not self.linea_mse_val: self.linea_mse_val, = self.ax1.plot(eje_x, self.historial_mse_val, 'r-', label='Validación')
-        else: self.linea_mse_val.set_data(eje_x, self.historial_mse_val)
+        # Dibujar las líneas de MSE (se deciman al ancho del eje al dibujarlas)
+        self.graficas_vivas.reemplazar("mse_train", eje_x, self.historial_mse_train)
+        self.graficas_vivas.reemplazar("mse_val", eje_x, self.historial_mse_val)
 
         # Dibujar la línea de Precisión
         eje_x_prec = []
@@ -546,21 +640,17 @@ class App(tk.Tk):
                 eje_x_prec.append(epoca)
                 precision_val.append(acc)
         
-        if not self.linea_precision_val:
-            self.linea_precision_val, = self.ax2.plot(eje_x_prec, precision_val, 'r-o', label='Validación')
-        else:
-            self.linea_precision_val.set_data(eje_x_prec, precision_val)
-            self.linea_precision_val.set_linestyle('-')
-            self.linea_precision_val.set_marker('o')
+        self.graficas_vivas.reemplazar("precision_val", eje_x_prec, precision_val)
+        self.linea_precision_val.set_linestyle('-')
+        self.linea_precision_val.set_marker('o')
 
         # Dibujar la Matriz final
-        if self.X_val:
+        if len(self.X_val):
             matriz_final = self._calcular_matriz_confusion_estatica(self.X_val, self.Y_val)
             self.dibujar_matriz_confusion_estatica(matriz_final, epoca_actual=len(self.historial_mse_train))
         
-        self.ax1.relim(); self.ax1.autoscale_view(); self.ax1.legend()
-        self.ax2.relim(); self.ax2.autoscale_view() 
-        self.canvas.draw()
+        # Ajustar los ejes a todo el historial y dibujar en el canvas
+        self.graficas_vivas.redibujar_todo()
 
     def on_tab_changed(self, event):
         selected_tab_index = self.notebook.index(self.notebook.select())
@@ -573,6 +663,7 @@ class App(tk.Tk):
 
         self.canvas_red = tk.Canvas(self.frame_uso_principal, bg="white")
         self.canvas_red.pack(side="left", fill="both", expand=True, padx=10, pady=10)
+        self.canvas_red.bind("<Configure>", self._al_redimensionar_red)
         
         frame_controles = ttk.Frame(self.frame_uso_principal, width=300)
         frame_controles.pack(side="left", fill="y", padx=10, pady=10)
@@ -598,16 +689,25 @@ class App(tk.Tk):
         self.label_prediccion_letra.pack(pady=20, fill="x")
 
     def cargar_recursos_uso(self):
+        # --- MODIFICADO: Solo se recarga si el archivo del modelo cambió desde la última carga ---
+        try: firma_modelo = (os.path.getmtime(RUTA_MODELO_USO), os.path.getsize(RUTA_MODELO_USO))
+        except OSError: firma_modelo = None
+        if self.mlp_uso and self.clases_info_uso and firma_modelo is not None and firma_modelo == self.firma_modelo_uso:
+            self.dibujar_red_uso() # No hace nada si el canvas no cambió de tamaño
+            return
+
         logging.info("Cambiando a la pestaña de Uso. Recargando modelo y targets...")
         self.clases_info_uso.clear()
         modelo_cargado = False
 
         try:
             # Ahora esperamos recibir el modelo y la info de las clases
-            self.mlp_uso, clases_info_cargadas = MLP.cargar_modelo("modelo_mlp.json")
+            self.mlp_uso, clases_info_cargadas = MLP.cargar_modelo(RUTA_MODELO_USO)
+            self.version_modelo_uso += 1
             
             if self.mlp_uso and clases_info_cargadas:
                 modelo_cargado = True
+                self.firma_modelo_uso = firma_modelo
                 # Usamos la info de clases que vino CON el modelo
                 self.clases_info_uso = clases_info_cargadas
                 logging.info("Modelo y datos de clases cargados exitosamente desde 'modelo_mlp.json'.")
@@ -668,17 +768,29 @@ class App(tk.Tk):
         except Exception as e:
             messagebox.showerror("Error al Predecir", str(e))
     
+    def _al_redimensionar_red(self, event):
+        if self.after_redibujo_red: self.after_cancel(self.after_redibujo_red)
+        self.after_redibujo_red = self.after(RETARDO_REDIBUJO_RED_MS, self.dibujar_red_uso)
+
     def dibujar_red_uso(self, salidas_ocultas=None, salidas_finales=None):
+        # --- MODIFICADO: Solo se redibuja si cambió el modelo o el tamaño del canvas ---
+        self.after_redibujo_red = None
+        w, h = self.canvas_red.winfo_width(), self.canvas_red.winfo_height()
+        firma = (self.version_modelo_uso, w, h)
+        if firma == self.firma_dibujo_red: return
+        self.firma_dibujo_red = firma
+
         self.canvas_red.delete("all")
         if not self.mlp_uso: return
-        w, h = self.canvas_red.winfo_width(), self.canvas_red.winfo_height()
         x_in, x_hidden, x_out = w * 0.1, w * 0.5, w * 0.9
         self.canvas_red.create_oval(x_in-20, h/2-20, x_in+20, h/2+20, fill="lightgray"); self.canvas_red.create_text(x_in, h/2, text=f"{self.mlp_uso.neuronas_entrada}\nEntradas")
         y_step_h = h / (self.mlp_uso.neuronas_ocultas + 1)
         for j in range(self.mlp_uso.neuronas_ocultas):
             y_h = y_step_h * (j + 1)
             self.canvas_red.create_oval(x_hidden-15, y_h-15, x_hidden+15, y_h+15, fill="lightblue")
-            for i in range(self.mlp_uso.neuronas_entrada): self.canvas_red.create_line(x_in, h/2, x_hidden, y_h, fill="gray")
+            # Las entradas están agrupadas en un solo nodo: sus N líneas coincidían; basta una (más gruesa)
+            self.canvas_red.create_line(x_in, h/2, x_hidden, y_h, fill="gray", width=2)
+        rotular_pesos = self.mlp_uso.neuronas_ocultas * self.mlp_uso.neuronas_salida <= MAX_ETIQUETAS_PESOS
         y_step_o = h / (self.mlp_uso.neuronas_salida + 1)
         for k in range(self.mlp_uso.neuronas_salida):
             y_o = y_step_o * (k + 1)
@@ -686,7 +798,8 @@ class App(tk.Tk):
             for j in range(self.mlp_uso.neuronas_ocultas):
                 y_h = y_step_h * (j + 1)
                 self.canvas_red.create_line(x_hidden, y_h, x_out, y_o, fill="gray")
-                self.canvas_red.create_text((x_hidden+x_out)/2, (y_h+y_o)/2, text=f"{self.mlp_uso.pesos_ho[k][j]:.1f}", font=("Arial", 7))
+                if rotular_pesos:
+                    self.canvas_red.create_text((x_hidden+x_out)/2, (y_h+y_o)/2, text=f"{self.mlp_uso.pesos_ho[k][j]:.1f}", font=("Arial", 7))
 
     def probar_imagen_aleatoria(self):
         """
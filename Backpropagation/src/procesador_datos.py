@@ -2,12 +2,15 @@ import os
 import numpy as np
 from PIL import Image
 import random 
+from perfilado import reloj_de
 
-def cargar_y_convertir_dataset(ruta_dataset, ruta_targets, porcentaje_entrenamiento=0.8, semilla=0):
+def cargar_y_convertir_dataset(ruta_dataset, ruta_targets, porcentaje_entrenamiento=0.8, semilla=0, perfilador=None):
     """
     Carga un dataset de imágenes, las convierte a escala de grises, las aplana a vectores,
     y las divide en conjuntos de entrenamiento y validación.
+    'perfilador' (opcional, ver perfilado.py) recibe el tiempo de cada fase de la carga.
     """
+    reloj = reloj_de(perfilador)
 
     if semilla != 0:
         random.seed(semilla)
@@ -36,6 +39,7 @@ def cargar_y_convertir_dataset(ruta_dataset, ruta_targets, porcentaje_entrenamie
     archivos_invalidos = []
     # Usaremos el tamaño del primer vector procesado como el estándar para todo el dataset
     tamano_vector_esperado = -1 
+    inicio_lectura = reloj()
 
     print("Procesando dataset de imágenes...")
     for nombre_clase in sorted(os.listdir(ruta_dataset)):
@@ -79,6 +83,7 @@ def cargar_y_convertir_dataset(ruta_dataset, ruta_targets, porcentaje_entrenamie
         datos_por_clase[nombre_clase] = patrones_clase
 
     # 3. División estratificada y mezcla aleatoria (sin cambios, ya estaba bien)
+    inicio_division = reloj()
     X_train, Y_train, X_val, Y_val = [], [], [], []
     for nombre_clase, patrones in datos_por_clase.items():
         random.shuffle(patrones)
@@ -101,6 +106,10 @@ def cargar_y_convertir_dataset(ruta_dataset, ruta_targets, porcentaje_entrenamie
         random.shuffle(temp_val)
         X_val, Y_val = list(zip(*temp_val))
     
+    if perfilador is not None:
+        perfilador.agregar("lectura_imagenes", inicio_division - inicio_lectura)
+        perfilador.agregar("division_mezcla", reloj() - inicio_division)
+
     # 4. Devolver los resultados
     return list(X_train), list(Y_train), list(X_val), list(Y_val), tamano_vector_esperado, tamano_salida, archivos_invalidos, rutas_totales
 
@@ -0,0 +1,240 @@
+# graficas_vivas.py
+"""
+Capa de dibujo para las gráficas de entrenamiento en tiempo real.
+
+- BufferCircular: arrays de NumPy preasignados; agregar puntos es O(k) y no
+  copia el historial (np.append copiaba todo en cada tick).
+- decimar_min_max: reduce una serie a ~2 puntos por píxel de ancho (mínimo y
+  máximo de cada columna), así el coste de dibujar no crece con las épocas y
+  los picos siguen siendo visibles.
+- GraficaEnVivo: dibuja las líneas con blitting. El fondo de la figura (ejes,
+  textos, leyenda, matriz de confusión) se guarda una vez y en cada tick solo
+  se repintan las líneas. Un canvas.draw() completo solo ocurre cuando los
+  datos se salen de los límites de los ejes (el eje X crece al doble, así que
+  son O(log n) redibujados en todo el entrenamiento).
+- CanalMetricas: canal acotado entre el hilo de entrenamiento (publica un
+  registro por época) y la GUI (lo vacía entero en cada tick).
+"""
+import threading
+import numpy as np
+
+CAPACIDAD_BUFFER = 200_000   # Puntos por línea que se conservan (los más recientes)
+MARGEN_EJE_Y = 0.05          # Margen relativo al ampliar el eje Y
+CAPACIDAD_CANAL = 4096       # Registros pendientes como máximo antes de compactar
+
+class CanalMetricas:
+    """
+    Registros por época ({"epoca", "mse_train", "mse_val"} y, en las épocas con
+    matriz, "precision_val" y "matriz_val") del hilo de entrenamiento a la GUI.
+    Si la GUI se retrasa y el canal se llena, los pendientes se compactan en vez
+    de bloquear al productor: se conserva uno de cada dos registros de MSE, todos
+    los de precisión y solo la matriz más reciente.
+    """
+    def __init__(self, capacidad=CAPACIDAD_CANAL):
+        self.capacidad = capacidad
+        self._registros = []
+        self._cerrojo = threading.Lock()
+        self.descartados = 0
+
+    def publicar(self, registro):
+        with self._cerrojo:
+            self._registros.append(registro)
+            if len(self._registros) >= self.capacidad:
+                self._compactar()
+
+    def _compactar(self):
+        ultimo = self._registros[-1]
+        conservados = [r for i, r in enumerate(self._registros) if i % 2 == 1 or "precision_val" in r]
+        if conservados[-1] is not ultimo: conservados.append(ultimo)
+        indice_ultima_matriz = max((i for i, r in enumerate(conservados) if "matriz_val" in r), default=-1)
+        for i, r in enumerate(conservados):
+            if i != indice_ultima_matriz and "matriz_val" in r:
+                conservados[i] = {k: v for k, v in r.items() if k != "matriz_val"}
+        self.descartados += len(self._registros) - len(conservados)
+        self._registros = conservados
+
+    def extraer_todo(self):
+        """Devuelve y vacía todos los registros pendientes (en orden)."""
+        with self._cerrojo:
+            registros, self._registros = self._registros, []
+        return registros
+
+class BufferCircular:
+    def __init__(self, capacidad=CAPACIDAD_BUFFER):
+        self.capacidad = capacidad
+        self.x = np.empty(capacidad, dtype=np.float64)
+        self.y = np.empty(capacidad, dtype=np.float64)
+        self.inicio = 0      # Índice del punto más antiguo
+        self.tamano = 0
+
+    def vaciar(self):
+        self.inicio = 0; self.tamano = 0
+
+    def agregar(self, xs, ys):
+        """Agrega varios puntos de una vez; si no caben, se descartan los más antiguos."""
+        xs = np.asarray(xs, dtype=np.float64).ravel()
+        ys = np.asarray(ys, dtype=np.float64).ravel()
+        if len(xs) > self.capacidad:
+            xs, ys = xs[-self.capacidad:], ys[-self.capacidad:]
+        k = len(xs)
+        if k == 0: return
+        fin = (self.inicio + self.tamano) % self.capacidad
+        # Hasta dos tramos: del final del buffer y, si da la vuelta, desde el principio
+        primer_tramo = min(k, self.capacidad - fin)
+        self.x[fin:fin + primer_tramo] = xs[:primer_tramo]; self.y[fin:fin + primer_tramo] = ys[:primer_tramo]
+        self.x[:k - primer_tramo] = xs[primer_tramo:]; self.y[:k - primer_tramo] = ys[primer_tramo:]
+        sobrantes = max(0, self.tamano + k - self.capacidad)
+        self.inicio = (self.inicio + sobrantes) % self.capacidad
+        self.tamano = min(self.capacidad, self.tamano + k)
+
+    def datos(self):
+        """(x, y) en orden cronológico. Es una vista si el buffer no ha dado la vuelta."""
+        fin = self.inicio + self.tamano
+        if fin <= self.capacidad:
+            return self.x[self.inicio:fin], self.y[self.inicio:fin]
+        resto = fin - self.capacidad
+        return (np.concatenate([self.x[self.inicio:], self.x[:resto]]),
+                np.concatenate([self.y[self.inicio:], self.y[:resto]]))
+
+    def ultimo(self):
+        """Último (x, y) agregado, o None si está vacío."""
+        if self.tamano == 0: return None
+        i = (self.inicio + self.tamano - 1) % self.capacidad
+        return self.x[i], self.y[i]
+
+def decimar_min_max(x, y, n_columnas):
+    """
+    Reduce (x, y) a como máximo 2 * n_columnas puntos: para cada grupo de
+    puntos consecutivos se conservan el mínimo y el máximo (en su orden).
+    """
+    n = len(x)
+    n_columnas = max(1, int(n_columnas))
+    if n <= 2 * n_columnas: return x, y
+    tam_grupo = -(-n // n_columnas)  # División redondeando hacia arriba
+    n_grupos = -(-n // tam_grupo)
+    # Se rellena con el último valor para poder hacer reshape (n_grupos x tam_grupo)
+    relleno = n_grupos * tam_grupo - n
+    y_grupos = np.concatenate([y, np.full(relleno, y[-1])]).reshape(n_grupos, tam_grupo)
+    base = np.arange(n_grupos) * tam_grupo
+    i_min = np.minimum(base + np.argmin(y_grupos, axis=1), n - 1)
+    i_max = np.minimum(base + np.argmax(y_grupos, axis=1), n - 1)
+    indices = np.sort(np.stack([i_min, i_max], axis=1), axis=1).ravel()
+    return x[indices], y[indices]
+
+class GraficaEnVivo:
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.figura = canvas.figure
+        self.lineas = {}       # nombre -> (Line2D, BufferCircular)
+        self.pendientes = set()
+        self.fondo = None
+        self.ejes_ajustados = set()  # Ejes cuyos límites ya se calcularon a partir de datos
+        self._id_evento = canvas.mpl_connect("draw_event", self._al_dibujar)
+
+    def desconectar(self):
+        self.canvas.mpl_disconnect(self._id_evento)
+
+    def agregar_linea(self, nombre, ax, estilo, capacidad=CAPACIDAD_BUFFER, **kwargs):
+        """Crea una línea animada (excluida del fondo) asociada a un buffer."""
+        linea, = ax.plot([], [], estilo, animated=True, **kwargs)
+        self.lineas[nombre] = (linea, BufferCircular(capacidad))
+        return linea
+
+    def agregar_puntos(self, nombre, xs, ys):
+        self.lineas[nombre][1].agregar(xs, ys)
+        self.pendientes.add(nombre)
+
+    def reemplazar(self, nombre, xs, ys):
+        """Sustituye todos los puntos de una línea (ej. al dibujar el estado final)."""
+        buffer = self.lineas[nombre][1]
+        buffer.vaciar(); buffer.agregar(xs, ys)
+        self.pendientes.add(nombre)
+
+    def ultimo(self, nombre):
+        return self.lineas[nombre][1].ultimo()
+
+    def reiniciar(self):
+        """Olvida todas las líneas (tras ax.clear() hay que volver a crearlas)."""
+        self.lineas.clear(); self.pendientes.clear(); self.ejes_ajustados.clear()
+        self.fondo = None
+
+    def vaciar(self):
+        for linea, buffer in self.lineas.values():
+            buffer.vaciar(); linea.set_data([], [])
+        self.pendientes.clear()
+        self.ejes_ajustados.clear()
+
+    def _columnas(self, ax):
+        """Ancho en píxeles del eje (resolución a la que se decima)."""
+        return max(1, int(ax.bbox.width))
+
+    def _preparar_linea(self, linea, buffer):
+        """Decima el buffer al ancho del eje. Devuelve True si los datos salen de los límites."""
+        x, y = buffer.datos()
+        x, y = decimar_min_max(x, y, self._columnas(linea.axes))
+        linea.set_data(x, y)
+        if len(x) == 0: return False
+        ax = linea.axes
+        x_min, x_max = ax.get_xlim(); y_min, y_max = ax.get_ylim()
+        return x[0] < x_min or x[-1] > x_max or np.min(y) < y_min or np.max(y) > y_max
+
+    def _ajustar_limites(self, ax, ampliar=True):
+        """
+        Ajusta los límites del eje para que quepan todas sus líneas (X crece al doble).
+        Con ampliar=True los límites actuales solo se extienden, nunca se reducen.
+        """
+        xs_min, xs_max, ys_min, ys_max = [], [], [], []
+        for linea, buffer in self.lineas.values():
+            if linea.axes is not ax or buffer.tamano == 0: continue
+            x, y = buffer.datos()
+            xs_min.append(x[0]); xs_max.append(x[-1]); ys_min.append(np.min(y)); ys_max.append(np.max(y))
+        if not xs_min: return
+        x_min, x_max = min(xs_min), max(xs_max)
+        ax.set_xlim(x_min, x_min + 2 * max(x_max - x_min, 1.0))
+        y_min, y_max = min(ys_min), max(ys_max)
+        margen = (y_max - y_min) * MARGEN_EJE_Y or max(abs(y_max) * MARGEN_EJE_Y, 1e-3)
+        y_min, y_max = y_min - margen, y_max + margen
+        if ampliar and ax in self.ejes_ajustados:
+            y_actual_min, y_actual_max = ax.get_ylim()
+            y_min, y_max = min(y_min, y_actual_min), max(y_max, y_actual_max)
+        ax.set_ylim(y_min, y_max)
+        self.ejes_ajustados.add(ax)
+
+    def actualizar(self, redibujar_fondo=False):
+        """
+        Repinta las líneas con datos nuevos: blit si caben en los ejes, draw completo si no
+        (o si redibujar_fondo=True porque cambió otro elemento de la figura).
+        """
+        if not self.pendientes and not redibujar_fondo: return
+        fuera_de_limites = set()
+        for nombre in self.pendientes:
+            linea, buffer = self.lineas[nombre]
+            if self._preparar_linea(linea, buffer):
+                fuera_de_limites.add(linea.axes)
+        self.pendientes.clear()
+
+        if fuera_de_limites or redibujar_fondo or self.fondo is None:
+            for ax in fuera_de_limites: self._ajustar_limites(ax)
+            for linea, buffer in self.lineas.values(): self._preparar_linea(linea, buffer)
+            self.canvas.draw()  # _al_dibujar guarda el fondo nuevo y pinta las líneas
+            return
+        self.canvas.restore_region(self.fondo)
+        self._dibujar_lineas()
+        self.canvas.blit(self.figura.bbox)
+
+    def redibujar_todo(self):
+        """Ajusta los límites a todos los datos y hace un draw completo (ej. tras cambiar el fondo)."""
+        for ax in {linea.axes for linea, _ in self.lineas.values()}:
+            self._ajustar_limites(ax, ampliar=False)
+        for linea, buffer in self.lineas.values(): self._preparar_linea(linea, buffer)
+        self.pendientes.clear()
+        self.canvas.draw()
+
+    def _dibujar_lineas(self):
+        for linea, _ in self.lineas.values():
+            linea.axes.draw_artist(linea)
+
+    def _al_dibujar(self, evento):
+        """Tras cada draw completo (incluidos cambios de tamaño) se guarda el fondo sin las líneas."""
+        self.fondo = self.canvas.copy_from_bbox(self.figura.bbox)
+        self._dibujar_lineas()
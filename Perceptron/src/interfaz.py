@@ -6,14 +6,25 @@ from PIL import Image, ImageTk
 import random
 import sys
 import os
+import time
+import queue
+import threading
+import numpy as np
 
 # Se importa la clase Perceptron y el diccionario de datos desde el archivo de lógica.
+from graficas_vivas import BufferCircular, decimar_min_max
 from perceptron import Perceptron, COMPUERTAS_LOGICAS
 
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.pyplot as plt
 
+# --- NUEVO: Entrenamiento en un hilo aparte ---
+INTERVALO_COLA_MS = 33              # Cada cuánto la GUI atiende la cola del hilo (~30 fps)
+PRESUPUESTO_COLA_S = 0.02           # Tiempo máximo por tick para vaciar la cola
+INTERVALO_INSTANTANEA_S = 1 / 30    # El hilo envía como mucho ~30 instantáneas por segundo
+EPOCAS_PAUSA = 500                  # Cada cuántas épocas se pregunta si continuar
+
 def resource_path(relative_path):
     """ Obtiene la ruta absoluta al recurso, funciona para desarrollo y para PyInstaller """
     try:
@@ -22,11 +33,11 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
-class TextRedirector:
-    """Clase auxiliar para redirigir la salida de la consola (stdout) a un widget Text de tkinter."""
-    def __init__(self, widget): self.widget = widget
-    def write(self, text_string):
-        self.widget.insert(tk.END, text_string); self.widget.see(tk.END); self.widget.update_idletasks()
+class ColaRedirector:
+    """Clase auxiliar para redirigir la salida de la consola (stdout) a la cola de la GUI.
+    Solo el hilo de Tk escribe en el widget (al atender la cola)."""
+    def __init__(self, cola): self.cola = cola
+    def write(self, text_string): self.cola.put(("log_message", text_string))
     def flush(self): pass
 
 class App(tk.Tk):
@@ -46,19 +57,28 @@ class App(tk.Tk):
         self.notebook.pack(expand=True, fill="both", padx=10, pady=10)
         
         self.entrenamiento_cancelado = False
-        self.historial_pesos = []
-        self.historial_errores_patron = []
+        self.cola_gui = queue.Queue()
+        self.hilo_entrenamiento = None
+        self.stdout_original = sys.stdout
+        self.respuesta_pausa = threading.Event(); self.continuar_tras_pausa = True
+        # --- MODIFICADO: Historiales en arrays preasignados (ver preparar_grafica_errores) ---
+        self.buffers_errores_patron = []; self.buffers_pesos = []
+        self.epocas_graficadas = 0
         self.perceptron_uso = Perceptron(pesos_iniciales=[0, 0, 0])
 
         self.crear_tab_entrenamiento()
         self.crear_tab_uso()
         self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_change)
         self.after(100, self.cargar_pesos_para_uso)
+        self.procesar_cola_gui()
 
     # Todas las siguientes funciones deben estar indentadas a este nivel
     
     def cerrar_aplicacion(self):
         """Maneja el cierre de la ventana para terminar el script de forma limpia."""
+        self.entrenamiento_cancelado = True
+        self.continuar_tras_pausa = False; self.respuesta_pausa.set() # Libera al hilo si espera una pausa
+        sys.stdout = self.stdout_original
         self.destroy(); self.quit()
 
     def crear_cabecera(self):
@@ -136,8 +156,6 @@ class App(tk.Tk):
         self.entrenamiento_cancelado = True
 
     def iniciar_entrenamiento(self):
-        self.btn_iniciar.config(state="disabled"); self.btn_cancelar.config(state="normal"); self.entrenamiento_cancelado = False
-        original_stdout = sys.stdout; sys.stdout = TextRedirector(self.log_texto)
         try:
             tasa = float(self.tasa_aprendizaje_var.get()); compuerta = self.compuerta_var.get()
             pesos_iniciales = None
@@ -146,42 +164,137 @@ class App(tk.Tk):
                 w1 = float(self.w1_entry_var.get()) if self.pesos_mode_var.get() == "manual" else random.uniform(-1, 1)
                 w2 = float(self.w2_entry_var.get()) if self.pesos_mode_var.get() == "manual" else random.uniform(-1, 1)
                 pesos_iniciales = [w0, w1, w2]
-            self.log_texto.delete("1.0", tk.END); self.limpiar_graficas(); self.historial_pesos = []; self.historial_errores_patron = []
-            self.perceptron_actual = Perceptron(tasa_aprendizaje=tasa, pesos_iniciales=pesos_iniciales)
-            self.preparar_grafica_puntos(compuerta)
-            pesos_finales = self.perceptron_actual.entrenar(compuerta=compuerta, callback=self.actualizar_en_tiempo_real)
-            print(f"\nEntrenamiento Finalizado.\nPesos: {[round(w, 4) for w in pesos_finales]}")
-            self.perceptron_actual.guardar_pesos()
-            if not self.entrenamiento_cancelado: messagebox.showinfo("Éxito", "Entrenamiento finalizado y pesos guardados.")
-        except ValueError: messagebox.showerror("Error de Entrada", "Por favor, revise los valores numéricos.")
-        except Exception as e: messagebox.showerror("Error Inesperado", f"Ha ocurrido un error: {e}")
+        except ValueError: messagebox.showerror("Error de Entrada", "Por favor, revise los valores numéricos."); return
+        self.btn_iniciar.config(state="disabled"); self.btn_cancelar.config(state="normal"); self.entrenamiento_cancelado = False
+        self.log_texto.delete("1.0", tk.END); self.limpiar_graficas()
+        self.stdout_original = sys.stdout; sys.stdout = ColaRedirector(self.cola_gui)
+        self.perceptron_actual = Perceptron(tasa_aprendizaje=tasa, pesos_iniciales=pesos_iniciales)
+        self.preparar_grafica_errores(compuerta); self.preparar_grafica_puntos(compuerta)
+        # --- MODIFICADO: El entrenamiento corre en un hilo; la GUI recibe instantáneas por la cola ---
+        self.hilo_entrenamiento = threading.Thread(target=self._hilo_entrenamiento, args=(compuerta,), daemon=True)
+        self.hilo_entrenamiento.start()
+
+    def _hilo_entrenamiento(self, compuerta):
+        """Se ejecuta fuera del hilo de Tk. No toca widgets: todo pasa por self.cola_gui."""
+        pendientes = {"pesos": [], "errores_patron": []}
+        estado = {"ultimo_envio": 0.0, "epoca": 0, "ultima_pausa": 0}
+
+        def enviar_instantanea():
+            if not pendientes["pesos"]: return
+            self.cola_gui.put(("instantanea", {
+                "epoca": estado["epoca"],
+                "pesos": pendientes["pesos"], "errores_patron": pendientes["errores_patron"],
+                "puntos_recta": self.perceptron_actual.obtener_puntos_recta()
+            }))
+            pendientes["pesos"], pendientes["errores_patron"] = [], []
+            estado["ultimo_envio"] = time.perf_counter()
+
+        def callback(epoca, pesos, errores_patron):
+            estado["epoca"] = epoca
+            pendientes["pesos"].append(pesos); pendientes["errores_patron"].append(errores_patron)
+            if time.perf_counter() - estado["ultimo_envio"] >= INTERVALO_INSTANTANEA_S:
+                enviar_instantanea()
+            if epoca > 0 and epoca % EPOCAS_PAUSA == 0 and epoca != estado["ultima_pausa"] and not self.entrenamiento_cancelado:
+                estado["ultima_pausa"] = epoca
+                enviar_instantanea()
+                if not self._esperar_respuesta_pausa(epoca): self.entrenamiento_cancelado = True
+            return not self.entrenamiento_cancelado
+
+        try:
+            pesos_finales = self.perceptron_actual.entrenar(compuerta=compuerta, callback=callback)
+            enviar_instantanea()
+            self.cola_gui.put(("entrenamiento_finalizado", pesos_finales))
+        except Exception as e:
+            self.cola_gui.put(("show_error", ("Error Inesperado", f"Ha ocurrido un error: {e}")))
+
+    def _esperar_respuesta_pausa(self, epoca):
+        """Desde el hilo de entrenamiento: pide a la GUI el diálogo de pausa y espera la respuesta."""
+        self.respuesta_pausa.clear()
+        self.cola_gui.put(("pausa", epoca))
+        self.respuesta_pausa.wait()
+        return self.continuar_tras_pausa
+
+    def procesar_cola_gui(self):
+        """Atiende los mensajes del hilo de entrenamiento (mismo patrón que la app TDI)."""
+        limite = time.perf_counter() + PRESUPUESTO_COLA_S
+        textos_log, instantaneas = [], []
+        try:
+            while time.perf_counter() < limite:
+                try: mensaje, datos = self.cola_gui.get_nowait()
+                except queue.Empty: break
+                if mensaje == "log_message": textos_log.append(datos)
+                elif mensaje == "instantanea": instantaneas.append(datos)
+                else:
+                    self._volcar_cola(textos_log, instantaneas); textos_log, instantaneas = [], []
+                    if mensaje == "pausa":
+                        self.continuar_tras_pausa = messagebox.askyesno("Entrenamiento en Pausa", f"Se han completado {datos} épocas.\n¿Desea continuar entrenando?")
+                        self.respuesta_pausa.set()
+                    elif mensaje == "entrenamiento_finalizado": self.finalizar_entrenamiento(datos)
+                    elif mensaje == "show_error":
+                        messagebox.showerror(datos[0], datos[1]); self.restaurar_controles()
         finally:
-            sys.stdout = original_stdout
-            self.btn_iniciar.config(state="normal"); self.btn_cancelar.config(state="disabled")
-
-    def actualizar_en_tiempo_real(self, epoca, pesos, errores_patron):
-        self.historial_pesos.append(pesos)
-        self.historial_errores_patron.append(errores_patron)
-        eje_x_epocas = range(len(self.historial_pesos))
-        self.ax1.clear(); self.ax1.grid(True); self.ax1.set_title(f"Error por Patrón (Época {epoca})")
-        self.ax1.set_xlabel("Época"); self.ax1.set_ylabel("Error (-1, 0, 1)")
-        errores_t = list(zip(*self.historial_errores_patron))
-        patrones = COMPUERTAS_LOGICAS[self.compuerta_var.get()]["X"]
-        for i, hist_patron in enumerate(errores_t): self.ax1.plot(hist_patron, label=f'Patrón {i+1}: {patrones[i]}')
-        self.ax1.legend()
-        pesos_t = list(zip(*self.historial_pesos))
-        self.linea_w0.set_data(eje_x_epocas, pesos_t[0])
-        self.linea_w1.set_data(eje_x_epocas, pesos_t[1])
-        self.linea_w2.set_data(eje_x_epocas, pesos_t[2])
+            self._volcar_cola(textos_log, instantaneas)
+            self.after(INTERVALO_COLA_MS, self.procesar_cola_gui)
+
+    def _volcar_cola(self, textos_log, instantaneas):
+        """Una sola inserción de texto y un solo redibujado por tick."""
+        if textos_log:
+            self.log_texto.insert(tk.END, "".join(textos_log)); self.log_texto.see(tk.END)
+        if instantaneas:
+            self.actualizar_en_tiempo_real(instantaneas)
+
+    def finalizar_entrenamiento(self, pesos_finales):
+        self.log_texto.insert(tk.END, f"\nEntrenamiento Finalizado.\nPesos: {[round(w, 4) for w in pesos_finales]}\n")
+        estadisticas = self.perceptron_actual.estadisticas_entrenamiento
+        self.log_texto.insert(tk.END, f"Épocas: {estadisticas['epocas']} | Convergió: {'Sí' if estadisticas['convergio'] else 'No'} | "
+                                      f"Errores: {estadisticas['errores_finales']} (mejores pesos de la época {estadisticas['mejor_epoca']})\n")
+        self.log_texto.see(tk.END)
+        self.perceptron_actual.guardar_pesos()
+        self.restaurar_controles()
+        if not self.entrenamiento_cancelado: messagebox.showinfo("Éxito", "Entrenamiento finalizado y pesos guardados.")
+
+    def restaurar_controles(self):
+        # Lo que el hilo aún haya escrito en la cola se muestra en el siguiente tick
+        sys.stdout = self.stdout_original
+        self.btn_iniciar.config(state="normal"); self.btn_cancelar.config(state="disabled")
+
+    def actualizar_en_tiempo_real(self, instantaneas):
+        """
+        Aplica de una vez todas las instantáneas recibidas en este tick y redibuja.
+        Las líneas se crean una sola vez y solo se les cambian los datos, decimados al
+        ancho del eje: el coste por tick no crece con el número de épocas.
+        """
+        for instantanea in instantaneas:
+            errores = np.asarray(instantanea["errores_patron"], dtype=np.float64)  # épocas x patrones
+            pesos = np.asarray(instantanea["pesos"], dtype=np.float64)             # épocas x 3
+            eje_x = np.arange(self.epocas_graficadas, self.epocas_graficadas + len(pesos))
+            for i, buffer in enumerate(self.buffers_errores_patron): buffer.agregar(eje_x, errores[:, i])
+            for i, buffer in enumerate(self.buffers_pesos): buffer.agregar(eje_x, pesos[:, i])
+            self.epocas_graficadas += len(pesos)
+
+        self.ax1.set_title(f"Error por Patrón (Época {instantaneas[-1]['epoca']})")
+        for linea, buffer in zip(self.lineas_error_patron, self.buffers_errores_patron): self._actualizar_linea(linea, buffer)
+        for linea, buffer in zip((self.linea_w0, self.linea_w1, self.linea_w2), self.buffers_pesos): self._actualizar_linea(linea, buffer)
+        self.ax1.set_xlim(0, max(self.epocas_graficadas - 1, 1))
         self.ax2.relim(); self.ax2.autoscale_view()
-        puntos_recta = self.perceptron_actual.obtener_puntos_recta()
+        puntos_recta = instantaneas[-1]["puntos_recta"]
         if puntos_recta: (x1, y1), (x2, y2) = puntos_recta; self.linea_separacion.set_data([x1, x2], [y1, y2])
-        self.canvas.draw(); self.update()
-        if epoca > 0 and epoca % 500 == 0:
-            if not messagebox.askyesno("Entrenamiento en Pausa", f"Se han completado {epoca} épocas.\n¿Desea continuar entrenando?"):
-                self.entrenamiento_cancelado = True
-        return not self.entrenamiento_cancelado
-        
+        self.canvas.draw_idle()
+
+    def _actualizar_linea(self, linea, buffer):
+        x, y = buffer.datos()
+        linea.set_data(*decimar_min_max(x, y, linea.axes.bbox.width))
+
+    # --- NUEVO: Líneas persistentes del error por patrón ---
+    def preparar_grafica_errores(self, compuerta):
+        """Crea una línea por patrón y los buffers (preasignados) de errores y pesos."""
+        patrones = COMPUERTAS_LOGICAS[compuerta]["X"]
+        self.lineas_error_patron = [self.ax1.plot([], [], label=f'Patrón {i+1}: {patron}')[0] for i, patron in enumerate(patrones)]
+        self.ax1.set_ylim(-1.2, 1.2); self.ax1.legend(loc='upper right')
+        self.buffers_errores_patron = [BufferCircular() for _ in patrones]
+        self.buffers_pesos = [BufferCircular() for _ in range(3)]
+        self.epocas_graficadas = 0
+
     def preparar_grafica_puntos(self, compuerta):
         datos = COMPUERTAS_LOGICAS[compuerta]; X, Y = datos["X"], datos["Y"]
         for i in range(len(X)):
@@ -3,6 +3,7 @@
 # Está diseñado para ser independiente de la interfaz gráfica.
 
 import random
+import numpy as np
 
 # Diccionario que almacena los conjuntos de datos para diferentes compuertas lógicas.
 # Cada entrada contiene los patrones de entrada (X) y las salidas esperadas (Y).
@@ -15,33 +16,79 @@ COMPUERTAS_LOGICAS = {
 }
 
 valor_virtual_sesgo = -1
+MAX_EPOCAS = 1000 # Tope de épocas por defecto (sin él, un problema no separable como XOR no termina)
 
 class Perceptron:
     """
-    Implementa un Perceptrón simple de una sola neurona.
+    Implementa un Perceptrón de una capa con una o varias neuronas de salida.
     
     Esta clase maneja la inicialización de los pesos, el proceso de predicción,
     el algoritmo de entrenamiento, y la gestión de los pesos (guardar/cargar).
+    Los pesos se guardan en una matriz de NumPy (entradas + 1) x salidas, donde
+    la fila 0 corresponde al sesgo; así todos los patrones y todas las salidas
+    se calculan con un solo producto matricial.
     """
-    def __init__(self, tasa_aprendizaje=0.1, pesos_iniciales=None, num_entradas=2):
+    def __init__(self, tasa_aprendizaje=0.1, pesos_iniciales=None, num_entradas=2, num_salidas=1):
         """
         Constructor de la clase Perceptron.
 
         Args:
             tasa_aprendizaje (float): Factor que determina la magnitud del ajuste de los pesos.
-            pesos_iniciales (list, optional): Una lista de pesos para iniciar la red. 
+            pesos_iniciales (list, optional): Una lista de pesos para iniciar la red (con una salida),
+                                              o una lista de filas [w_sesgo, w1, ...] x salidas.
                                               Si es None, se generan aleatoriamente.
             num_entradas (int): El número de entradas que tendrá la neurona (sin contar el sesgo).
+            num_salidas (int): El número de neuronas de salida (1 = perceptrón simple).
         """
         self.tasa_aprendizaje = tasa_aprendizaje
         self.valor_sesgo = valor_virtual_sesgo
-        # El número total de pesos es el número de entradas más uno para el sesgo (bias).
+        self.num_entradas = num_entradas
+        self.num_salidas = num_salidas
+        # El número total de pesos por salida es el número de entradas más uno para el sesgo (bias).
         num_pesos = num_entradas + 1
         # Si se proporcionan pesos iniciales, se usan; de lo contrario, se generan aleatoriamente.
-        if pesos_iniciales: self.pesos = list(pesos_iniciales) # Se crea una copia para evitar modificar la lista original.
-        else: self.pesos = [random.uniform(-1, 1) for _ in range(num_pesos)]
+        if pesos_iniciales is not None and len(pesos_iniciales) > 0: self.pesos = pesos_iniciales
+        else: self.matriz_pesos = np.array([[random.uniform(-1, 1) for _ in range(num_salidas)] for _ in range(num_pesos)])
         # Imprime en consola los pesos con los que se ha inicializado el perceptrón.
-        print(f"Perceptrón inicializado con pesos: {[round(p, 4) for p in self.pesos]}")
+        if self.matriz_pesos.size <= 12: print(f"Perceptrón inicializado con pesos: {self._pesos_redondeados()}")
+        else: print(f"Perceptrón inicializado con {self.num_entradas} entradas y {self.num_salidas} salidas.")
+
+    # --- NUEVO: 'pesos' es una vista de la matriz de pesos ---
+    @property
+    def pesos(self):
+        """Lista de pesos [w0, w1, ...] con una salida; lista de filas (entradas + 1) x salidas con varias."""
+        if self.num_salidas == 1: return self.matriz_pesos[:, 0].tolist()
+        return self.matriz_pesos.tolist()
+
+    @pesos.setter
+    def pesos(self, valores):
+        # Se crea una copia para evitar modificar la lista original.
+        matriz = np.array(valores, dtype=np.float64)
+        if matriz.ndim == 1: matriz = matriz.reshape(-1, 1)
+        self.matriz_pesos = matriz
+        self.num_entradas, self.num_salidas = matriz.shape[0] - 1, matriz.shape[1]
+
+    def _pesos_redondeados(self):
+        if self.num_salidas == 1: return [round(p, 4) for p in self.pesos]
+        return np.round(self.matriz_pesos, 4).tolist()
+
+    def _con_sesgo(self, X):
+        """Antepone la entrada virtual del sesgo a cada patrón de X (N x D) -> N x (D + 1)."""
+        X = np.asarray(X, dtype=np.float64).reshape(-1, self.num_entradas)
+        return np.hstack([np.full((len(X), 1), float(self.valor_sesgo)), X])
+
+    def predecir_lote(self, X):
+        """
+        Calcula la salida de la red para todos los patrones de X (N x D) a la vez.
+
+        Returns:
+            np.ndarray: Salidas binarias (0 o 1), de forma (N,) con una salida o (N x salidas).
+        """
+        # Suma ponderada de todos los patrones y todas las salidas: (N x D+1) @ (D+1 x S).
+        sumas_ponderadas = self._con_sesgo(X) @ self.matriz_pesos
+        # Función de activación de tipo escalón: si la suma es >= 0, la salida es 1; si no, es 0.
+        salidas = (sumas_ponderadas >= 0).astype(np.int64)
+        return salidas[:, 0] if self.num_salidas == 1 else salidas
 
     def predecir(self, entradas):
         """
@@ -51,28 +98,18 @@ class Perceptron:
             entradas (list): La lista de valores de entrada (ej. [0, 1]).
 
         Returns:
-            int: La salida binaria (0 o 1) calculada por el perceptrón.
+            int: La salida binaria (0 o 1) calculada por el perceptrón
+                 (una lista de 0/1 si hay varias salidas).
         """
-        # Se agrega la entrada constante para el sesgo (bias), que siempre es 1.
-        entradas_con_bias = [self.valor_sesgo] + entradas
-        # Se calcula la suma ponderada: cada entrada multiplicada por su peso correspondiente.
-        # Se inicializa una variable para guardar el resultado de la suma.
-        suma_ponderada = 0.0
-
-        # Se recorre cada peso y su entrada correspondiente usando un bucle.
-        for i in range(len(self.pesos)):
-            # Se multiplica el peso en la posición 'i' por la entrada en la misma posición.
-            # El resultado se suma al acumulador.
-            suma_ponderada += self.pesos[i] * entradas_con_bias[i]
-
-        # Se aplica la función de activación de tipo escalón: si la suma es >= 0, la salida es 1; si no, es 0.
-        return 1 if suma_ponderada >= 0 else 0
+        salida = self.predecir_lote([entradas])[0]
+        return int(salida) if self.num_salidas == 1 else salida.tolist()
 
     def obtener_puntos_recta(self, x_min=-0.5, x_max=1.5):
         """
         Calcula dos puntos (x, y) para poder dibujar la línea de decisión en un plano 2D.
         La ecuación de la frontera es: w0*1 + w1*x1 + w2*x2 = 0.
         Despejando x2 (el eje y), obtenemos: x2 = (-w1*x1 - w0) / w2.
+        Solo tiene sentido con 2 entradas; con varias salidas se usa la primera.
 
         Args:
             x_min (float): El valor mínimo del eje x para el primer punto.
@@ -82,7 +119,7 @@ class Perceptron:
             list or None: Una lista con dos tuplas [(x1, y1), (x2, y2)], o None si la línea es vertical.
         """
         # Se extraen los pesos para mayor claridad en la fórmula.
-        w0, w1, w2 = self.pesos
+        w0, w1, w2 = self.matriz_pesos[:, 0].tolist()
         # Se previene una división por cero si w2 es muy pequeño (línea casi vertical).
         if abs(w2) < 1e-6: return None
         # Se calcula el valor de 'y' (x2) para los dos puntos extremos de 'x' (x1).
@@ -91,7 +128,8 @@ class Perceptron:
         # Se devuelven los dos puntos que definen el segmento de la recta a dibujar.
         return [(x_min, y1), (x_max, y2)]
 
-    def entrenar(self, compuerta, callback=None):
+    def entrenar(self, compuerta=None, callback=None, X=None, Y=None, imprimir_cada=1,
+                 max_epocas=MAX_EPOCAS, pocket=True):
         """
         Ejecuta el algoritmo de entrenamiento del perceptrón.
 
@@ -99,89 +137,104 @@ class Perceptron:
             compuerta (str): El nombre de la compuerta lógica a aprender (ej. "OR").
             callback (function, optional): Una función que se llamará en cada época para
                                            actualizar la interfaz gráfica en tiempo real.
+            X, Y (array, optional): Datos propios en lugar de una compuerta: X (N x entradas)
+                                    e Y con las salidas 0/1, de forma (N,) o (N x salidas).
+            imprimir_cada (int): Cada cuántas épocas se muestra el progreso (0 = nunca).
+            max_epocas (int or None): Número máximo de épocas (None = hasta no tener errores).
+            pocket (bool): Algoritmo "pocket": se guardan los pesos con menos patrones mal
+                           clasificados vistos hasta el momento y, si el entrenamiento
+                           termina sin converger, la red se queda con esos pesos.
 
         Returns:
-            list: La lista de pesos finales después del entrenamiento.
+            list: La lista de pesos finales después del entrenamiento. Las estadísticas
+                  quedan en self.estadisticas_entrenamiento.
         """
         # Se obtienen los datos de entrenamiento (entradas X y salidas Y) del diccionario.
-        X_entrenamiento = COMPUERTAS_LOGICAS[compuerta]["X"]
-        Y_entrenamiento = COMPUERTAS_LOGICAS[compuerta]["Y"]
-        print(f"\n--- Iniciando entrenamiento para la compuerta {compuerta} ---")
+        if compuerta is not None:
+            X, Y = COMPUERTAS_LOGICAS[compuerta]["X"], COMPUERTAS_LOGICAS[compuerta]["Y"]
+            print(f"\n--- Iniciando entrenamiento para la compuerta {compuerta} ---")
+        elif X is None or Y is None:
+            raise ValueError("Indique una compuerta o los datos de entrenamiento X e Y.")
+        else:
+            print(f"\n--- Iniciando entrenamiento con {len(X)} patrones ---")
+        X_entrenamiento = self._con_sesgo(X)
+        Y_entrenamiento = np.asarray(Y, dtype=np.int64).reshape(len(X_entrenamiento), -1)
+        if Y_entrenamiento.shape[1] != self.num_salidas:
+            raise ValueError(f"Y tiene {Y_entrenamiento.shape[1]} salidas y la red {self.num_salidas}.")
+
         epoca = 0
-        # Bucle principal de entrenamiento, se ejecuta hasta que no haya errores o sea detenido.
+        # --- NUEVO: Estado del algoritmo pocket ---
+        mejores_pesos = self.matriz_pesos.copy()
+        mejores_errores = len(X_entrenamiento) + 1
+        mejor_epoca = 0
+        historial_errores = []
+        motivo_parada = "max_epocas"
+        # Bucle principal de entrenamiento, se ejecuta hasta que no haya errores, se alcance el tope o sea detenido.
         while True:
-            # Se calcula el error para cada patrón de entrada en la época actual.
-            errores_calculados = []
-
-            # Se usa un bucle 'for' para recorrer cada par de (entradas, salida_esperada). 'zip' une las dos listas para que podamos procesarlas juntas.
-            for entradas, y_esperada in zip(X_entrenamiento, Y_entrenamiento):
-                
-                # Para cada patrón, se calcula la predicción de la red.
-                prediccion = self.predecir(entradas)
-                
-                # Se calcula el error para ese patrón específico.
-                error = y_esperada - prediccion
-                
-                # Se añade el error calculado a la lista de errores.
-                errores_calculados.append(error)
-
-            # Se cuenta cuántos de esos errores son diferentes de cero.
-            errores_en_epoca = 0
-
-            # Se recorre cada 'error' guardado en la lista 'errores_calculados'.
-            for error in errores_calculados:
-                
-                # Se comprueba si el error es diferente de cero.
-                #    Si lo es, significa que hubo un fallo en la predicción.
-                if error != 0:
-                    
-                    # Si hubo un fallo, se incrementa el contador en uno.
-                    errores_en_epoca += 1
+            # Se calcula el error de todos los patrones y todas las salidas en la época actual (N x S).
+            predicciones = (X_entrenamiento @ self.matriz_pesos >= 0).astype(np.int64)
+            errores_calculados = Y_entrenamiento - predicciones
+
+            # Un patrón cuenta como fallo si alguna de sus salidas es incorrecta.
+            errores_en_epoca = int(np.count_nonzero(np.any(errores_calculados != 0, axis=1)))
+            historial_errores.append(errores_en_epoca)
+
+            # Pocket: si estos pesos clasifican mejor que los guardados, se guardan.
+            if errores_en_epoca < mejores_errores:
+                mejores_errores, mejor_epoca = errores_en_epoca, epoca + 1
+                mejores_pesos = self.matriz_pesos.copy()
             
             # Se muestra el progreso en la consola.
-            print(f"> Época {epoca + 1}: Errores = {errores_en_epoca}, Pesos = {[round(p, 4) for p in self.pesos]}")
+            if imprimir_cada and (epoca + 1) % imprimir_cada == 0:
+                detalle_pesos = f", Pesos = {self._pesos_redondeados()}" if self.matriz_pesos.size <= 12 else ""
+                print(f"> Época {epoca + 1}: Errores = {errores_en_epoca}{detalle_pesos}")
 
             # Si se proporcionó una función de callback (desde la GUI), se ejecuta.
             if callback:
                 # Se le pasa una COPIA del estado actual de la red. Debe devolver True para continuar.
-                continuar = callback(epoca=epoca + 1, pesos=self.pesos.copy(), errores_patron=errores_calculados)
+                errores_patron = (errores_calculados[:, 0] if self.num_salidas == 1 else errores_calculados).tolist()
+                continuar = callback(epoca=epoca + 1, pesos=self.pesos, errores_patron=errores_patron)
                 # Si el callback devuelve False (ej. se presionó "Cancelar"), se detiene el bucle.
                 if not continuar:
                     print("\nEntrenamiento detenido por la interfaz.")
+                    motivo_parada = "cancelado"
                     break
 
             # Condición de parada: si no hay errores, la red ha aprendido y el entrenamiento termina.
             if errores_en_epoca == 0:
                 print("\n¡Entrenamiento completado exitosamente!")
                 # Se llama al callback una última vez para dibujar el estado final y correcto.
-                if callback: callback(epoca=epoca + 1, pesos=self.pesos.copy(), errores_patron=errores_calculados)
+                if callback: callback(epoca=epoca + 1, pesos=self.pesos, errores_patron=errores_patron)
+                motivo_parada = "convergencia"
+                break
+
+            # Condición de parada: tope de épocas alcanzado sin converger.
+            if max_epocas is not None and epoca + 1 >= max_epocas:
+                print(f"\nSe alcanzó el máximo de {max_epocas} épocas sin clasificar todos los patrones.")
                 break
             
-            # Bucle para actualizar los pesos si hubo errores.
-            for i, error in enumerate(errores_calculados):
-                # La actualización solo ocurre si el error para este patrón específico no es cero.
-                if error != 0:
-                    entradas = X_entrenamiento[i]
-                    # Actualización del peso del sesgo (w0). La entrada virtual es 1.
-                    self.pesos[0] += self.tasa_aprendizaje * error * self.valor_sesgo
-                    # Actualización de los pesos de las entradas (w1, w2, ...).
-                    # Recorre las entradas del patrón actual (ej. [1, 1]) usando un índice numérico 'j'.
-                    for j in range(len(entradas)):
-                        
-                        # Obtiene el valor de la entrada actual (0 o 1) usando el índice 'j'.
-                        valor_de_entrada = entradas[j]
-                        
-                        # Selecciona el índice del peso a modificar. Se usa 'j + 1' porque el peso en la posición 0 (self.pesos[0]) está reservado para el sesgo (bias).
-                        # Para la primera entrada (j=0), se modifica el peso w1 (self.pesos[1]).
-                        # Para la segunda entrada (j=1), se modifica el peso w2 (self.pesos[2]).
-                        indice_del_peso = j + 1
-                        
-                        # Calcula el ajuste que se le hará al peso, según la regla de aprendizaje.
-                        ajuste = self.tasa_aprendizaje * error * valor_de_entrada
-                        
-                        # Aplica el ajuste (suma) al peso correspondiente.
-                        self.pesos[indice_del_peso] += ajuste
+            # --- MODIFICADO: Actualización de todos los pesos con un producto matricial ---
+            # Equivale a sumar, para cada patrón con error, tasa * error * entrada (incluida
+            # la entrada virtual del sesgo) sobre cada peso: X^T (D+1 x N) @ errores (N x S).
+            self.matriz_pesos += self.tasa_aprendizaje * (X_entrenamiento.T @ errores_calculados)
             epoca += 1
+
+        errores_ultima_epoca = historial_errores[-1]
+        if pocket and motivo_parada != "convergencia" and mejores_errores < errores_ultima_epoca:
+            self.matriz_pesos = mejores_pesos
+            print(f"Pocket: se conservan los pesos de la época {mejor_epoca} "
+                  f"({mejores_errores} errores en lugar de {errores_ultima_epoca}).")
+
+        # --- NUEVO: Estadísticas de convergencia ---
+        self.estadisticas_entrenamiento = {
+            "epocas": epoca + 1,
+            "convergio": motivo_parada == "convergencia",
+            "motivo_parada": motivo_parada,
+            "errores_finales": mejores_errores if pocket else errores_ultima_epoca,
+            "precision_final": 1 - (mejores_errores if pocket else errores_ultima_epoca) / len(X_entrenamiento),
+            "mejor_epoca": mejor_epoca,
+            "historial_errores": historial_errores
+        }
         # Se devuelven los pesos finales aprendidos.
         return self.pesos
 
@@ -191,6 +244,8 @@ class Perceptron:
 
         Args:
             ruta_archivo (str): El nombre del archivo donde se guardarán los pesos.
+                                Con varias salidas, cada línea es una fila de la
+                                matriz de pesos con los valores separados por comas.
         
         Returns:
             bool: True si se guardó con éxito, False en caso de error.
@@ -198,8 +253,8 @@ class Perceptron:
         try:
             # Abre el archivo en modo escritura ('w').
             with open(ruta_archivo, 'w') as f:
-                # Escribe cada peso en una nueva línea.
-                for peso in self.pesos: f.write(str(peso) + '\n')
+                # Escribe cada peso (o cada fila de pesos) en una nueva línea.
+                for fila in self.matriz_pesos: f.write(",".join(str(float(peso)) for peso in fila) + '\n')
             print(f"\nPesos guardados en '{ruta_archivo}'.")
             return True
         except IOError as e: print(f"Error al guardar: {e}"); return False
@@ -214,13 +269,16 @@ class Perceptron:
             ruta_archivo (str): El nombre del archivo desde donde se cargarán los pesos.
 
         Returns:
-            list or None: Una lista con los pesos cargados, o None si ocurre un error.
+            list or None: Una lista con los pesos cargados (una lista de filas si hay
+                          varias salidas), o None si ocurre un error.
         """
         try:
             # Abre el archivo en modo lectura ('r').
             with open(ruta_archivo, 'r') as f:
                 # Lee cada línea, la convierte a float y la guarda en una lista.
-                return [float(line.strip()) for line in f]
+                filas = [[float(valor) for valor in line.strip().split(",")] for line in f if line.strip()]
+            if filas and all(len(fila) == 1 for fila in filas): return [fila[0] for fila in filas]
+            return filas
         except Exception: 
             # Si el archivo no existe o hay un error, devuelve None.
             return None
\ No newline at end of file
@@ -2,17 +2,27 @@
 import numpy as np
 import json
 import copy
+from perfilado import reloj_de
 
 class MLP:
     def __init__(self, neuronas_entrada, neuronas_ocultas, neuronas_salida, 
-                 activacion_oculta='sigmoide', activacion_salida='sigmoide', semilla=0): # --- MODIFICADO ---
+                 activacion_oculta='sigmoide', activacion_salida='sigmoide', semilla=0,
+                 dtype=np.float32): # --- MODIFICADO ---
         """
         Inicializa la red neuronal.
         Permite seleccionar la función de activación para cada capa.
+        'dtype' define la precisión de pesos, buffers de momentum, datos y
+        predicciones: float32 (por defecto, entrenamiento) o float64 (referencia).
         """
         self.neuronas_entrada = neuronas_entrada
         self.neuronas_ocultas = neuronas_ocultas
         self.neuronas_salida = neuronas_salida
+
+        # --- NUEVO: Selección de píxeles de entrada (ver seleccion_pixeles.py) ---
+        # Si hay máscara, la red solo recibe los píxeles 'mascara_entrada' de un
+        # vector de 'neuronas_entrada_original' valores.
+        self.neuronas_entrada_original = neuronas_entrada
+        self.mascara_entrada = None
         
         # --- NUEVO: Almacenar las funciones de activación seleccionadas ---
         self.activacion_oculta_str = activacion_oculta
@@ -20,14 +30,21 @@ class MLP:
         self.func_oculta, self.func_oculta_derivada = self._obtener_funcion(activacion_oculta)
         self.func_salida, self.func_salida_derivada = self._obtener_funcion(activacion_salida)
 
+        # --- NUEVO: Precisión numérica de la red ---
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.float32, np.float64):
+            raise ValueError(f"dtype '{self.dtype}' no soportado. Use 'float32' o 'float64'.")
+        # Límite del clip de la sigmoide para que np.exp no desborde en float32
+        self._limite_exp = min(500.0, float(np.log(np.finfo(self.dtype).max)) - 1.0)
+
         if semilla != 0:
             np.random.seed(semilla)
 
-        # --- INICIALIZACIÓN VECTORIZADA (Sin cambios) ---
-        self.pesos_ih = np.random.uniform(-0.5, 0.5, (self.neuronas_ocultas, self.neuronas_entrada))
-        self.sesgos_h = np.random.uniform(-0.5, 0.5, (self.neuronas_ocultas, 1))
-        self.pesos_ho = np.random.uniform(-0.5, 0.5, (self.neuronas_salida, self.neuronas_ocultas))
-        self.sesgos_o = np.random.uniform(-0.5, 0.5, (self.neuronas_salida, 1))
+        # --- INICIALIZACIÓN VECTORIZADA (Misma secuencia aleatoria, convertida al dtype) ---
+        self.pesos_ih = np.random.uniform(-0.5, 0.5, (self.neuronas_ocultas, self.neuronas_entrada)).astype(self.dtype)
+        self.sesgos_h = np.random.uniform(-0.5, 0.5, (self.neuronas_ocultas, 1)).astype(self.dtype)
+        self.pesos_ho = np.random.uniform(-0.5, 0.5, (self.neuronas_salida, self.neuronas_ocultas)).astype(self.dtype)
+        self.sesgos_o = np.random.uniform(-0.5, 0.5, (self.neuronas_salida, 1)).astype(self.dtype)
         
         # Variables para Momentum
         self.cambio_anterior_pesos_ih = np.zeros_like(self.pesos_ih)
@@ -50,7 +67,7 @@ class MLP:
 
     # --- FUNCIONES DE ACTIVACIÓN VECTORIZADAS ---
     def _sigmoide(self, x):
-        return 1 / (1 + np.exp(-np.clip(x, -500, 500))) # Clip para evitar overflow
+        return 1 / (1 + np.exp(-np.clip(x, -self._limite_exp, self._limite_exp))) # Clip para evitar overflow
 
     def _sigmoide_derivada(self, y):
         return y * (1 - y)
@@ -62,7 +79,29 @@ class MLP:
 
     def _relu_derivada(self, y):
         """Derivada de ReLU. 'y' es la salida de ReLU."""
-        return (y > 0).astype(float)
+        return (y > 0).astype(y.dtype)
+
+    # --- NUEVO: Conversión única de los datos al dtype de la red ---
+    def _como_matriz(self, datos):
+        """
+        Convierte una lista de vectores (o un array) en una matriz (N x D) con el
+        dtype de la red. Si ya lo es, no se copia.
+        """
+        matriz = np.asarray(datos, dtype=self.dtype)
+        if matriz.ndim == 1:
+            matriz = matriz.reshape(len(datos), -1) if len(datos) else matriz.reshape(0, 0)
+        return matriz
+
+    # --- NUEVO: Aplicar la máscara de píxeles a los datos de entrada ---
+    def _preparar_entradas(self, X):
+        """
+        Convierte X al dtype de la red y, si hay máscara de entrada y X trae la
+        imagen completa, conserva solo los píxeles seleccionados.
+        """
+        X = self._como_matriz(X)
+        if self.mascara_entrada is not None and X.shape[1] == self.neuronas_entrada_original:
+            X = X[:, self.mascara_entrada]
+        return X
 
 
     # --- ALGORITMO DE PROPAGACIÓN HACIA ADELANTE (FEEDFORWARD) ---
@@ -85,14 +124,22 @@ class MLP:
         return salidas_ocultas, salidas_finales
 
     def predecir(self, entradas):
-        """Realiza una predicción para un solo vector de entrada (lista de Python)."""
-        entradas_vec = np.array(entradas).reshape(-1, 1)
+        """Realiza una predicción para un solo vector de entrada (lista de Python o array)."""
+        entradas_vec = self._preparar_entradas(np.asarray(entradas).reshape(1, -1)).reshape(-1, 1)
         _, salidas_finales = self._forward_pass(entradas_vec)
         return salidas_finales.flatten().tolist()
 
     # --- ENTRENAMIENTO Y MÉTRICAS ---
-    def entrenar_bloque(self, X_train, Y_train, X_val, Y_val, clases_info, tasa_aprendizaje, error_deseado, momentum, epoca_inicio, max_epocas_bloque, cancel_event,  progress_callback=None):
-        if not X_train: raise ValueError("El conjunto de entrenamiento 'X_train' no puede estar vacío.")
+    def entrenar_bloque(self, X_train, Y_train, X_val, Y_val, clases_info, tasa_aprendizaje, error_deseado, momentum, epoca_inicio, max_epocas_bloque, cancel_event,  progress_callback=None, canal_metricas=None, perfilador=None):
+        if len(X_train) == 0: raise ValueError("El conjunto de entrenamiento 'X_train' no puede estar vacío.")
+        # --- NUEVO: Medición opcional del tiempo por fase (ver perfilado.py); sin perfilador no se mide ---
+        reloj = reloj_de(perfilador)
+        t0 = reloj()
+
+        # --- NUEVO: Los datos se convierten una sola vez por bloque (no por patrón) ---
+        X_train, Y_train = self._preparar_entradas(X_train), self._como_matriz(Y_train)
+        X_val, Y_val = self._preparar_entradas(X_val), self._como_matriz(Y_val)
+        if perfilador is not None: perfilador.agregar("conversion_datos", reloj() - t0)
         
         epoca = epoca_inicio
         historial_mse_train_bloque, historial_mse_val_bloque = [], []
@@ -109,14 +156,18 @@ class MLP:
 
             if progress_callback and epoca % 5 == 0:
                 progress_callback(epoca)
+            if perfilador is not None: perfilador.iniciar_epoca(epoca)
+            t_forward = t_backward = t_actualizacion = 0.0
             
             # --- FASE DE ENTRENAMIENTO (POR PATRÓN) ---
             for entradas, y_esperada in zip(X_train, Y_train):
-                entradas_vec = np.array(entradas).reshape(-1, 1)
-                y_esperada_vec = np.array(y_esperada).reshape(-1, 1)
+                t0 = reloj()
+                entradas_vec = entradas.reshape(-1, 1)
+                y_esperada_vec = y_esperada.reshape(-1, 1)
 
                 # --- 1. FEEDFORWARD ---
                 salidas_ocultas, salidas_finales = self._forward_pass(entradas_vec)
+                t1 = reloj()
 
                 # --- 2. BACKPROPAGATION (CÁLCULO DEL ERROR) ---
                 
@@ -129,6 +180,7 @@ class MLP:
                 error_oculto = self.pesos_ho.T @ deltas_salida
                 # --- MODIFICADO: Usa la derivada de la función oculta ---
                 deltas_ocultos = error_oculto * self.func_oculta_derivada(salidas_ocultas)
+                t2 = reloj()
 
                 # --- 3. ACTUALIZACIÓN DE PESOS Y SESGOS (CON MOMENTUM) ---
                 # (Lógica sin cambios)
@@ -147,21 +199,37 @@ class MLP:
                 cambio_sesgos_h = (tasa_aprendizaje * deltas_ocultos) + (momentum * self.cambio_anterior_sesgos_h)
                 self.sesgos_h += cambio_sesgos_h
                 self.cambio_anterior_sesgos_h = cambio_sesgos_h
+                t_forward += t1 - t0; t_backward += t2 - t1; t_actualizacion += reloj() - t2
 
             # --- FASE DE EVALUACIÓN ---
+            t0 = reloj()
             mse_train, matriz_train = self._calcular_metricas(X_train, Y_train, clases_info)
+            t1 = reloj()
             mse_val, matriz_val = self._calcular_metricas(X_val, Y_val, clases_info)
+            t2 = reloj()
             
             # ... (Lógica de logs, early stopping, etc., sin cambios) ...
             historial_mse_train_bloque.append(mse_train)
             historial_mse_val_bloque.append(mse_val)
-            precision_val = np.trace(matriz_val) / len(X_val) if X_val else 0
+            precision_val = np.trace(matriz_val) / len(X_val) if len(X_val) else 0
             log_line = f"Época: {epoca:<5} | MSE (Ent): {mse_train:.6f} | MSE (Val): {mse_val:.6f}"
             if epoca % 25 == 0 or epoca == epoca_limite:
                 historial_matrices_bloque.append(matriz_val)
-                precision_train = np.trace(matriz_train) / len(X_train) if X_train else 0
+                precision_train = np.trace(matriz_train) / len(X_train) if len(X_train) else 0
                 log_line += f" | Precisión (Ent): {precision_train:.2%} | Precisión (Val): {precision_val:.2%}"
             log_bloque.append(log_line)
+            # --- NUEVO: Métricas de la época para las gráficas en vivo de la GUI ---
+            if canal_metricas is not None:
+                registro = {"epoca": epoca, "mse_train": float(mse_train), "mse_val": float(mse_val)}
+                if epoca % 25 == 0 or epoca == epoca_limite or mse_train <= error_deseado:
+                    registro["precision_val"] = float(precision_val)
+                    registro["matriz_val"] = matriz_val
+                canal_metricas.publicar(registro)
+            if perfilador is not None:
+                for fase, segundos in (("forward", t_forward), ("backward", t_backward), ("actualizacion", t_actualizacion),
+                                       ("metricas_train", t1 - t0), ("metricas_val", t2 - t1), ("registro", reloj() - t2)):
+                    perfilador.agregar(fase, segundos)
+                perfilador.terminar_epoca()
             if precision_val > self.best_val_accuracy:
                 self.best_val_accuracy = precision_val
                 self.best_weights = {
@@ -191,25 +259,25 @@ class MLP:
         return epoca, historial_mse_train_bloque, historial_mse_val_bloque, historial_matrices_bloque, log_bloque, entrenamiento_completo 
     
     def _calcular_metricas(self, X_data, Y_data, clases_info):
-        # (Sin cambios)
+        # --- MODIFICADO: Una sola pasada hacia adelante para todo el conjunto ---
         target_vectors = list(clases_info.values())
         n_clases = len(target_vectors)
         matriz = np.zeros((n_clases, n_clases))
-        error_total = 0.0
+        if len(X_data) == 0: return 0, matriz
 
-        for x, y_real_vec in zip(X_data, Y_data):
-            prediccion_lista = self.predecir(x)
-            prediccion_vec = np.array(prediccion_lista)
-            
-            error_total += np.sum((np.array(y_real_vec) - prediccion_vec) ** 2)
-            
-            distancias_real = [np.linalg.norm(np.array(y_real_vec) - np.array(tv)) for tv in target_vectors]
-            idx_real = np.argmin(distancias_real)
-            distancias_pred = [np.linalg.norm(prediccion_vec - np.array(tv)) for tv in target_vectors]
-            idx_pred = np.argmin(distancias_pred)
-            matriz[idx_real, idx_pred] += 1
-        
-        mse = error_total / len(X_data) if X_data else 0
+        X_data, Y_data = self._preparar_entradas(X_data), self._como_matriz(Y_data)
+        _, salidas_finales = self._forward_pass(X_data.T)
+        predicciones = salidas_finales.T
+
+        # El error se acumula en float64 aunque la red sea float32
+        error_total = float(np.sum((Y_data - predicciones) ** 2, dtype=np.float64))
+
+        targets = np.asarray(target_vectors, dtype=self.dtype)
+        idx_real = np.argmin(np.linalg.norm(Y_data[:, None, :] - targets[None, :, :], axis=2), axis=1)
+        idx_pred = np.argmin(np.linalg.norm(predicciones[:, None, :] - targets[None, :, :], axis=2), axis=1)
+        np.add.at(matriz, (idx_real, idx_pred), 1)
+
+        mse = error_total / len(X_data)
         return mse, matriz
 
     def guardar_modelo(self, ruta_archivo="modelo_mlp.json", clases_info=None):
@@ -233,7 +301,12 @@ class MLP:
                 "neuronas_salida": self.neuronas_salida,
                 # --- NUEVO: Guardar las funciones de activación usadas ---
                 "activacion_oculta": self.activacion_oculta_str,
-                "activacion_salida": self.activacion_salida_str
+                "activacion_salida": self.activacion_salida_str,
+                # --- NUEVO: Precisión numérica usada en el entrenamiento ---
+                "dtype": self.dtype.name,
+                # --- NUEVO: Píxeles de entrada seleccionados (None = todos) ---
+                "neuronas_entrada_original": self.neuronas_entrada_original,
+                "mascara_entrada": None if self.mascara_entrada is None else self.mascara_entrada.tolist()
             },
             "clases_info": clases_info, 
             "pesos": {
@@ -248,6 +321,21 @@ class MLP:
             json.dump(modelo, f, indent=4)
         print(f"Modelo guardado en {ruta_archivo} (Precisión máx. validación: {self.best_val_accuracy:.2%})")
 
+    # --- NUEVO: Construir una red a partir de pesos ya calculados (poda, selección de entradas) ---
+    @staticmethod
+    def desde_pesos(pesos_ih, sesgos_h, pesos_ho, sesgos_o, activacion_oculta='sigmoide',
+                    activacion_salida='sigmoide', dtype=np.float32):
+        """Crea un MLP con los pesos dados; el tamaño de cada capa se deduce de sus formas."""
+        pesos_ih = np.asarray(pesos_ih)
+        pesos_ho = np.asarray(pesos_ho)
+        mlp = MLP(pesos_ih.shape[1], pesos_ih.shape[0], pesos_ho.shape[0],
+                  activacion_oculta=activacion_oculta, activacion_salida=activacion_salida, dtype=dtype)
+        mlp.pesos_ih = np.array(pesos_ih, dtype=mlp.dtype)
+        mlp.sesgos_h = np.array(sesgos_h, dtype=mlp.dtype).reshape(-1, 1)
+        mlp.pesos_ho = np.array(pesos_ho, dtype=mlp.dtype)
+        mlp.sesgos_o = np.array(sesgos_o, dtype=mlp.dtype).reshape(-1, 1)
+        return mlp
+
     @staticmethod
     def cargar_modelo(ruta_archivo="modelo_mlp.json"):
         """Carga un modelo y la información de sus clases desde un archivo JSON."""
@@ -260,18 +348,25 @@ class MLP:
             # --- MODIFICADO: Carga las funciones de activación guardadas ---
             act_oculta = arq.get('activacion_oculta', 'sigmoide') # Default a sigmoide si no existe
             act_salida = arq.get('activacion_salida', 'sigmoide')
+            dtype = arq.get('dtype', 'float64') # Modelos antiguos se guardaron en float64
             
             mlp = MLP(arq['neuronas_entrada'], 
                       arq['neuronas_ocultas'], 
                       arq['neuronas_salida'],
                       activacion_oculta=act_oculta,
-                      activacion_salida=act_salida)
+                      activacion_salida=act_salida,
+                      dtype=dtype)
             
             pesos = modelo_data['pesos']
-            mlp.pesos_ih = np.array(pesos['pesos_ih'])
-            mlp.sesgos_h = np.array(pesos['sesgos_h'])
-            mlp.pesos_ho = np.array(pesos['pesos_ho'])
-            mlp.sesgos_o = np.array(pesos['sesgos_o'])
+            mlp.pesos_ih = np.array(pesos['pesos_ih'], dtype=mlp.dtype)
+            mlp.sesgos_h = np.array(pesos['sesgos_h'], dtype=mlp.dtype)
+            mlp.pesos_ho = np.array(pesos['pesos_ho'], dtype=mlp.dtype)
+            mlp.sesgos_o = np.array(pesos['sesgos_o'], dtype=mlp.dtype)
+
+            # --- NUEVO: Restaurar la máscara de entrada, si el modelo tiene una ---
+            if arq.get('mascara_entrada') is not None:
+                mlp.mascara_entrada = np.array(arq['mascara_entrada'], dtype=np.intp)
+                mlp.neuronas_entrada_original = arq['neuronas_entrada_original']
 
             clases_info = modelo_data.get('clases_info', {}) 
             print(f"Modelo cargado desde {ruta_archivo} (Oculta: {act_oculta}, Salida: {act_salida})")
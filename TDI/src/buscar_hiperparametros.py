@@ -1,15 +1,24 @@
 import os
+# Un hilo BLAS por proceso: el paralelismo lo da el pool, no NumPy
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+os.environ.setdefault("MKL_NUM_THREADS", "1")
+
+import json
+import time
+import hashlib
+import math
+import random
 import logging
-import warnings
-from sklearn.neural_network import MLPClassifier
-from sklearn.model_selection import GridSearchCV, train_test_split
-from sklearn.exceptions import ConvergenceWarning
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import numpy as np
 
 try:
-    from procesador_datos import cargar_y_convertir_dataset
+    from backpropagation import MLP
+    from procesador_datos import cargar_imagenes_dataset, cargar_targets, codificar_etiquetas
 except ImportError:
-    print("Error: No se pudo encontrar 'procesador_datos.py'.")
+    print("Error: No se pudo encontrar 'backpropagation.py' o 'procesador_datos.py'.")
     print("Asegúrate de que este script esté en la misma carpeta que tus archivos .py")
     exit()
 
@@ -26,140 +35,326 @@ DATASETS_A_PROBAR = [
 TARGETS_A_PROBAR = [
     "./binario.txt",
     "./onehot.txt", # Cambié el nombre para que coincida con tu log
-    # "./targets_onehot_std.txt" # Asumo que el otro se llama onehot.txt
+    "./onehotstd.txt"
 ]
 
-PARAM_GRID = {
-    'hidden_layer_sizes': [(15,), (25,), (50,), (20, 10)],
-    'activation': ['logistic', 'relu'], 
-    'solver': ['sgd', 'adam'],
-    'alpha': [0.0001, 0.001], 
-    'learning_rate_init': [0.1, 0.01, 0.001],
-    'momentum': [0.9, 0.95]
+# --- MODIFICADO: Se busca sobre nuestro MLP (backpropagation.py), no sobre MLPClassifier ---
+ESPACIO_BUSQUEDA = {
+    'neuronas_ocultas': [15, 25, 50],
+    'activacion_oculta': ['sigmoide', 'relu'],
+    'activacion_salida': ['sigmoide'],
+    'tasa_aprendizaje': [0.1, 0.01, 0.001],
+    'momentum': [0.9, 0.95],
+    'semilla': [1, 2]  # 0 = sin semilla; aquí se fija para que cada prueba sea reproducible
 }
+MODO_BUSQUEDA = "grid"         # 'grid' (producto cartesiano) o 'aleatoria'
+N_MUESTRAS_ALEATORIAS = 30     # Solo para MODO_BUSQUEDA = 'aleatoria'
+SEMILLA_BUSQUEDA = 42
+PORCENTAJE_ENTRENAMIENTO = 0.8
+SEMILLA_DIVISION = 42
+MAX_EPOCAS = 300
+# --- NUEVO: Reducción sucesiva a la mitad (successive halving) ---
+ESTRATEGIA = "halving"         # 'halving' o 'completa' (todas las configuraciones hasta MAX_EPOCAS)
+EPOCAS_INICIALES = 10          # Presupuesto de la primera ronda
+FACTOR_REDUCCION = 3           # Cada ronda conserva 1/FACTOR de las configuraciones y da FACTOR veces más épocas
+ERROR_DESEADO = 0.001
+N_PROCESOS = os.cpu_count() or 1
+DIR_CACHE = "./cache_busqueda"  # Copia .npy del dataset que los procesos abren como memmap
+RUTA_RESULTADOS = "./resultados_busqueda.jsonl"  # Registro de todas las pruebas (se reanuda desde aquí)
+UMBRAL_PROMETEDOR = 0.70
+# ---------------------
+
+def generar_configuraciones(espacio=ESPACIO_BUSQUEDA, modo=MODO_BUSQUEDA,
+                            n_muestras=N_MUESTRAS_ALEATORIAS, semilla=SEMILLA_BUSQUEDA):
+    """Lista de configuraciones (diccionarios) del espacio de búsqueda."""
+    claves = list(espacio.keys())
+    todas = [dict(zip(claves, valores)) for valores in itertools.product(*(espacio[k] for k in claves))]
+    if modo == "grid":
+        return todas
+    if modo == "aleatoria":
+        return random.Random(semilla).sample(todas, min(n_muestras, len(todas)))
+    raise ValueError(f"Modo de búsqueda '{modo}' no reconocido. Use 'grid' o 'aleatoria'.")
+
+def preparar_dataset_compartido(dataset_path, targets_por_ruta, dir_cache=DIR_CACHE):
+    """
+    Decodifica las imágenes del dataset UNA sola vez (para todos los archivos de
+    targets) y las guarda como .npy. Para cada archivo de targets solo se guardan
+    los vectores objetivo, construidos desde las etiquetas de clase.
+    Los procesos del pool abren los .npy con mmap_mode='r', así todos comparten
+    las mismas páginas en memoria en lugar de recibir una copia cada uno.
+    Devuelve ({ruta_targets: rutas}, n_in) o None si no hay datos.
+    """
+    todas_las_clases = set().union(*(targets.keys() for targets in targets_por_ruta.values()))
+    X_train, clases_train, X_val, clases_val, n_in, _, _ = cargar_imagenes_dataset(
+        dataset_path, todas_las_clases, PORCENTAJE_ENTRENAMIENTO, semilla=SEMILLA_DIVISION, dtype=np.float32
+    )
+    if len(X_train) == 0 or len(X_val) == 0:
+        return None
+
+    os.makedirs(dir_cache, exist_ok=True)
+    prefijo = os.path.join(dir_cache, os.path.basename(os.path.normpath(dataset_path)))
+    rutas_x = {"X_train": f"{prefijo}__X_train.npy", "X_val": f"{prefijo}__X_val.npy"}
+    np.save(rutas_x["X_train"], X_train)
+    np.save(rutas_x["X_val"], X_val)
+
+    rutas_por_targets = {}
+    for target_path, targets in targets_por_ruta.items():
+        nombre_targets = os.path.splitext(os.path.basename(target_path))[0]
+        rutas = dict(rutas_x)
+        for conjunto, clases_patrones in (("train", clases_train), ("val", clases_val)):
+            # Si el archivo de targets no cubre todas las clases, solo se usan las filas de las suyas
+            filas = np.array([i for i, c in enumerate(clases_patrones) if c in targets], dtype=np.intp)
+            if len(filas) < len(clases_patrones):
+                rutas[f"filas_{conjunto}"] = f"{prefijo}__{nombre_targets}__filas_{conjunto}.npy"
+                np.save(rutas[f"filas_{conjunto}"], filas)
+            rutas[f"Y_{conjunto}"] = f"{prefijo}__{nombre_targets}__Y_{conjunto}.npy"
+            np.save(rutas[f"Y_{conjunto}"], codificar_etiquetas([clases_patrones[i] for i in filas], targets))
+        rutas_por_targets[target_path] = rutas
+    return rutas_por_targets, n_in
+
+# --- Lado del proceso trabajador ---
+_DATASETS_ABIERTOS = {}
+
+def _abrir_dataset(rutas):
+    """
+    Abre (una vez por proceso) las matrices .npy como memmap de solo lectura.
+    Las X son las mismas para todos los archivos de targets; solo cambian las Y.
+    """
+    clave = (rutas["X_train"], rutas["Y_train"])
+    if clave not in _DATASETS_ABIERTOS:
+        datos = {nombre: np.load(rutas[nombre], mmap_mode='r') for nombre in ("X_train", "Y_train", "X_val", "Y_val")}
+        for conjunto in ("train", "val"):
+            if f"filas_{conjunto}" in rutas:
+                datos[f"X_{conjunto}"] = datos[f"X_{conjunto}"][np.load(rutas[f"filas_{conjunto}"])]
+        _DATASETS_ABIERTOS[clave] = datos
+    return _DATASETS_ABIERTOS[clave]
+
+def entrenar_configuracion(config, rutas, clases_info, max_epocas=MAX_EPOCAS, mlp=None, epoca_inicio=0,
+                           devolver_modelo=False):
+    """
+    Entrena un MLP con 'config' y devuelve sus métricas (se ejecuta en un proceso del pool).
+    Si se pasa 'mlp' (ya entrenado 'epoca_inicio' épocas) se continúa desde ahí:
+    pesos, momentum y estado del early stopping se conservan.
+    """
+    datos = _abrir_dataset(rutas)
+    X_train, Y_train, X_val, Y_val = datos["X_train"], datos["Y_train"], datos["X_val"], datos["Y_val"]
+
+    inicio = time.perf_counter()
+    if mlp is None:
+        mlp = MLP(X_train.shape[1], config['neuronas_ocultas'], Y_train.shape[1],
+                  activacion_oculta=config['activacion_oculta'], activacion_salida=config['activacion_salida'],
+                  semilla=config['semilla'], dtype=np.float32)
+    epoca, h_mse_train, h_mse_val, _, _, completo = mlp.entrenar_bloque(
+        X_train, Y_train, X_val, Y_val, clases_info, config['tasa_aprendizaje'], ERROR_DESEADO,
+        config['momentum'], epoca_inicio=epoca_inicio, max_epocas_bloque=max_epocas, cancel_event=lambda: False
+    )
+    _, matriz_val = mlp._calcular_metricas(X_val, Y_val, clases_info)
+    resultado = {
+        "config": config,
+        "epocas": epoca,
+        "completo": completo,
+        "mse_train": float(h_mse_train[-1]) if h_mse_train else None,
+        "mse_val": float(h_mse_val[-1]) if h_mse_val else None,
+        "precision_val": float(np.trace(matriz_val) / len(X_val)),
+        "mejor_precision_val": float(mlp.best_val_accuracy),
+        "segundos": time.perf_counter() - inicio
+    }
+    if devolver_modelo:
+        resultado["modelo"] = mlp
+    return resultado
+
+# --- NUEVO: Registro estructurado y reanudable de pruebas ---
+def id_prueba(config, info_par, presupuesto_epocas):
+    """
+    Identificador estable de una prueba: hash de todo lo que determina su resultado
+    (configuración, dataset, targets, épocas y parámetros de la división/entrenamiento).
+    El entrenamiento es determinista, así que la misma prueba da el mismo resultado
+    con cualquier estrategia (una ronda de 'halving' con MAX_EPOCAS = una prueba 'completa').
+    """
+    clave = {
+        "config": config, "dataset": info_par["dataset"], "targets": info_par["targets"],
+        "presupuesto_epocas": presupuesto_epocas, "error_deseado": ERROR_DESEADO,
+        "porcentaje_entrenamiento": PORCENTAJE_ENTRENAMIENTO, "semilla_division": SEMILLA_DIVISION
+    }
+    return hashlib.sha1(json.dumps(clave, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+def cargar_registro(ruta=RUTA_RESULTADOS):
+    """
+    Lee el registro JSONL y devuelve {id: resultado}. Las líneas sin 'id' (formato
+    anterior) o incompletas (búsqueda interrumpida a mitad de escritura) se ignoran.
+    """
+    registro = {}
+    if not os.path.exists(ruta):
+        return registro
+    with open(ruta, "r") as f:
+        for linea in f:
+            try:
+                resultado = json.loads(linea)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(resultado, dict) and "id" in resultado:
+                registro[resultado["id"]] = resultado
+    return registro
+
+def registrar_resultado(resultado, ruta=RUTA_RESULTADOS):
+    """Añade un resultado como una línea JSON (el archivo solo crece, nunca se reescribe)."""
+    with open(ruta, "a") as f:
+        f.write(json.dumps(resultado) + "\n")
+        f.flush()
+
+def _ejecutar_ronda(pool, tareas, rutas, clases_info, info_par, registro, etiqueta="", devolver_modelo=False):
+    """
+    Lanza las tareas (id, config, max_epocas, mlp, epoca_inicio) en el pool, registra
+    cada resultado y los devuelve en el mismo orden que 'tareas' (None si falló).
+    Las tareas cuyo id ya está en 'registro' no se re-entrenan: se devuelve el
+    resultado guardado (sin modelo).
+    """
+    resultados = [None] * len(tareas)
+    futuros = {}
+    for i, (id_tarea, config, max_epocas, mlp, epoca_inicio) in enumerate(tareas):
+        if id_tarea in registro:
+            resultados[i] = dict(registro[id_tarea])
+            continue
+        futuros[pool.submit(entrenar_configuracion, config, rutas, clases_info, max_epocas, mlp, epoca_inicio,
+                            devolver_modelo)] = i
+    if len(futuros) < len(tareas):
+        logging.info(f"{etiqueta}{len(tareas) - len(futuros)} pruebas ya estaban en {RUTA_RESULTADOS}; se omiten.")
+
+    for n, futuro in enumerate(as_completed(futuros), 1):
+        i = futuros[futuro]
+        try:
+            resultado = futuro.result()
+        except Exception as e:
+            logging.error(f"Una prueba falló: {e}")
+            continue
+        resultado.update(info_par)
+        resultado.update({"id": tareas[i][0], "presupuesto_epocas": tareas[i][2] + tareas[i][4],
+                          "fecha": time.strftime("%Y-%m-%dT%H:%M:%S")})
+        guardado = {k: v for k, v in resultado.items() if k != "modelo"}
+        registrar_resultado(guardado, RUTA_RESULTADOS)
+        registro[guardado["id"]] = guardado
+        logging.info(f"{etiqueta}[{n}/{len(futuros)}] Precisión (Val): {resultado['mejor_precision_val']:.2%} "
+                     f"| Épocas: {resultado['epocas']} ({resultado['segundos']:.1f}s) {resultado['config']}")
+        resultados[i] = resultado
+    return resultados
+
+def _ordenar_resultados(resultados):
+    """Mejor primero: mayor precisión de validación y, a igualdad, menor MSE de validación."""
+    return sorted(resultados, key=lambda r: (-r['mejor_precision_val'], r['mse_val'] if r['mse_val'] is not None else float('inf')))
 
-MEJOR_ACCURACY_GLOBAL = 0.0
-MEJOR_CONFIG_GLOBAL = {}
+def busqueda_completa(pool, configuraciones, rutas, clases_info, info_par, registro):
+    """Todas las configuraciones hasta MAX_EPOCAS."""
+    tareas = [(id_prueba(config, info_par, MAX_EPOCAS), config, MAX_EPOCAS, None, 0) for config in configuraciones]
+    return [r for r in _ejecutar_ronda(pool, tareas, rutas, clases_info, info_par, registro) if r is not None]
+
+def busqueda_por_mitades(pool, configuraciones, rutas, clases_info, info_par, registro):
+    """
+    Successive halving: todas las configuraciones reciben EPOCAS_INICIALES; se
+    conserva el mejor 1/FACTOR_REDUCCION y su presupuesto se multiplica por
+    FACTOR_REDUCCION hasta llegar a MAX_EPOCAS. Los modelos supervivientes se
+    continúan desde donde quedaron (no se re-entrenan desde cero).
+    Al reanudar, las rondas ya registradas se leen del registro; como esos
+    modelos no se guardan, sus supervivientes se entrenan desde cero hasta el
+    nuevo presupuesto (mismo resultado, el entrenamiento es determinista).
+    """
+    vivos = [{"config": config, "modelo": None, "epocas_modelo": 0, "completo": False} for config in configuraciones]
+    presupuesto = min(EPOCAS_INICIALES, MAX_EPOCAS)
+    ronda = 0
+    while True:
+        ronda += 1
+        # Los que ya alcanzaron el MSE deseado no necesitan más épocas
+        pendientes = [v for v in vivos if not v["completo"]]
+        logging.info(f"Ronda {ronda}: {len(vivos)} configuraciones, {presupuesto} épocas ({len(pendientes)} por entrenar).")
+        tareas = [(id_prueba(v["config"], info_par, presupuesto), v["config"], presupuesto - v["epocas_modelo"],
+                   v["modelo"], v["epocas_modelo"]) for v in pendientes]
+        info_ronda = dict(info_par, ronda=ronda)
+        resultados = _ejecutar_ronda(pool, tareas, rutas, clases_info, info_ronda, registro, f"R{ronda} ", True)
+        for v, resultado in zip(pendientes, resultados):
+            if resultado is None:
+                v["fallo"] = True
+                continue
+            v.update(resultado)
+            v["modelo"] = resultado.get("modelo")
+            v["epocas_modelo"] = resultado["epocas"] if v["modelo"] is not None else 0
+        vivos = _ordenar_resultados([v for v in vivos if not v.get("fallo") and "mejor_precision_val" in v])
+
+        if presupuesto >= MAX_EPOCAS or len(vivos) <= 1:
+            return vivos
+        vivos = vivos[:max(1, math.ceil(len(vivos) / FACTOR_REDUCCION))]
+        presupuesto = min(presupuesto * FACTOR_REDUCCION, MAX_EPOCAS)
 
 def buscar_hiperparametros():
-    global MEJOR_ACCURACY_GLOBAL, MEJOR_CONFIG_GLOBAL
-    
-    warnings.filterwarnings("ignore", category=ConvergenceWarning)
-    
-    logging.info("Iniciando Fase 2: Búsqueda de Hiperparámetros...")
-    
+    logging.info("Iniciando Fase 2: Búsqueda de Hiperparámetros (MLP propio)...")
+    configuraciones = generar_configuraciones()
+    logging.info(f"{len(configuraciones)} configuraciones por par dataset/targets ({MODO_BUSQUEDA}, {ESTRATEGIA}), {N_PROCESOS} procesos.")
+
+    mejor_global = None
+    # --- NUEVO: Las pruebas ya registradas (de una ejecución anterior) no se repiten ---
+    registro = cargar_registro(RUTA_RESULTADOS)
+    if registro:
+        logging.info(f"{len(registro)} pruebas registradas en {RUTA_RESULTADOS}; la búsqueda se reanuda.")
+    # --- MODIFICADO: Los archivos de targets se leen primero; cada dataset se carga una sola vez ---
+    targets_por_ruta = {}
     for target_path in TARGETS_A_PROBAR:
         if not os.path.exists(target_path):
             logging.warning(f"Omitiendo: No se encontró el archivo de targets: {target_path}")
             continue
-            
-        logging.info(f"\n--- Probando con Targets: {target_path} ---")
-        
-        for dataset_path in DATASETS_A_PROBAR:
-            if not os.path.isdir(dataset_path):
-                logging.warning(f"Omitiendo: No se encontró la carpeta de dataset: {dataset_path}")
-                continue
-            
-            logging.info(f"  --- Probando con Dataset: {dataset_path} ---")
-            
-            try:
-                X, Y, _, _, n_in, n_out, _, _ = cargar_y_convertir_dataset(
-                    dataset_path, target_path, porcentaje_entrenamiento=1.0 
-                )
-                if not X:
-                    logging.error(f"No se cargaron datos para {dataset_path}")
-                    continue
-                
-                X = np.array(X)
-                Y = np.array(Y)
-                
-                if Y.ndim > 1:
-                    y_etiquetas = np.argmax(Y, axis=1)
+        targets_por_ruta[target_path], _ = cargar_targets(target_path)
+    if not targets_por_ruta:
+        logging.error("No se encontró ningún archivo de targets.")
+        return
+
+    for dataset_path in DATASETS_A_PROBAR:
+        if not os.path.isdir(dataset_path):
+            logging.warning(f"Omitiendo: No se encontró la carpeta de dataset: {dataset_path}")
+            continue
+
+        logging.info(f"\n--- Probando con Dataset: {dataset_path} ---")
+        try:
+            preparado = preparar_dataset_compartido(dataset_path, targets_por_ruta, DIR_CACHE)
+        except Exception as e:
+            logging.error(f"Error al cargar {dataset_path}: {e}", exc_info=True)
+            continue
+        if preparado is None:
+            logging.error(f"No se cargaron datos suficientes para {dataset_path}")
+            continue
+        rutas_por_targets, n_in = preparado
+        logging.info(f"Datos compartidos en {DIR_CACHE} ({len(rutas_por_targets)} codificaciones de targets). N_in: {n_in}")
+
+        with ProcessPoolExecutor(max_workers=N_PROCESOS) as pool:
+            for target_path, rutas in rutas_por_targets.items():
+                clases_info = targets_por_ruta[target_path]
+                logging.info(f"  --- Probando con Targets: {target_path} ---")
+
+                info_par = {"dataset": dataset_path, "targets": target_path}
+                if ESTRATEGIA == "halving":
+                    resultados = busqueda_por_mitades(pool, configuraciones, rutas, clases_info, info_par, registro)
                 else:
-                    y_etiquetas = Y
-                
-                if len(y_etiquetas) == 0:
-                    logging.warning("y_etiquetas está vacío. Omitiendo.")
-                    continue
-                    
-                counts = np.bincount(y_etiquetas)
-                min_class_count = np.min(counts[counts > 0])
-                
-                cv_folds = min(3, min_class_count)
-                
-                if cv_folds < 2:
-                    logging.warning(f"Clase más pequeña solo tiene {min_class_count} muestra. No se puede hacer validación cruzada. Omitiendo.")
-                    continue
-                
-                logging.info(f"Clase más pequeña tiene {min_class_count} muestras. Usando cv={cv_folds}")
-                
-                X_train, X_test, y_train, y_test = train_test_split(X, y_etiquetas, test_size=0.20, random_state=42, stratify=y_etiquetas)
-                
-                logging.info(f"Datos cargados: {X_train.shape[0]} ent, {X_test.shape[0]} val. N_in: {n_in}, N_out: {n_out}")
-
-            except Exception as e:
-                logging.error(f"Error al cargar {dataset_path} con {target_path}: {e}", exc_info=True)
-                continue
+                    resultados = busqueda_completa(pool, configuraciones, rutas, clases_info, info_par, registro)
 
-            mlp = MLPClassifier(
-                max_iter=2000,          
-                early_stopping=True,    
-                n_iter_no_change=50,    
-                random_state=1
-            )
-            
-            grid_search = GridSearchCV(mlp, PARAM_GRID, n_jobs=-1, cv=cv_folds, scoring='accuracy')
-            
-            # --- INICIO DE CORRECCIÓN ---
-            # Calcular el número total de combinaciones dinámicamente
-            total_combinaciones = 1
-            for k in PARAM_GRID:
-                total_combinaciones *= len(PARAM_GRID[k])
-            
-            # Usar la variable 'total_combinaciones' en el log
-            logging.info(f"Iniciando GridSearchCV... (Probando {total_combinaciones} combinaciones en {cv_folds} pliegues)")
-            # --- FIN DE CORRECCIÓN ---
-            
-            grid_search.fit(X_train, y_train)
-            
-            best_accuracy = grid_search.best_score_
-            best_params = grid_search.best_params_
-            
-            logging.info(f"Búsqueda completada para este par.")
-            logging.info(f"Mejor Accuracy (Validación Cruzada): {best_accuracy:.2%}")
-            logging.info(f"Mejores Parámetros: {best_params}")
-
-            if best_accuracy >= 0.70:
-                logging.info("¡RESULTADO PROMETEDOR! Guardando en 'mejores_resultados.txt'")
-                resultado_info = {
-                    "dataset": dataset_path,
-                    "targets": target_path,
-                    "accuracy": best_accuracy,
-                    "hiperparametros": best_params
-                }
-                with open("mejores_resultados.txt", "a") as f:
-                    f.write(str(resultado_info) + "\n")
-            
-            if best_accuracy > MEJOR_ACCURACY_GLOBAL:
-                MEJOR_ACCURACY_GLOBAL = best_accuracy
-                MEJOR_CONFIG_GLOBAL = {
-                    "dataset": dataset_path,
-                    "targets": target_path,
-                    "accuracy": best_accuracy,
-                    "hiperparametros": best_params
-                }
+                if not resultados:
+                    continue
+                mejor_par = _ordenar_resultados(resultados)[0]
+                logging.info(f"Búsqueda completada para este par.")
+                logging.info(f"Mejor Precisión (Val): {mejor_par['mejor_precision_val']:.2%}")
+                logging.info(f"Mejores Parámetros: {mejor_par['config']}")
+                if mejor_par['mejor_precision_val'] >= UMBRAL_PROMETEDOR:
+                    logging.info("¡RESULTADO PROMETEDOR!")
+                if mejor_global is None or mejor_par['mejor_precision_val'] > mejor_global['mejor_precision_val']:
+                    mejor_global = mejor_par
 
     logging.info("\n--- BÚSQUEDA GLOBAL COMPLETADA ---")
-    if MEJOR_ACCURACY_GLOBAL > 0:
+    if mejor_global is not None:
         logging.info(f"La MEJOR configuración encontrada fue:")
-        logging.info(f"Accuracy: {MEJOR_CONFIG_GLOBAL.get('accuracy', 0.0):.2%}")
-        logging.info(f"Dataset: {MEJOR_CONFIG_GLOBAL.get('dataset')}")
-        logging.info(f"Targets: {MEJOR_CONFIG_GLOBAL.get('targets')}")
-        logging.info(f"Parámetros: {MEJOR_CONFIG_GLOBAL.get('hiperparametros')}")
+        logging.info(f"Precisión: {mejor_global['mejor_precision_val']:.2%}")
+        logging.info(f"Dataset: {mejor_global['dataset']}")
+        logging.info(f"Targets: {mejor_global['targets']}")
+        logging.info(f"Parámetros: {mejor_global['config']}")
+        logging.info(f"Todos los resultados: {RUTA_RESULTADOS}")
     else:
         logging.info("No se encontró ninguna configuración exitosa.")
 
 if __name__ == "__main__":
-    
+
     # 2. Ejecuta la búsqueda
-    buscar_hiperparametros()
\ No newline at end of file
+    buscar_hiperparametros()
@@ -0,0 +1,245 @@
+# cuantizacion.py
+"""
+Cuantización int8 post-entrenamiento para modelos guardados por MLP.guardar_modelo.
+
+- Pesos: int8 simétrico con una escala por fila (por neurona).
+- Entradas: uint8 directamente desde los píxeles 0..255.
+- Capa oculta: activaciones re-cuantizadas a uint8 con una escala calibrada.
+- Acumulación en int32 y re-escalado a float antes de cada activación.
+"""
+import json
+import logging
+import numpy as np
+
+from backpropagation import MLP
+from procesador_datos import cargar_y_convertir_dataset
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', datefmt='%H:%M:%S')
+
+# --- CONFIGURACIÓN ---
+RUTA_MODELO = "./modelo_mlp.json"
+RUTA_MODELO_CUANTIZADO = "./modelo_mlp_int8.json"
+RUTA_DATASET = "./datasets_generados/dataset_Original"
+RUTA_TARGETS = "./binario.txt"
+PORCENTAJE_ENTRENAMIENTO = 0.8 # Se calibra con la parte de entrenamiento y se evalúa con la de validación
+SEMILLA = 0
+PERCENTIL_CALIBRACION = 99.9 # Percentil de las activaciones ocultas que define su rango
+MAX_PATRONES_CALIBRACION = 1000 # Muestra aleatoria del conjunto de entrenamiento usada para calibrar
+# ---------------------
+
+def _sigmoide(z):
+    return 1 / (1 + np.exp(-np.clip(z, -88.0, 88.0)))
+
+def _relu(z):
+    return np.maximum(0, z)
+
+ACTIVACIONES = {'sigmoide': _sigmoide, 'relu': _relu}
+
+def cuantizar_por_fila(pesos):
+    """Cuantiza una matriz a int8 simétrico. Devuelve (pesos_int8, escalas (filas x 1))."""
+    max_abs = np.max(np.abs(pesos), axis=1, keepdims=True)
+    escalas = np.where(max_abs > 0, max_abs / 127.0, 1.0).astype(np.float32)
+    pesos_q = np.clip(np.round(pesos / escalas), -127, 127).astype(np.int8)
+    return pesos_q, escalas
+
+def entradas_a_uint8(entradas):
+    """Acepta píxeles uint8 (0..255) o vectores normalizados (0..1) y devuelve uint8."""
+    entradas = np.asarray(entradas)
+    if entradas.dtype == np.uint8:
+        return entradas
+    return np.clip(np.round(entradas * 255.0), 0, 255).astype(np.uint8)
+
+
+class MLPCuantizado:
+    def __init__(self, pesos_ih_q, escalas_ih, sesgos_h, pesos_ho_q, escalas_ho, sesgos_o,
+                 escala_oculta, activacion_oculta='sigmoide', activacion_salida='sigmoide',
+                 mascara_entrada=None, neuronas_entrada_original=None):
+        """
+        Red cuantizada lista para inferencia. Normalmente se construye con
+        MLPCuantizado.desde_mlp() (calibración) o MLPCuantizado.cargar().
+        'mascara_entrada' son los píxeles que usa la red (ver seleccion_pixeles.py).
+        """
+        self.pesos_ih_q = np.asarray(pesos_ih_q, dtype=np.int8)
+        self.escalas_ih = np.asarray(escalas_ih, dtype=np.float32).reshape(-1, 1)
+        self.sesgos_h = np.asarray(sesgos_h, dtype=np.float32).reshape(-1, 1)
+        self.pesos_ho_q = np.asarray(pesos_ho_q, dtype=np.int8)
+        self.escalas_ho = np.asarray(escalas_ho, dtype=np.float32).reshape(-1, 1)
+        self.sesgos_o = np.asarray(sesgos_o, dtype=np.float32).reshape(-1, 1)
+        self.escala_oculta = float(escala_oculta)
+
+        self.neuronas_ocultas, self.neuronas_entrada = self.pesos_ih_q.shape
+        self.neuronas_salida = self.pesos_ho_q.shape[0]
+        self.mascara_entrada = None if mascara_entrada is None else np.asarray(mascara_entrada, dtype=np.intp)
+        self.neuronas_entrada_original = neuronas_entrada_original or self.neuronas_entrada
+        self.activacion_oculta_str = activacion_oculta
+        self.activacion_salida_str = activacion_salida
+        self.func_oculta = ACTIVACIONES[activacion_oculta]
+        self.func_salida = ACTIVACIONES[activacion_salida]
+
+        # Los pesos se guardan ya traspuestos en int32 para el producto (N x D) @ (D x H)
+        self._pesos_ih_t = self.pesos_ih_q.T.astype(np.int32)
+        self._pesos_ho_t = self.pesos_ho_q.T.astype(np.int32)
+
+    @staticmethod
+    def desde_mlp(mlp, X_calibracion, percentil=PERCENTIL_CALIBRACION):
+        """
+        Cuantiza un MLP en float. La pasada de calibración sobre 'X_calibracion'
+        fija el rango (escala) de las activaciones de la capa oculta.
+        """
+        pesos_ih_q, escalas_ih = cuantizar_por_fila(mlp.pesos_ih)
+        pesos_ho_q, escalas_ho = cuantizar_por_fila(mlp.pesos_ho)
+
+        X_cal = np.asarray(X_calibracion)
+        if X_cal.dtype == np.uint8:
+            X_cal = X_cal.astype(mlp.dtype) / 255.0
+        X_cal = mlp._preparar_entradas(X_cal)
+        maximo = 0.0
+        if len(X_cal):
+            salidas_ocultas, _ = mlp._forward_pass(X_cal.T)
+            maximo = float(np.percentile(salidas_ocultas, percentil))
+        if maximo <= 0:
+            maximo = 1.0 # Sin datos útiles: rango nominal de la sigmoide
+        escala_oculta = maximo / 255.0
+
+        return MLPCuantizado(pesos_ih_q, escalas_ih, mlp.sesgos_h, pesos_ho_q, escalas_ho, mlp.sesgos_o,
+                             escala_oculta, mlp.activacion_oculta_str, mlp.activacion_salida_str,
+                             mlp.mascara_entrada, mlp.neuronas_entrada_original)
+
+    def predecir_lote(self, X):
+        """Predice un lote (N x D) de entradas uint8 o normalizadas. Devuelve (N x salidas) float32."""
+        X = np.asarray(X)
+        if self.mascara_entrada is not None and X.shape[-1] == self.neuronas_entrada_original:
+            X = X[..., self.mascara_entrada]
+        X_q = entradas_a_uint8(X).reshape(-1, self.neuronas_entrada).astype(np.int32)
+
+        # 1. Capa oculta: acumulación int32 y re-escalado (los píxeles están en 1/255)
+        acumulado = X_q @ self._pesos_ih_t
+        z_oculto = acumulado * (self.escalas_ih.T / 255.0) + self.sesgos_h.T
+        salidas_ocultas = self.func_oculta(z_oculto)
+
+        # 2. Re-cuantizar las activaciones ocultas a uint8 con la escala calibrada
+        ocultas_q = np.clip(np.round(salidas_ocultas / self.escala_oculta), 0, 255).astype(np.int32)
+
+        # 3. Capa de salida
+        acumulado = ocultas_q @ self._pesos_ho_t
+        z_salida = acumulado * (self.escalas_ho.T * self.escala_oculta) + self.sesgos_o.T
+        return self.func_salida(z_salida).astype(np.float32)
+
+    def predecir(self, entradas):
+        """Misma interfaz que MLP.predecir: un vector de entrada, devuelve una lista."""
+        return self.predecir_lote(np.asarray(entradas).reshape(1, -1))[0].tolist()
+
+    def tamano_bytes(self):
+        """Tamaño de los parámetros en memoria (pesos int8 + escalas y sesgos float32)."""
+        return (self.pesos_ih_q.nbytes + self.pesos_ho_q.nbytes + self.escalas_ih.nbytes +
+                self.escalas_ho.nbytes + self.sesgos_h.nbytes + self.sesgos_o.nbytes)
+
+    def guardar(self, ruta_archivo=RUTA_MODELO_CUANTIZADO, clases_info=None):
+        modelo = {
+            "arquitectura": {
+                "neuronas_entrada": self.neuronas_entrada,
+                "neuronas_ocultas": self.neuronas_ocultas,
+                "neuronas_salida": self.neuronas_salida,
+                "activacion_oculta": self.activacion_oculta_str,
+                "activacion_salida": self.activacion_salida_str,
+                "dtype": "int8",
+                "neuronas_entrada_original": self.neuronas_entrada_original,
+                "mascara_entrada": None if self.mascara_entrada is None else self.mascara_entrada.tolist()
+            },
+            "clases_info": clases_info,
+            "cuantizacion": {
+                "escala_oculta": self.escala_oculta,
+                "escalas_ih": self.escalas_ih.flatten().tolist(),
+                "escalas_ho": self.escalas_ho.flatten().tolist()
+            },
+            "pesos": {
+                "pesos_ih": self.pesos_ih_q.tolist(),
+                "sesgos_h": self.sesgos_h.tolist(),
+                "pesos_ho": self.pesos_ho_q.tolist(),
+                "sesgos_o": self.sesgos_o.tolist()
+            }
+        }
+        with open(ruta_archivo, 'w') as f:
+            json.dump(modelo, f)
+        logging.info(f"Modelo cuantizado guardado en {ruta_archivo}")
+
+    @staticmethod
+    def cargar(ruta_archivo=RUTA_MODELO_CUANTIZADO):
+        """Carga un modelo guardado por guardar(). Devuelve (modelo, clases_info)."""
+        with open(ruta_archivo, 'r') as f:
+            datos = json.load(f)
+        arq, q, pesos = datos['arquitectura'], datos['cuantizacion'], datos['pesos']
+        modelo = MLPCuantizado(pesos['pesos_ih'], q['escalas_ih'], pesos['sesgos_h'],
+                               pesos['pesos_ho'], q['escalas_ho'], pesos['sesgos_o'],
+                               q['escala_oculta'], arq.get('activacion_oculta', 'sigmoide'),
+                               arq.get('activacion_salida', 'sigmoide'),
+                               arq.get('mascara_entrada'), arq.get('neuronas_entrada_original'))
+        return modelo, datos.get('clases_info', {})
+
+
+def calcular_precision(predicciones, Y, clases_info):
+    """Precisión decodificando cada salida al vector objetivo más cercano."""
+    if len(Y) == 0: return 0.0
+    targets = np.asarray(list(clases_info.values()), dtype=np.float64)
+    predicciones = np.asarray(predicciones, dtype=np.float64)
+    Y = np.asarray(Y, dtype=np.float64)
+    idx_real = np.argmin(np.linalg.norm(Y[:, None, :] - targets[None, :, :], axis=2), axis=1)
+    idx_pred = np.argmin(np.linalg.norm(predicciones[:, None, :] - targets[None, :, :], axis=2), axis=1)
+    return float(np.mean(idx_real == idx_pred))
+
+def reporte_cuantizacion(mlp, modelo_q, X, Y, clases_info):
+    """Compara el modelo float con el cuantizado sobre (X, Y) y devuelve un diccionario."""
+    X = mlp._preparar_entradas(X)
+    _, salidas_float = mlp._forward_pass(X.T)
+    salidas_float = salidas_float.T
+    salidas_q = modelo_q.predecir_lote(X)
+
+    precision_float = calcular_precision(salidas_float, Y, clases_info)
+    precision_q = calcular_precision(salidas_q, Y, clases_info)
+    bytes_float = sum(p.nbytes for p in (mlp.pesos_ih, mlp.sesgos_h, mlp.pesos_ho, mlp.sesgos_o))
+    return {
+        "patrones": len(X),
+        "precision_float": precision_float,
+        "precision_int8": precision_q,
+        "caida_precision": precision_float - precision_q,
+        "error_max_salida": float(np.max(np.abs(salidas_float - salidas_q))) if len(X) else 0.0,
+        "bytes_float": int(bytes_float),
+        "bytes_int8": int(modelo_q.tamano_bytes())
+    }
+
+def cuantizar_modelo():
+    logging.info("Cuantizando modelo a int8...")
+    mlp, clases_info = MLP.cargar_modelo(RUTA_MODELO)
+    if mlp is None:
+        logging.error(f"No se pudo cargar el modelo: {RUTA_MODELO}")
+        return
+
+    X_train, _, X_val, Y_val, n_in, _, _, _ = cargar_y_convertir_dataset(
+        RUTA_DATASET, RUTA_TARGETS, PORCENTAJE_ENTRENAMIENTO, semilla=SEMILLA, dtype=mlp.dtype,
+        indices_entrada=mlp.mascara_entrada
+    )
+    if len(X_train) == 0 or len(X_val) == 0 or n_in != mlp.neuronas_entrada:
+        logging.error(f"El conjunto de entrenamiento o de validación está vacío o no coincide con el modelo (N_in: {n_in}).")
+        return
+
+    # La calibración no debe ver los patrones del reporte: si no, la caída de precisión sale optimista
+    generador = np.random.default_rng(SEMILLA if SEMILLA != 0 else None)
+    indices_cal = generador.permutation(len(X_train))[:MAX_PATRONES_CALIBRACION]
+    X_calibracion = np.asarray(X_train)[np.sort(indices_cal)]
+    logging.info(f"Calibrando con {len(X_calibracion)} patrones de entrenamiento (percentil {PERCENTIL_CALIBRACION})...")
+    modelo_q = MLPCuantizado.desde_mlp(mlp, X_calibracion, PERCENTIL_CALIBRACION)
+
+    logging.info(f"Evaluando con {len(X_val)} patrones de validación...")
+
+    reporte = reporte_cuantizacion(mlp, modelo_q, X_val, Y_val, clases_info)
+    logging.info("--- REPORTE DE CUANTIZACIÓN ---")
+    logging.info(f"Precisión float: {reporte['precision_float']:.2%}")
+    logging.info(f"Precisión int8:  {reporte['precision_int8']:.2%}")
+    logging.info(f"Caída de precisión: {reporte['caida_precision']:.2%}")
+    logging.info(f"Error máx. en salidas: {reporte['error_max_salida']:.4f}")
+    logging.info(f"Tamaño de parámetros: {reporte['bytes_float']} B (float) -> {reporte['bytes_int8']} B (int8)")
+
+    modelo_q.guardar(RUTA_MODELO_CUANTIZADO, clases_info)
+
+if __name__ == "__main__":
+    cuantizar_modelo()
@@ -0,0 +1,194 @@
+# ensemble.py
+"""
+Inferencia en conjunto (ensemble) sobre varios modelos guardados por MLP.guardar_modelo.
+
+Los modelos que reciben la misma entrada (mismo tamaño y misma máscara de
+píxeles) se agrupan: sus pesos_ih se apilan en una sola matriz, de modo que la
+capa oculta de todos se calcula con UN producto matricial. La capa de salida
+(mucho más pequeña) se calcula por modelo sobre su bloque de neuronas ocultas.
+
+Las salidas se combinan por 'promedio' (media de los vectores de salida) o
+'voto' (cada modelo elige la clase con el target más cercano; gana la mayoría).
+"""
+import time
+import logging
+import numpy as np
+
+from backpropagation import MLP
+from procesador_datos import cargar_y_convertir_dataset
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', datefmt='%H:%M:%S')
+
+# --- CONFIGURACIÓN ---
+RUTAS_MODELOS = [
+    "./modelo_mlp.json",
+    "./modelo_mlp_2.json",
+    "./modelo_mlp_3.json"
+]
+RUTA_DATASET = "./datasets_generados/dataset_Original"
+RUTA_TARGETS = "./binario.txt"
+PORCENTAJE_ENTRENAMIENTO = 0.8 # Se evalúa sobre la parte de validación
+SEMILLA = 0
+MODO = "promedio"              # 'promedio' o 'voto'
+# ---------------------
+
+class EnsembleMLP:
+    def __init__(self, modelos, clases_info, modo=MODO):
+        """
+        'modelos' es una lista de MLP con la misma capa de salida y la misma
+        imagen de entrada original (pueden diferir en neuronas ocultas,
+        activaciones, máscara de píxeles y precisión).
+        """
+        if len(modelos) == 0:
+            raise ValueError("El ensemble necesita al menos un modelo.")
+        if modo not in ("promedio", "voto"):
+            raise ValueError(f"Modo '{modo}' no reconocido. Use 'promedio' o 'voto'.")
+        if len({m.neuronas_salida for m in modelos}) != 1:
+            raise ValueError("Todos los modelos deben tener el mismo número de neuronas de salida.")
+        if len({m.neuronas_entrada_original for m in modelos}) != 1:
+            raise ValueError("Todos los modelos deben recibir imágenes del mismo tamaño.")
+
+        self.modelos = modelos
+        self.clases_info = clases_info
+        self.modo = modo
+        self.neuronas_entrada = modelos[0].neuronas_entrada_original
+        self.neuronas_salida = modelos[0].neuronas_salida
+        # float64 solo si todos los modelos lo son; si no, float32
+        self.dtype = np.dtype(np.float64 if all(m.dtype == np.float64 for m in modelos) else np.float32)
+        self.targets = np.asarray(list(clases_info.values()), dtype=self.dtype)
+        self.grupos = self._agrupar_modelos()
+
+    def _agrupar_modelos(self):
+        """Agrupa los modelos por entrada y apila sus capas ocultas."""
+        por_entrada = {}
+        for i, m in enumerate(self.modelos):
+            clave = None if m.mascara_entrada is None else tuple(int(j) for j in m.mascara_entrada)
+            por_entrada.setdefault(clave, []).append(i)
+
+        grupos = []
+        for clave, indices in por_entrada.items():
+            modelos = [self.modelos[i] for i in indices]
+            limites = np.cumsum([0] + [m.neuronas_ocultas for m in modelos])
+            es_relu = np.concatenate([np.full(m.neuronas_ocultas, m.activacion_oculta_str == 'relu') for m in modelos])
+            grupos.append({
+                "indices": indices,
+                "mascara": None if clave is None else np.asarray(clave, dtype=np.intp),
+                "pesos_ih": np.vstack([m.pesos_ih for m in modelos]).astype(self.dtype),
+                "sesgos_h": np.vstack([m.sesgos_h for m in modelos]).astype(self.dtype),
+                "limites": limites,
+                "es_relu": es_relu.reshape(-1, 1),
+                "todas_relu": bool(es_relu.all()),
+                "ninguna_relu": not es_relu.any(),
+                "pesos_ho": [m.pesos_ho.astype(self.dtype) for m in modelos],
+                "sesgos_o": [m.sesgos_o.astype(self.dtype) for m in modelos],
+                "salidas_relu": [m.activacion_salida_str == 'relu' for m in modelos]
+            })
+        return grupos
+
+    @staticmethod
+    def cargar(rutas_modelos, modo=MODO):
+        """Carga varios modelo_mlp.json. Todos deben tener las mismas clases."""
+        modelos, clases_info = [], None
+        for ruta in rutas_modelos:
+            mlp, clases = MLP.cargar_modelo(ruta)
+            if mlp is None:
+                raise ValueError(f"No se pudo cargar el modelo: {ruta}")
+            if clases_info is None:
+                clases_info = clases
+            elif list(clases.items()) != list(clases_info.items()):
+                raise ValueError(f"'{ruta}' usa otras clases/targets que el primer modelo.")
+            modelos.append(mlp)
+        return EnsembleMLP(modelos, clases_info, modo)
+
+    @staticmethod
+    def _sigmoide(z):
+        return 1 / (1 + np.exp(-np.clip(z, -88.0, 88.0)))
+
+    def salidas_por_modelo(self, X):
+        """Salidas de cada modelo para un lote (N x D). Devuelve (modelos x N x salidas)."""
+        X = np.asarray(X, dtype=self.dtype).reshape(-1, self.neuronas_entrada)
+        salidas = np.empty((len(self.modelos), len(X), self.neuronas_salida), dtype=self.dtype)
+        for g in self.grupos:
+            X_g = X if g["mascara"] is None else X[:, g["mascara"]]
+            # Una sola multiplicación para las capas ocultas de todo el grupo
+            z = g["pesos_ih"] @ X_g.T + g["sesgos_h"]
+            if g["todas_relu"]:
+                ocultas = np.maximum(0, z)
+            elif g["ninguna_relu"]:
+                ocultas = self._sigmoide(z)
+            else:
+                ocultas = np.where(g["es_relu"], np.maximum(0, z), self._sigmoide(z))
+            for k, i in enumerate(g["indices"]):
+                bloque = ocultas[g["limites"][k]:g["limites"][k + 1]]
+                z_salida = g["pesos_ho"][k] @ bloque + g["sesgos_o"][k]
+                salidas[i] = (np.maximum(0, z_salida) if g["salidas_relu"][k] else self._sigmoide(z_salida)).T
+        return salidas
+
+    def _decodificar(self, salidas):
+        """Índice de la clase con el target más cercano (sobre el último eje)."""
+        return np.argmin(np.linalg.norm(salidas[..., None, :] - self.targets, axis=-1), axis=-1)
+
+    def clasificar_lote(self, X):
+        """Índice de clase (según el orden de clases_info) para cada patrón del lote."""
+        salidas = self.salidas_por_modelo(X)
+        if self.modo == "promedio":
+            return self._decodificar(salidas.mean(axis=0))
+        votos = self._decodificar(salidas)                       # (modelos x N)
+        conteo = np.zeros((len(self.targets), votos.shape[1]), dtype=np.int32)
+        np.add.at(conteo, (votos, np.arange(votos.shape[1])), 1)
+        # Empates: gana la clase más cercana a la salida promedio
+        distancia = np.linalg.norm(salidas.mean(axis=0)[:, None, :] - self.targets, axis=-1).T
+        return np.lexsort((distancia, -conteo), axis=0)[0]
+
+    def predecir(self, entradas):
+        """Misma interfaz que MLP.predecir: vector de salida promedio del ensemble."""
+        return self.salidas_por_modelo(np.asarray(entradas).reshape(1, -1)).mean(axis=0)[0].tolist()
+
+    def predecir_clase(self, entradas):
+        """Nombre de la clase predicha para un vector de entrada."""
+        return list(self.clases_info.keys())[int(self.clasificar_lote(np.asarray(entradas).reshape(1, -1))[0])]
+
+
+def precision(indices_pred, Y, clases_info):
+    """Fracción de aciertos comparando con la clase del target más cercano a Y."""
+    if len(Y) == 0: return 0.0
+    targets = np.asarray(list(clases_info.values()), dtype=np.float64)
+    Y = np.asarray(Y, dtype=np.float64)
+    idx_real = np.argmin(np.linalg.norm(Y[:, None, :] - targets[None, :, :], axis=2), axis=1)
+    return float(np.mean(idx_real == indices_pred))
+
+def evaluar_ensemble():
+    logging.info("Evaluando ensemble de modelos...")
+    try:
+        ensemble = EnsembleMLP.cargar(RUTAS_MODELOS, MODO)
+    except ValueError as e:
+        logging.error(str(e))
+        return
+
+    _, _, X_val, Y_val, n_in, _, _, _ = cargar_y_convertir_dataset(
+        RUTA_DATASET, RUTA_TARGETS, PORCENTAJE_ENTRENAMIENTO, semilla=SEMILLA, dtype=ensemble.dtype
+    )
+    if len(X_val) == 0 or n_in != ensemble.neuronas_entrada:
+        logging.error(f"El conjunto de validación está vacío o no coincide con los modelos (N_in: {n_in}).")
+        return
+
+    logging.info(f"{len(ensemble.modelos)} modelos en {len(ensemble.grupos)} grupo(s) de entrada. Modo: {MODO}")
+    salidas = ensemble.salidas_por_modelo(X_val)
+    for ruta, salidas_modelo in zip(RUTAS_MODELOS, salidas):
+        logging.info(f"Precisión (Val) {ruta}: {precision(ensemble._decodificar(salidas_modelo), Y_val, ensemble.clases_info):.2%}")
+    logging.info(f"Precisión (Val) ensemble: {precision(ensemble.clasificar_lote(X_val), Y_val, ensemble.clases_info):.2%}")
+
+    # Latencia por patrón: ensemble apilado vs. los modelos uno por uno
+    inicio = time.perf_counter()
+    for x in X_val:
+        ensemble.predecir(x)
+    t_ensemble = (time.perf_counter() - inicio) / len(X_val)
+    inicio = time.perf_counter()
+    for x in X_val:
+        for m in ensemble.modelos:
+            m.predecir(x)
+    t_secuencial = (time.perf_counter() - inicio) / len(X_val)
+    logging.info(f"Latencia por patrón: {t_ensemble * 1e6:.0f} us (apilado) vs {t_secuencial * 1e6:.0f} us (modelo a modelo)")
+
+if __name__ == "__main__":
+    evaluar_ensemble()
@@ -9,6 +9,7 @@ import random # <-- Importar random
 # Importamos las funciones que ya creamos
 from procesador_datos import convolve_2d_manual
 from kernels import KERNELS
+from perfilado import PerfiladorFases, reloj_de
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', datefmt='%H:%M:%S')
 
@@ -36,21 +37,30 @@ CONFIG_BASE = {
     'modo_color': 'gris',    
     'usar_padding': True
 }
+
+# --- NUEVO: Tiempos por fase de la generación (ver perfilado.py) ---
+PERFILAR_GENERACION = False
+RUTA_PERFIL_GENERACION = "./perfil_generacion.json"
 # ---------------------
 
-def aplicar_pipeline_script(pil_img, settings, kernel_list):
+def aplicar_pipeline_script(pil_img, settings, kernel_list, perfilador=None):
     """
     Versión para script de la función _aplicar_pipeline_a_imagen.
     Aplica escalado, color y filtros en cadena.
     --- AHORA APLICA ROTACIÓN ALEATORIA ---
+    Con 'perfilador' se acumula el tiempo de cada paso.
     """
+    reloj = reloj_de(perfilador)
+    t0 = reloj()
     procesada_pil = pil_img.copy()
     procesada_pil = procesada_pil.resize(settings['escala'], Image.Resampling.LANCZOS)
+    t1 = reloj()
     
     # --- NUEVO: Aplicar rotación aleatoria ---
     angulo = random.uniform(-15.0, 15.0) # Rotación diferente cada vez
     procesada_pil = procesada_pil.rotate(angulo, resample=Image.Resampling.BICUBIC, expand=False, fillcolor=0)
     # --- FIN NUEVO ---
+    t2 = reloj()
 
     if settings['modo_color'] == 'gris':
         if procesada_pil.mode != 'L': procesada_pil = procesada_pil.convert('L')
@@ -58,11 +68,15 @@ def aplicar_pipeline_script(pil_img, settings, kernel_list):
         if procesada_pil.mode != 'RGB': procesada_pil = procesada_pil.convert('RGB')
 
     matriz_procesada = np.array(procesada_pil)
+    t3 = reloj()
     
     for kernel in kernel_list:
         if kernel is not None:
             matriz_procesada = convolve_2d_manual(matriz_procesada, kernel, settings['usar_padding'])
     
+    if perfilador is not None:
+        perfilador.agregar("reescalado", t1 - t0); perfilador.agregar("rotacion", t2 - t1)
+        perfilador.agregar("color", t3 - t2); perfilador.agregar("convolucion", reloj() - t3)
     if matriz_procesada.ndim == 3:
         return Image.fromarray(matriz_procesada, 'RGB')
     else:
@@ -86,6 +100,8 @@ def generar_datasets():
                 source_images_paths.append(os.path.join(dirpath, filename))
     
     logging.info(f"Encontradas {len(source_images_paths)} imágenes base.")
+    perfilador = PerfiladorFases() if PERFILAR_GENERACION else None
+    reloj = reloj_de(perfilador)
     
     for nombre_pipeline, kernel_list in PIPELINES_A_PROBAR.items():
         logging.info(f"Procesando pipeline: {nombre_pipeline}...")
@@ -108,15 +124,23 @@ def generar_datasets():
                     
                     os.makedirs(os.path.dirname(dest_path), exist_ok=True)
                     
+                    t0 = reloj()
                     with Image.open(source_path) as img:
+                        img.load()
+                        if perfilador is not None: perfilador.agregar("lectura", reloj() - t0)
                         # La rotación aleatoria ahora ocurre dentro de esta función
-                        img_procesada = aplicar_pipeline_script(img, CONFIG_BASE, kernel_list)
+                        img_procesada = aplicar_pipeline_script(img, CONFIG_BASE, kernel_list, perfilador)
+                        t0 = reloj()
                         img_procesada.save(dest_path)
+                        if perfilador is not None: perfilador.agregar("guardado", reloj() - t0)
                 except Exception as e:
                     logging.warning(f"Error al procesar {source_path}: {e}")
         # --- FIN MODIFICADO ---
                 
     logging.info("Fase 1: Generación de Datasets completada.")
+    if perfilador is not None:
+        perfilador.exportar_json(RUTA_PERFIL_GENERACION)
+        logging.info(perfilador.texto_resumen())
 
 if __name__ == "__main__":
     generar_datasets()
\ No newline at end of file
@@ -9,17 +9,47 @@ import os
 import numpy as np
 from collections import OrderedDict
 import threading
+import time
 import queue
 import itertools
+import contextlib
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import logging
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', datefmt='%H:%M:%S')
 
+# --- NUEVO: Despacho de la cola de la GUI ---
+INTERVALO_COLA_MS = 50      # Cada cuánto se revisa la cola de mensajes de los hilos
+PRESUPUESTO_COLA_S = 0.03   # Tiempo máximo por tick; lo que no quepa se procesa en el siguiente
+
+# --- NUEVO: Consola de entrenamiento acotada + log completo en disco ---
+MAX_LINEAS_CONSOLA = 2000                 # Líneas visibles en la consola (las más antiguas se borran)
+RUTA_LOG_CONSOLA = "./consola_entrenamiento.log"
+TAMANO_MAX_LOG_BYTES = 5 * 1024 * 1024    # Al superarlo, el archivo rota
+ARCHIVOS_LOG_ROTACION = 3                 # consola_entrenamiento.log.1 ... .3
+
+# --- NUEVO: Perfilado del entrenamiento ---
+DIR_PERFILES = "./perfiles"   # Tiempos por fase (JSON/CSV) y perfil de llamadas de cada bloque
+MOTOR_PERFIL = "cprofile"     # 'cprofile' o 'pyinstrument' (si está instalado; si no, se usa cProfile)
+
+# --- NUEVO: Diagrama de la red en la pestaña de Uso ---
+RUTA_MODELO_USO = "modelo_mlp.json"
+MAX_ETIQUETAS_PESOS = 300   # Con más pesos oculta->salida que esto, no se rotulan (serían ilegibles)
+RETARDO_REDIBUJO_RED_MS = 100
+
+# --- NUEVO: Previsualización en segundo plano ---
+RETARDO_PREVIEW_MS = 150    # Espera tras el último cambio antes de calcular la vista rápida
+REPOSO_PREVIEW_MS = 700     # Sin cambios durante este tiempo, se calcula la vista a tamaño completo
+LADO_PROXY_PREVIEW = 256    # Lado mayor de la escala destino en la vista rápida
+
 from backpropagation import MLP
 from procesador_datos import cargar_y_convertir_dataset, convertir_imagen_individual
+from graficas_vivas import GraficaEnVivo, CanalMetricas
+from perfilado import PerfiladorFases, CapturaPerfil
+from visor_matriz import VisorMatriz
 from kernels import KERNELS
 from procesador_datos import convolve_2d_manual
 
@@ -92,6 +122,56 @@ class OpcionesDialog(tk.Toplevel):
         self.protocol("WM_DELETE_WINDOW", lambda: self.set_result("stop")); self.wait_window(self)
     def set_result(self, result): self.result = result; self.destroy()
 
+class ConsolaAcotada:
+    """
+    Consola sobre un widget Text que conserva como máximo 'max_lineas' líneas.
+    Todo lo escrito se guarda también en un archivo de log rotativo; la escritura
+    a disco la hace un hilo en segundo plano (QueueListener) para no frenar la GUI.
+    """
+    def __init__(self, widget, max_lineas=MAX_LINEAS_CONSOLA, ruta_log=RUTA_LOG_CONSOLA):
+        self.widget = widget
+        self.max_lineas = max_lineas
+        self.lineas = 0
+        self.logger = logging.getLogger(f"consola.{id(self)}")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False # No se repite en la salida estándar
+        self.listener = None
+        try:
+            manejador = RotatingFileHandler(ruta_log, maxBytes=TAMANO_MAX_LOG_BYTES,
+                                            backupCount=ARCHIVOS_LOG_ROTACION, encoding="utf-8")
+            manejador.setFormatter(logging.Formatter('%(asctime)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S'))
+            cola_log = queue.SimpleQueue()
+            self.listener = QueueListener(cola_log, manejador)
+            self.listener.start()
+            self.logger.addHandler(QueueHandler(cola_log))
+        except OSError as e:
+            logging.warning(f"No se pudo abrir el log de la consola '{ruta_log}': {e}")
+
+    def escribir(self, mensaje):
+        self.logger.info(mensaje)
+        lineas = mensaje.split("\n")
+        # Un volcado más largo que la consola solo inserta su final
+        if len(lineas) > self.max_lineas: lineas = lineas[-self.max_lineas:]
+        self.widget.config(state="normal")
+        self.widget.insert(tk.END, "\n".join(lineas) + "\n")
+        self.lineas += len(lineas)
+        sobrantes = self.lineas - self.max_lineas
+        if sobrantes > 0:
+            self.widget.delete("1.0", f"{sobrantes + 1}.0")
+            self.lineas -= sobrantes
+        self.widget.see(tk.END)
+        self.widget.config(state="disabled")
+
+    def vaciar(self):
+        self.widget.config(state="normal")
+        self.widget.delete("1.0", tk.END)
+        self.widget.config(state="disabled")
+        self.lineas = 0
+
+    def cerrar(self):
+        """Escribe lo pendiente en disco y detiene el hilo del log."""
+        if self.listener: self.listener.stop(); self.listener = None
+
 class App(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -140,14 +220,27 @@ class App(tk.Tk):
         self.mlp_uso = None; 
         self.clases_info = OrderedDict()
         self.clases_info_uso = OrderedDict()
+        # --- NUEVO: Cachés de la pestaña de Uso ---
+        self.firma_modelo_uso = None          # (mtime, tamaño) del modelo cargado
+        self.version_modelo_uso = 0           # Aumenta con cada modelo cargado
+        self.firma_dibujo_red = None          # (versión del modelo, ancho, alto) del último dibujo
+        self.after_redibujo_red = None
         self.cola_gui = queue.Queue()
+        self.canal_metricas = CanalMetricas()
         
         self.img_muestra_original = None
         self.img_muestra_procesada = None
+        # --- NUEVO: Estado de la previsualización en segundo plano ---
+        self.img_muestra_proxy = None       # Original reducida (fuente de la vista rápida)
+        self.version_preview = 0            # Solo se muestra el resultado de la petición más reciente
+        self.angulo_preview = None          # Mismo ángulo para la vista rápida y la completa
+        self.after_preview_rapido = None; self.after_preview_completo = None
         self.var_escala = tk.StringVar(value="48x48")
         self.var_cantidad_aumentos = tk.StringVar(value="1")
         self.var_color = tk.StringVar(value="gris") 
         self.var_padding = tk.BooleanVar(value=True)
+        self.var_color.trace_add("write", lambda *args: self._programar_preview())
+        self.var_padding.trace_add("write", lambda *args: self._programar_preview())
         self.entries_filtro_manual_vars = []  
         self.entries_filtro_manual_widgets = []
         
@@ -162,6 +255,7 @@ class App(tk.Tk):
         self.entrenamiento_cancelado = True
         self.animacion_activa = False
         if self.hilo_entrenamiento and self.hilo_entrenamiento.is_alive(): self.hilo_entrenamiento.join(timeout=1)
+        self.consola.cerrar()
         self.destroy()
         self.quit()
 
@@ -181,19 +275,10 @@ class App(tk.Tk):
             print(f"DEBUG: Cargando escudo desde: {ruta_escudo}") 
             
             img_escudo = Image.open(ruta_escudo).resize((60, 80), Image.Resampling.LANCZOS)
-<<<<<<< HEAD
             foto_escudo = ImageTk.PhotoImage(img_escudo); label_escudo.image = foto_escudo; label_escudo.config(image=foto_escudo)
         except Exception as e:
             print(f"ERROR al cargar escudo.png: {e}")
             label_escudo.config(text="[Escudo NO Cargado]")
-=======
-            foto_escudo = ImageTk.PhotoImage(img_escudo)
-            label_escudo.image = foto_escudo
-            label_escudo.config(image=foto_escudo)
-        except Exception:
-            # Se incluye un manejo de error para cuando no se encuentre la imagen
-            label_escudo.config(text="[Escudo]")
->>>>>>> oscar
             
         label_escudo.grid(row=0, column=0, sticky="w")
         
@@ -211,18 +296,10 @@ class App(tk.Tk):
             print(f"DEBUG: Cargando logo desde: {ruta_logo}")
             
             img_logo = Image.open(ruta_logo).resize((160, 80), Image.Resampling.LANCZOS)
-<<<<<<< HEAD
             foto_logo = ImageTk.PhotoImage(img_logo); label_logo.image = foto_logo; label_logo.config(image=foto_logo)
         except Exception as e:
             print(f"ERROR al cargar logo.png: {e}")
             label_logo.config(text="[Logo NO Cargado]")
-=======
-            foto_logo = ImageTk.PhotoImage(img_logo)
-            label_logo.image = foto_logo
-            label_logo.config(image=foto_logo)
-        except Exception:
-            label_logo.config(text="[Logo]")
->>>>>>> oscar
             
         label_logo.grid(row=0, column=2, sticky="e")
         
@@ -300,9 +377,21 @@ class App(tk.Tk):
         slider = ttk.Scale(frame_slider, from_=50, to=95, orient="horizontal", variable=self.division_var, command=lambda value: self.division_label_var.set(f"{int(float(value))}% / {100-int(float(value))}%"))
         slider.pack(side="left", expand=True, fill="x")
         ttk.Label(frame_slider, textvariable=self.division_label_var, width=10).pack(side="left")
+        # --- NUEVO: Precisión numérica (float32 para entrenar, float64 como referencia) ---
+        ttk.Label(frame_config, text="Precisión Numérica:").grid(row=11, column=0, sticky="w", padx=5, pady=5)
+        self.dtype_var = tk.StringVar(value="float32")
+        ttk.Combobox(frame_config, textvariable=self.dtype_var, 
+                    values=["float32", "float64"], width=10, state="readonly").grid(row=11, column=1, sticky="w", padx=5)
 
         # --- 4. BOTONES DE CONTROL Y CONSOLA ---
         
+        # --- NUEVO: Perfilado opcional (tiempos por fase y perfil de llamadas por bloque, por separado) ---
+        # El perfil de llamadas infla las fases con más llamadas de Python: conviene medir las fases sin él.
+        self.perfilar_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(frame_config, text="Perfilar entrenamiento (tiempos por fase)", variable=self.perfilar_var).grid(row=12, column=0, columnspan=2, sticky="w", padx=5, pady=5)
+        self.capturar_perfil_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(frame_config, text=f"Capturar perfil de llamadas ({MOTOR_PERFIL})", variable=self.capturar_perfil_var).grid(row=13, column=0, columnspan=2, sticky="w", padx=5, pady=5)
+
         self.btn_iniciar = ttk.Button(frame_izquierdo, text="Iniciar Entrenamiento", command=self.iniciar_entrenamiento_nuevo); self.btn_iniciar.pack(pady=10, fill="x", padx=5)
         self.btn_cancelar = ttk.Button(frame_izquierdo, text="Cancelar Entrenamiento", command=self.detener_entrenamiento, state="disabled"); self.btn_cancelar.pack(pady=5, fill="x", padx=5)
         self.label_animacion = ttk.Label(frame_izquierdo, text="", font=("Arial", 10, "italic"))
@@ -311,6 +400,7 @@ class App(tk.Tk):
         frame_consola.pack(fill="both", expand=True, pady=10, padx=5)
         self.log_consola = tk.Text(frame_consola, height=10, state="disabled")
         self.log_consola.pack(fill="both", expand=True, padx=5, pady=5)
+        self.consola = ConsolaAcotada(self.log_consola)
 
         # --- 5. INICIALIZACIÓN DE GRÁFICAS (TAMAÑO ORIGINAL) ---
         
@@ -345,6 +435,7 @@ class App(tk.Tk):
         # 4. Enlazar al canvas
         self.canvas = FigureCanvasTkAgg(self.fig, master=frame_graficas)
         self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.graficas_vivas = GraficaEnVivo(self.canvas)
         self.limpiar_graficas()
 
     def editar_patrones_salida(self):
@@ -380,11 +471,10 @@ class App(tk.Tk):
 
     def iniciar_entrenamiento_nuevo(self):
         self.limpiar_graficas()
-        self.log_consola.config(state="normal")
-        self.log_consola.delete("1.0", tk.END)
-        self.log_consola.config(state="disabled")
+        self.consola.vaciar()
         try:
             porcentaje_entrenamiento = self.division_var.get() / 100.0
+            perfilador_carga = PerfiladorFases() if self.perfilar_var.get() else None
 
             # --- MODIFICADO: Llamada a la nueva función de carga ---
             # Esta función ahora detecta n_in y modo (L/RGB) automáticamente
@@ -392,11 +482,13 @@ class App(tk.Tk):
                 self.ruta_dataset.get(), 
                 self.ruta_targets.get(),
                 porcentaje_entrenamiento,
-                semilla=self.semilla_var.get()
+                semilla=self.semilla_var.get(),
+                dtype=self.dtype_var.get(),
+                perfilador=perfilador_carga
             )
             
             # --- MODIFICADO: Comprobación robusta de n_in ---
-            if not self.X_train or n_in <= 0: 
+            if len(self.X_train) == 0 or n_in <= 0: 
                 messagebox.showerror("Error de Carga", "No se cargaron datos de entrenamiento.\n\nVerifique que:\n1. La 'ruta_dataset' apunte a un dataset PROCESADO.\n2. El 'targets.txt' coincida con las carpetas.\n3. Todas las imágenes en el dataset tengan las MISMAS dimensiones y MODO (Gris/RGB).")
                 return
 
@@ -416,7 +508,8 @@ class App(tk.Tk):
                 n_out,
                 activacion_oculta=self.act_oculta_var.get(),
                 activacion_salida=self.act_salida_var.get(),
-                semilla=self.semilla_var.get()
+                semilla=self.semilla_var.get(),
+                dtype=self.dtype_var.get()
             )
 
             resumen_inicial = (
@@ -429,6 +522,7 @@ class App(tk.Tk):
                 f"   - Tasa de Aprendizaje (α): {self.tasa_aprendizaje_var.get()}\n"
                 f"   - Momentum (η):              {self.momentum_var.get() if self.momentum_activado.get() else 'Desactivado'}\n"
                 f"   - MSE Deseado:             {self.error_deseado_var.get()}\n"
+                f"   - Precisión Numérica:      {self.dtype_var.get()}\n"
                 f" Dataset: {self.ruta_dataset.get()}\n" # <-- NUEVO: Mostrar qué dataset se usa
                 f"   - Patrones Totales:      {len(self.X_train) + len(self.X_val)}\n"
                 f"   - División:              {self.division_var.get()}% Entrenamiento / {100-self.division_var.get()}% Validación\n"
@@ -437,6 +531,7 @@ class App(tk.Tk):
                 f"----------------------------------"
             )
             self.log_to_console(resumen_inicial)
+            if perfilador_carga is not None: self.log_to_console("Carga del dataset. " + perfilador_carga.texto_resumen())
 
             self.continuar_entrenamiento()
         except Exception as e:
@@ -452,23 +547,44 @@ class App(tk.Tk):
         self.hilo_entrenamiento = threading.Thread(target=self._hilo_entrenamiento_bloque, daemon=True)
         self.hilo_entrenamiento.start()
 
+    # --- NUEVO: Exportación del perfil de un bloque ---
+    def _guardar_perfil_bloque(self, perfilador, captura, epoca_final):
+        """
+        Se ejecuta en el hilo de entrenamiento: guarda los tiempos por fase (JSON/CSV)
+        y/o el perfil de llamadas, según cuál de los dos se haya activado (el otro es None).
+        """
+        os.makedirs(DIR_PERFILES, exist_ok=True)
+        ruta_base = os.path.join(DIR_PERFILES, f"bloque_{self.epoca_inicial_bloque + 1}-{epoca_final}_{time.strftime('%Y%m%d_%H%M%S')}")
+        resumenes = []
+        if perfilador is not None:
+            perfilador.exportar_json(ruta_base + "_fases.json")
+            perfilador.exportar_csv(ruta_base + "_fases.csv")
+            resumenes.append(perfilador.texto_resumen())
+        if captura is not None:
+            resumenes.append(f"Perfil de llamadas ({captura.motor}):\n" + captura.guardar(ruta_base))
+        logging.info(f"Perfil del bloque guardado en {ruta_base}*")
+        self.cola_gui.put(("log_message", "\n".join(resumenes) + f"\nPerfil guardado en: {ruta_base}*"))
+
     def _hilo_entrenamiento_bloque(self):
         try:
-            def reportar_progreso(epoca_actual):
-                self.cola_gui.put(("progress_update", epoca_actual))
-            
-            epoca, h_mse_train, h_mse_val, h_matrices, log_b, completo = self.mlp_actual.entrenar_bloque(
-                X_train=self.X_train, Y_train=self.Y_train,
-                X_val=self.X_val, Y_val=self.Y_val,
-                clases_info=self.clases_info,
-                tasa_aprendizaje=float(self.tasa_aprendizaje_var.get()),
-                error_deseado=float(self.error_deseado_var.get()),
-                momentum=float(self.momentum_var.get()) if self.momentum_activado.get() else 0.0,
-                epoca_inicio=self.epoca_inicial_bloque,
-                max_epocas_bloque=self.epocas_bloque_var.get(),
-                cancel_event=lambda: self.entrenamiento_cancelado,
-                progress_callback=reportar_progreso
-            )
+            # --- NUEVO: Perfilado opcional del bloque ---
+            capturar = self.capturar_perfil_var.get()
+            perfilador = PerfiladorFases() if self.perfilar_var.get() else None
+            with (CapturaPerfil(MOTOR_PERFIL) if capturar else contextlib.nullcontext()) as captura:
+                epoca, h_mse_train, h_mse_val, h_matrices, log_b, completo = self.mlp_actual.entrenar_bloque(
+                    X_train=self.X_train, Y_train=self.Y_train,
+                    X_val=self.X_val, Y_val=self.Y_val,
+                    clases_info=self.clases_info,
+                    tasa_aprendizaje=float(self.tasa_aprendizaje_var.get()),
+                    error_deseado=float(self.error_deseado_var.get()),
+                    momentum=float(self.momentum_var.get()) if self.momentum_activado.get() else 0.0,
+                    epoca_inicio=self.epoca_inicial_bloque,
+                    max_epocas_bloque=self.epocas_bloque_var.get(),
+                    cancel_event=lambda: self.entrenamiento_cancelado,
+                    canal_metricas=self.canal_metricas,
+                    perfilador=perfilador
+                )
+            if perfilador is not None or capturar: self._guardar_perfil_bloque(perfilador, captura, epoca)
             
             # <--- CAMBIO: El diccionario de resultado ahora incluye ambos historiales de MSE ---
             resultado = {
@@ -485,35 +601,59 @@ class App(tk.Tk):
             self.cola_gui.put(("show_error", ("Error en Entrenamiento", str(e))))
 
     def procesar_cola_gui(self):
+        # --- MODIFICADO: Se vacía la cola entera en cada tick (con presupuesto de tiempo) ---
+        # Los 'log_message' se juntan en una sola inserción; el resto de mensajes se
+        # atiende en orden. La época en curso la muestra _drenar_metricas.
+        limite = time.perf_counter() + PRESUPUESTO_COLA_S
+        lineas_log = []
         try:
-            mensaje, datos = self.cola_gui.get_nowait()
-            
-            # --- NUEVO: Manejar fin de generación ---
-            if mensaje == "generation_complete":
-                procesados, dest_root = datos
-                messagebox.showinfo("Generación Completa", f"Se generaron {procesados} imágenes en:\n{dest_root}")
-            # --- FIN NUEVO ---
+            self._drenar_metricas()
+            while time.perf_counter() < limite:
+                try: mensaje, datos = self.cola_gui.get_nowait()
+                except queue.Empty: break
+                if mensaje == "log_message": lineas_log.append(datos)
+                else:
+                    # Antes de un diálogo o cambio de estado se vuelca lo acumulado
+                    self._volcar_lineas_log(lineas_log)
+                    lineas_log = []
+                    self._despachar_mensaje(mensaje, datos)
+        finally:
+            self._volcar_lineas_log(lineas_log)
+            self.after(INTERVALO_COLA_MS, self.procesar_cola_gui)
+
+    def _volcar_lineas_log(self, lineas_log):
+        if lineas_log:
+            self.log_to_console("\n".join(lineas_log))
+
+    def _despachar_mensaje(self, mensaje, datos):
+        # --- NUEVO: Manejar fin de generación ---
+        if mensaje == "generation_complete":
+            procesados, dest_root = datos
+            messagebox.showinfo("Generación Completa", f"Se generaron {procesados} imágenes en:\n{dest_root}")
+        # --- FIN NUEVO ---
+        
+        elif mensaje == "show_error":
+            self.animar_carga(stop=True)
+            messagebox.showerror(datos[0], datos[1])
+            # Detener si fue un error de entrenamiento
+            if "Entrenamiento" in datos[0]:
+                self.detener_entrenamiento()
+        # --- NUEVO: Resultados de la previsualización en segundo plano ---
+        elif mensaje == "preview_listo":
+            version, img, es_proxy = datos
+            if version == self.version_preview: self._mostrar_preview(img, es_proxy)
+        elif mensaje == "preview_error":
+            version, error = datos
+            if version == self.version_preview:
+                messagebox.showerror("Error de Previsualización", f"No se pudo aplicar la transformación: {error}")
+        elif mensaje in ["bloque_finalizado", "entrenamiento_finalizado"]:
+            self.animar_carga(stop=True)
+            self._drenar_metricas() # Lo que quede del bloque, antes del estado final
+            if datos["log_del_bloque"]:
+                self.log_to_console("\n".join(datos["log_del_bloque"]))
             
-            elif mensaje == "show_error":
-                self.animar_carga(stop=True)
-                messagebox.showerror(datos[0], datos[1])
-                # Detener si fue un error de entrenamiento
-                if "Entrenamiento" in datos[0]:
-                    self.detener_entrenamiento()
-            elif mensaje == "progress_update":
-                self.animar_carga(stop=True) # Detener animacion de 'procesando'
-                self.label_animacion.config(text=f"Entrenando... Época {datos}")
-            elif mensaje == "log_message":
-                self.log_to_console(datos) 
-            elif mensaje in ["bloque_finalizado", "entrenamiento_finalizado"]:
-                self.animar_carga(stop=True)
-                if datos["log_del_bloque"]:
-                    self.log_to_console("\n".join(datos["log_del_bloque"]))
-                
-                callback = self.mostrar_dialogo_opciones if mensaje == "bloque_finalizado" else self.mostrar_mensaje_final
-                self.animar_graficas(datos, callback)
-        except queue.Empty: pass
-        finally: self.after(100, self.procesar_cola_gui)
+            callback = self.mostrar_dialogo_opciones if mensaje == "bloque_finalizado" else self.mostrar_mensaje_final
+            self.finalizar_bloque_graficas(datos, callback)
 
     def mostrar_dialogo_opciones(self):
         dialog = OpcionesDialog(self); resultado = dialog.result
@@ -546,7 +686,7 @@ class App(tk.Tk):
             mse_val_final = self.historial_mse_val[-1]
             # La matriz final se calcula sobre el conjunto de validación para el reporte más fiel
             matriz_final_val = self._calcular_matriz_confusion_estatica(self.X_val, self.Y_val)
-            precision_final_val = np.trace(matriz_final_val) / len(self.X_val) if self.X_val else 0
+            precision_final_val = np.trace(matriz_final_val) / len(self.X_val) if len(self.X_val) else 0
             
             resumen_final = (
                 f"\n--- FIN DEL ENTRENAMIENTO ---\n"
@@ -562,11 +702,8 @@ class App(tk.Tk):
 
     # --- CAMBIO: Nueva función helper para escribir en la consola ---
     def log_to_console(self, message):
-        """Inserta un mensaje en el widget de la consola de forma segura."""
-        self.log_consola.config(state="normal")
-        self.log_consola.insert(tk.END, message + "\n")
-        self.log_consola.see(tk.END)
-        self.log_consola.config(state="disabled")
+        """Inserta un mensaje en la consola (acotada) y lo guarda en el log en disco."""
+        self.consola.escribir(message)
 
     def animar_carga(self, stop=False):
         if stop:
@@ -576,96 +713,65 @@ class App(tk.Tk):
         self.epoca_inicial_bloque = 0
         self.historial_mse_train, self.historial_mse_val = [], []
         self.historial_matrices = []
-        self.linea_mse_train, self.linea_mse_val = None, None
-        self.linea_precision_train, self.linea_precision_val = None, None
+        self.linea_precision_train = None
         
         for ax in [self.ax1, self.ax2, self.ax3]: ax.clear(); ax.grid(True)
         
+        # --- MODIFICADO: Las líneas se crean una sola vez (animadas, con buffers preasignados) ---
+        self.graficas_vivas.reiniciar()
+        self.linea_mse_train = self.graficas_vivas.agregar_linea("mse_train", self.ax1, 'b-', label='Entrenamiento')
+        self.linea_mse_val = self.graficas_vivas.agregar_linea("mse_val", self.ax1, 'r-', label='Validación')
+        self.linea_precision_val = self.graficas_vivas.agregar_linea("precision_val", self.ax2, 'r-', label='Validación')
+
         # Gráfica de Error (ax1) se mantiene como estaba originalmente
         self.ax1.set_title("MSE vs. Épocas"); self.ax1.set_xlabel("Época"); self.ax1.set_ylabel("MSE")
-        self.ax1.legend(["Entrenamiento", "Validación"], loc="upper right")
+        self.ax1.legend(loc="upper right")
 
         self.ax2.set_title("Precisión Validación vs Épocas (cada 25 épocas)")
         self.ax2.set_xlabel("Época")
         self.ax2.set_ylabel("Precisión")
         self.ax3.set_title("Matriz de Confusión (Validación)"); self.ax3.set_xlabel("Predicción"); self.ax3.set_ylabel("Real")
         self.ax3.set_xticks([]); self.ax3.set_yticks([])
+        self.ultimo_dibujo_matriz = 0.0
+        self.canal_metricas.extraer_todo() # Se descartan métricas de un entrenamiento anterior
         self.canvas.draw()
         
-    def animar_graficas(self, datos_resultado, on_done_callback):
-        epoca_final_anterior = self.epoca_inicial_bloque
+    # --- NUEVO: Métricas en vivo (sustituye la reproducción del bloque al terminar) ---
+    def _drenar_metricas(self):
+        """Pasa a las gráficas todos los registros pendientes del canal, con un solo repintado."""
+        registros = self.canal_metricas.extraer_todo()
+        if not registros: return
+        INTERVALO_MATRIZ_S = 0.5
+        epocas = [r["epoca"] for r in registros]
+        self.graficas_vivas.agregar_puntos("mse_train", epocas, [r["mse_train"] for r in registros])
+        self.graficas_vivas.agregar_puntos("mse_val", epocas, [r["mse_val"] for r in registros])
+        con_precision = [r for r in registros if "precision_val" in r]
+        if con_precision:
+            self.graficas_vivas.agregar_puntos("precision_val", [r["epoca"] for r in con_precision],
+                                               [r["precision_val"] for r in con_precision])
+
+        # La matriz de confusión obliga a redibujar el fondo: como mucho una vez cada INTERVALO_MATRIZ_S
+        redibujar_fondo = False
+        con_matriz = [r for r in con_precision if "matriz_val" in r]
+        if con_matriz and time.perf_counter() - self.ultimo_dibujo_matriz >= INTERVALO_MATRIZ_S:
+            self.dibujar_matriz_confusion_estatica(con_matriz[-1]["matriz_val"], epoca_actual=con_matriz[-1]["epoca"])
+            self.ultimo_dibujo_matriz = time.perf_counter()
+            redibujar_fondo = True
+        self.graficas_vivas.actualizar(redibujar_fondo=redibujar_fondo)
+        self.label_animacion.config(text=f"Entrenando... Época {epocas[-1]}")
+
+    def finalizar_bloque_graficas(self, datos_resultado, on_done_callback):
+        """Guarda los historiales completos del bloque y dibuja su estado final (sin reproducirlo)."""
         self.epoca_inicial_bloque = datos_resultado["epoca_final"]
         self.historial_mse_train.extend(datos_resultado["historial_mse_train_bloque"])
         self.historial_mse_val.extend(datos_resultado["historial_mse_val_bloque"])
         self.historial_matrices.extend(datos_resultado["historial_matrices_bloque"])
-        
-        eje_x_nuevo = range(epoca_final_anterior + 1, self.epoca_inicial_bloque + 1)
-        
-        self.animacion_activa = True
-        self._bucle_animacion(
-            eje_x_nuevo,
-            datos_resultado["historial_mse_train_bloque"],
-            datos_resultado["historial_mse_val_bloque"],
-            datos_resultado["historial_matrices_bloque"],
-            0,
-            on_done_callback
-        )
-
-    def _bucle_animacion(self, x_data, mse_train_data, mse_val_data, matrices_data, index, on_done_callback):
-        if not self.animacion_activa or index >= len(x_data):
-            if self.animacion_activa: self.dibujar_estado_final_graficas(); self.after(100, on_done_callback)
-            self.animacion_activa = False; return
-
-        step = 25; delay_ms = 20; MUESTRAS_MATRIZ = 25
-        
-        if not self.linea_mse_train: self.linea_mse_train, = self.ax1.plot([], [], 'b-', label='Entrenamiento')
-        if not self.linea_mse_val: self.linea_mse_val, = self.ax1.plot([], [], 'r-', label='Validación')
-        if not self.linea_precision_train: self.linea_precision_train, = self.ax2.plot([], [], 'b-', label='Entrenamiento')
-        if not self.linea_precision_val: self.linea_precision_val, = self.ax2.plot([], [], 'r-', label='Validación')
-        
-        next_index = min(index + step, len(x_data))
-
-        # Actualizar MSE
-        self.linea_mse_train.set_data(np.append(self.linea_mse_train.get_xdata(), x_data[index:next_index]), np.append(self.linea_mse_train.get_ydata(), mse_train_data[index:next_index]))
-        self.linea_mse_val.set_data(np.append(self.linea_mse_val.get_xdata(), x_data[index:next_index]), np.append(self.linea_mse_val.get_ydata(), mse_val_data[index:next_index]))
-        
-        # Actualizar Precisión
-        if matrices_data:
-            precision_val_segmento = []
-            for i in range(index, next_index):
-                epoca_actual = x_data[i]
-                indice_matriz = (epoca_actual - 1) // MUESTRAS_MATRIZ
-                if indice_matriz < len(matrices_data):
-                    matriz = matrices_data[indice_matriz]
-                    precision = np.trace(matriz) / len(self.X_val) if len(self.X_val) > 0 else 0
-                    precision_val_segmento.append(precision)
-                else:
-                    if len(self.linea_precision_val.get_ydata()) > 0:
-                        precision_val_segmento.append(self.linea_precision_val.get_ydata()[-1])
-                    else:
-                        precision_val_segmento.append(0)
-
-            self.linea_precision_val.set_data(
-                np.append(self.linea_precision_val.get_xdata(), x_data[index:next_index]),
-                np.append(self.linea_precision_val.get_ydata(), precision_val_segmento)
-            )
-
-        # Mostrar Matriz de Confusión
-        if matrices_data:
-            indice_matriz_display = (x_data[index] - 1) // MUESTRAS_MATRIZ
-            if indice_matriz_display < len(matrices_data):
-                matriz_a_mostrar = matrices_data[indice_matriz_display]
-                self.dibujar_matriz_confusion_estatica(matriz_a_mostrar, epoca_actual=x_data[index])
-
-        self.ax1.relim(); self.ax1.autoscale_view(); self.ax1.legend()
-        self.ax2.relim(); self.ax2.autoscale_view() 
-        self.canvas.draw()
-        
-        self.after(delay_ms, self._bucle_animacion, x_data, mse_train_data, mse_val_data, matrices_data, next_index, on_done_callback)
+        self.dibujar_estado_final_graficas()
+        self.after(100, on_done_callback)
 
     def _calcular_matriz_confusion_estatica(self, X_data, Y_data):
         matriz = np.zeros((len(self.nombres_clases), len(self.nombres_clases)))
-        if not X_data: return matriz
+        if len(X_data) == 0: return matriz
         
         for x, y_real_vec in zip(X_data, Y_data):
             prediccion_vec = np.array(self.mlp_actual.predecir(x))
@@ -718,11 +824,9 @@ class App(tk.Tk):
         
         eje_x = range(1, len(self.historial_mse_train) + 1)
         
-        # Dibujar las líneas de MSE
-        if not self.linea_mse_train: self.linea_mse_train, = self.ax1.plot(eje_x, self.historial_mse_train, 'b-', label='Entrenamiento')
-        else: self.linea_mse_train.set_data(eje_x, self.historial_mse_train)
-        if not self.linea_mse_val: self.linea_mse_val, = self.ax1.plot(eje_x, self.historial_mse_val, 'r-', label='Validación')
-        else: self.linea_mse_val.set_data(eje_x, self.historial_mse_val)
+        # Dibujar las líneas de MSE (se deciman al ancho del eje al dibujarlas)
+        self.graficas_vivas.reemplazar("mse_train", eje_x, self.historial_mse_train)
+        self.graficas_vivas.reemplazar("mse_val", eje_x, self.historial_mse_val)
 
         # Dibujar la línea de Precisión
         eje_x_prec = []
@@ -731,27 +835,22 @@ class App(tk.Tk):
             if (epoca % 25 == 0 or epoca == len(eje_x)) and self.historial_matrices:
                 indice_matriz = min( (epoca - 1) // 25, len(self.historial_matrices) - 1)
                 matriz = self.historial_matrices[indice_matriz]
-                # Asumiendo que X_val es el conjunto de validación
                 acc = np.trace(matriz) / len(self.X_val) if len(self.X_val) > 0 else 0
                 eje_x_prec.append(epoca)
                 precision_val.append(acc)
         
-        if not self.linea_precision_val:
-            self.linea_precision_val, = self.ax2.plot(eje_x_prec, precision_val, 'r-o', label='Validación')
-        else:
-            self.linea_precision_val.set_data(eje_x_prec, precision_val)
-            self.linea_precision_val.set_linestyle('-')
-            self.linea_precision_val.set_marker('o')
+        self.graficas_vivas.reemplazar("precision_val", eje_x_prec, precision_val)
+        self.linea_precision_val.set_linestyle('-')
+        self.linea_precision_val.set_marker('o')
 
         # Dibujar la Matriz final
-        if self.X_val:
+        if len(self.X_val):
             matriz_final = self._calcular_matriz_confusion_estatica(self.X_val, self.Y_val)
             self.dibujar_matriz_confusion_estatica(matriz_final, epoca_actual=len(self.historial_mse_train))
         
-        # Ajustar la vista y dibujar en el canvas
-        self.ax1.relim(); self.ax1.autoscale_view(); self.ax1.legend()
-        self.ax2.relim(); self.ax2.autoscale_view() 
-        self.canvas.draw()
+        # Ajustar los ejes a todo el historial y dibujar en el canvas
+        self.graficas_vivas.redibujar_todo()
+
     def on_tab_changed(self, event):
         selected_tab_index = self.notebook.index(self.notebook.select())
         if selected_tab_index == 1:
@@ -763,6 +862,7 @@ class App(tk.Tk):
 
         self.canvas_red = tk.Canvas(self.frame_uso_principal, bg="white")
         self.canvas_red.pack(side="left", fill="both", expand=True, padx=10, pady=10)
+        self.canvas_red.bind("<Configure>", self._al_redimensionar_red)
         
         frame_controles = ttk.Frame(self.frame_uso_principal, width=300)
         frame_controles.pack(side="left", fill="y", padx=10, pady=10)
@@ -791,16 +891,25 @@ class App(tk.Tk):
         self.label_prediccion_letra.pack(pady=20, fill="x")
 
     def cargar_recursos_uso(self):
+        # --- MODIFICADO: Solo se recarga si el archivo del modelo cambió desde la última carga ---
+        try: firma_modelo = (os.path.getmtime(RUTA_MODELO_USO), os.path.getsize(RUTA_MODELO_USO))
+        except OSError: firma_modelo = None
+        if self.mlp_uso and self.clases_info_uso and firma_modelo is not None and firma_modelo == self.firma_modelo_uso:
+            self.dibujar_red_uso() # No hace nada si el canvas no cambió de tamaño
+            return
+
         logging.info("Cambiando a la pestaña de Uso. Recargando modelo y targets...")
         self.clases_info_uso.clear()
         modelo_cargado = False
 
         try:
             # Ahora esperamos recibir el modelo y la info de las clases
-            self.mlp_uso, clases_info_cargadas = MLP.cargar_modelo("modelo_mlp.json")
+            self.mlp_uso, clases_info_cargadas = MLP.cargar_modelo(RUTA_MODELO_USO)
+            self.version_modelo_uso += 1
             
             if self.mlp_uso and clases_info_cargadas:
                 modelo_cargado = True
+                self.firma_modelo_uso = firma_modelo
                 # Usamos la info de clases que vino CON el modelo
                 self.clases_info_uso = clases_info_cargadas
                 logging.info("Modelo y datos de clases cargados exitosamente desde 'modelo_mlp.json'.")
@@ -897,8 +1006,8 @@ class App(tk.Tk):
             self.label_carpeta_seleccionada.config(text=f"Valor real: {nombre_carpeta}")
             
             # Verificar tamaño del vector de entrada (Aquí es donde debe ser 2304)
-            if len(vector_entrada) != self.mlp_uso.neuronas_entrada:
-                messagebox.showerror("Error", f"La imagen procesada ({len(vector_entrada)} píxeles) no tiene el tamaño correcto. Se esperaba un vector de {self.mlp_uso.neuronas_entrada} píxeles (Revise su configuración de Reescalado en la pestaña de Preprocesamiento).")
+            if len(vector_entrada) != self.mlp_uso.neuronas_entrada_original:
+                messagebox.showerror("Error", f"La imagen procesada ({len(vector_entrada)} píxeles) no tiene el tamaño correcto. Se esperaba un vector de {self.mlp_uso.neuronas_entrada_original} píxeles (Revise su configuración de Reescalado en la pestaña de Preprocesamiento).")
                 return
             
             # 6. Realizar la predicción
@@ -919,17 +1028,29 @@ class App(tk.Tk):
         except Exception as e:
             messagebox.showerror("Error al Predecir", str(e))
 
+    def _al_redimensionar_red(self, event):
+        if self.after_redibujo_red: self.after_cancel(self.after_redibujo_red)
+        self.after_redibujo_red = self.after(RETARDO_REDIBUJO_RED_MS, self.dibujar_red_uso)
+
     def dibujar_red_uso(self, salidas_ocultas=None, salidas_finales=None):
+        # --- MODIFICADO: Solo se redibuja si cambió el modelo o el tamaño del canvas ---
+        self.after_redibujo_red = None
+        w, h = self.canvas_red.winfo_width(), self.canvas_red.winfo_height()
+        firma = (self.version_modelo_uso, w, h)
+        if firma == self.firma_dibujo_red: return
+        self.firma_dibujo_red = firma
+
         self.canvas_red.delete("all")
         if not self.mlp_uso: return
-        w, h = self.canvas_red.winfo_width(), self.canvas_red.winfo_height()
         x_in, x_hidden, x_out = w * 0.1, w * 0.5, w * 0.9
         self.canvas_red.create_oval(x_in-20, h/2-20, x_in+20, h/2+20, fill="lightgray"); self.canvas_red.create_text(x_in, h/2, text=f"{self.mlp_uso.neuronas_entrada}\nEntradas")
         y_step_h = h / (self.mlp_uso.neuronas_ocultas + 1)
         for j in range(self.mlp_uso.neuronas_ocultas):
             y_h = y_step_h * (j + 1)
             self.canvas_red.create_oval(x_hidden-15, y_h-15, x_hidden+15, y_h+15, fill="lightblue")
-            for i in range(self.mlp_uso.neuronas_entrada): self.canvas_red.create_line(x_in, h/2, x_hidden, y_h, fill="gray")
+            # Las entradas están agrupadas en un solo nodo: sus N líneas coincidían; basta una (más gruesa)
+            self.canvas_red.create_line(x_in, h/2, x_hidden, y_h, fill="gray", width=2)
+        rotular_pesos = self.mlp_uso.neuronas_ocultas * self.mlp_uso.neuronas_salida <= MAX_ETIQUETAS_PESOS
         y_step_o = h / (self.mlp_uso.neuronas_salida + 1)
         for k in range(self.mlp_uso.neuronas_salida):
             y_o = y_step_o * (k + 1)
@@ -937,8 +1058,8 @@ class App(tk.Tk):
             for j in range(self.mlp_uso.neuronas_ocultas):
                 y_h = y_step_h * (j + 1)
                 self.canvas_red.create_line(x_hidden, y_h, x_out, y_o, fill="gray")
-                self.canvas_red.create_text((x_hidden+x_out)/2, (y_h+y_o)/2, text=f"{self.mlp_uso.pesos_ho[k][j]:.1f}", font=("Arial", 7))
-
+                if rotular_pesos:
+                    self.canvas_red.create_text((x_hidden+x_out)/2, (y_h+y_o)/2, text=f"{self.mlp_uso.pesos_ho[k][j]:.1f}", font=("Arial", 7))
 
     def probar_imagen_aleatoria(self):
         """
@@ -966,8 +1087,8 @@ class App(tk.Tk):
             self.label_imagen_predecida.image = photo 
             
             vector_entrada = convertir_imagen_individual(ruta_aleatoria)
-            if len(vector_entrada) != self.mlp_uso.neuronas_entrada:
-                messagebox.showerror("Error de Tamaño", f"La imagen no tiene el tamaño correcto. Se esperaba un vector de {self.mlp_uso.neuronas_entrada} píxeles.")
+            if len(vector_entrada) != self.mlp_uso.neuronas_entrada_original:
+                messagebox.showerror("Error de Tamaño", f"La imagen no tiene el tamaño correcto. Se esperaba un vector de {self.mlp_uso.neuronas_entrada_original} píxeles.")
                 return
             
             # Realizar la predicción
@@ -1133,16 +1254,9 @@ class App(tk.Tk):
         self.label_img_procesada.grid(row=1, column=1, padx=10, pady=10, sticky="nsew")
         frame_matrices = ttk.LabelFrame(preview_paned_window, text="Previsualización de Matriz (Valores 0-255)")
         preview_paned_window.add(frame_matrices, weight=1)
-        frame_mat_orig = ttk.Frame(frame_matrices); frame_mat_orig.pack(side="left", fill="both", expand=True, padx=5, pady=5)
-        scroll_mat_orig_v = ttk.Scrollbar(frame_mat_orig, orient="vertical"); scroll_mat_orig_h = ttk.Scrollbar(frame_mat_orig, orient="horizontal")
-        self.text_matriz_original = tk.Text(frame_mat_orig, height=10, state="disabled", font=("Courier", 9), wrap="none", yscrollcommand=scroll_mat_orig_v.set, xscrollcommand=scroll_mat_orig_h.set)
-        scroll_mat_orig_v.config(command=self.text_matriz_original.yview); scroll_mat_orig_h.config(command=self.text_matriz_original.xview)
-        scroll_mat_orig_v.pack(side="right", fill="y"); scroll_mat_orig_h.pack(side="bottom", fill="x"); self.text_matriz_original.pack(fill="both", expand=True)
-        frame_mat_proc = ttk.Frame(frame_matrices); frame_mat_proc.pack(side="left", fill="both", expand=True, padx=5, pady=5)
-        scroll_mat_proc_v = ttk.Scrollbar(frame_mat_proc, orient="vertical"); scroll_mat_proc_h = ttk.Scrollbar(frame_mat_proc, orient="horizontal")
-        self.text_matriz_procesada = tk.Text(frame_mat_proc, height=10, state="disabled", font=("Courier", 9), wrap="none", yscrollcommand=scroll_mat_proc_v.set, xscrollcommand=scroll_mat_proc_h.set)
-        scroll_mat_proc_v.config(command=self.text_matriz_procesada.yview); scroll_mat_proc_h.config(command=self.text_matriz_procesada.xview)
-        scroll_mat_proc_v.pack(side="right", fill="y"); scroll_mat_proc_h.pack(side="bottom", fill="x"); self.text_matriz_procesada.pack(fill="both", expand=True)
+        # --- MODIFICADO: Visores por ventana (solo se formatea lo visible; rueda/Shift/Ctrl para moverse y hacer zoom) ---
+        self.visor_matriz_original = VisorMatriz(frame_matrices, height=10); self.visor_matriz_original.pack(side="left", fill="both", expand=True, padx=5, pady=5)
+        self.visor_matriz_procesada = VisorMatriz(frame_matrices, height=10); self.visor_matriz_procesada.pack(side="left", fill="both", expand=True, padx=5, pady=5)
 
     def _on_filtro_seleccionado(self, event):
         """(MODIFICADO v3 - Punto 2)
@@ -1164,6 +1278,7 @@ class App(tk.Tk):
                     for c in range(5):
                         self.entries_filtro_manual_widgets[r][c].config(state="disabled")
             # --- FIN MODIFICADO ---
+            self._programar_preview()
         except Exception as e:
             logging.error(f"Error en _on_filtro_seleccionado: {e}")
 
@@ -1200,6 +1315,10 @@ class App(tk.Tk):
         
         try:
             self.img_muestra_original = Image.open(ruta_muestra)
+            self.img_muestra_original.load()
+            # Fuente reducida para la vista rápida (se calcula una sola vez por muestra)
+            self.img_muestra_proxy = self.img_muestra_original.copy()
+            self.img_muestra_proxy.thumbnail((2 * LADO_PROXY_PREVIEW, 2 * LADO_PROXY_PREVIEW), Image.Resampling.BILINEAR)
             
             # --- INICIO DE CORRECCIÓN (Punto 2: Matriz) ---
             # Mostrar la imagen original
@@ -1208,7 +1327,7 @@ class App(tk.Tk):
             self.label_img_original.image = img_tk_original
             
             # Mostrar la matriz original VERDADERA
-            self._mostrar_matriz(self.text_matriz_original, np.array(self.img_muestra_original))
+            self.visor_matriz_original.mostrar(np.asarray(self.img_muestra_original))
             # --- FIN DE CORRECCIÓN ---
             
             # Activar botones
@@ -1223,67 +1342,74 @@ class App(tk.Tk):
             messagebox.showerror("Error al Cargar Muestra", f"No se pudo cargar la imagen de muestra:\n{ruta_muestra}\nError: {e}")
 
     def _actualizar_preview(self):
-        """(MODIFICADA) Pasa el booleano de rotación."""
+        """(MODIFICADA) Pide la previsualización a tamaño completo; se calcula en un hilo."""
         if not self.img_muestra_original:
             messagebox.showwarning("Sin Imagen", "Primero carga una imagen de muestra.")
             return
+        self._cancelar_previews_programadas()
+        settings = self._leer_controles_pipeline()
+        if settings is None: return
+        self.angulo_preview = random.uniform(-15.0, 15.0)
+        self._lanzar_preview(settings, es_proxy=False)
 
-        logging.info("Actualizando previsualización...")
+    # --- NUEVO: Previsualización con debounce, en segundo plano ---
+    def _programar_preview(self):
+        """
+        Llamada en cada cambio de filtros/color/padding. Reinicia dos temporizadores:
+        la vista rápida (sobre una versión reducida) y, en reposo, la completa.
+        Los controles se leen (y validan) una sola vez aquí: con un campo inválido se
+        muestra un único error y no se programa nada.
+        """
+        if not self.img_muestra_original: return
+        self._cancelar_previews_programadas()
+        settings = self._leer_controles_pipeline()
+        if settings is None: return
+        if self.angulo_preview is None: self.angulo_preview = random.uniform(-15.0, 15.0)
+        self.after_preview_rapido = self.after(RETARDO_PREVIEW_MS, lambda: self._lanzar_preview(settings, es_proxy=True))
+        self.after_preview_completo = self.after(REPOSO_PREVIEW_MS, lambda: self._lanzar_preview(settings, es_proxy=False))
+
+    def _cancelar_previews_programadas(self):
+        for id_after in (self.after_preview_rapido, self.after_preview_completo):
+            if id_after: self.after_cancel(id_after)
+        self.after_preview_rapido = None; self.after_preview_completo = None
+
+    def _lanzar_preview(self, settings, es_proxy):
+        if es_proxy: self.after_preview_rapido = None
+        else: self.after_preview_completo = None
+
+        # Si el usuario pide > 1 aumentos, mostrar un ejemplo rotado.
+        angulo = self.angulo_preview if settings['cantidad_aumentos'] > 1 else None
+        imagen = self.img_muestra_original
+        if es_proxy:
+            w, h = settings['escala']
+            factor = min(1.0, LADO_PROXY_PREVIEW / max(w, h))
+            settings = dict(settings, escala=(max(1, round(w * factor)), max(1, round(h * factor))))
+            imagen = self.img_muestra_proxy
+        # Una petición nueva deja obsoletas a las anteriores (el hilo lo comprueba entre filtros)
+        self.version_preview += 1
+        threading.Thread(target=self._hilo_preview, args=(self.version_preview, imagen, settings, angulo, es_proxy), daemon=True).start()
+
+    def _hilo_preview(self, version, imagen, settings, angulo, es_proxy):
+        """Aplica el pipeline fuera del hilo de Tk; el resultado vuelve por la cola."""
         try:
-            settings = self._leer_controles_pipeline()
-            if settings is None: return
-
-            kernels_en_cadena = list(settings['kernels_dict'].values())
-            
-            # --- MODIFICADO (Punto 2) ---
-            # Si el usuario pide > 1 aumentos, mostrar un ejemplo rotado.
-            aplicar_rot_preview = (settings['cantidad_aumentos'] > 1)
-            
-            self.img_muestra_procesada = self._aplicar_pipeline_a_imagen(
-                self.img_muestra_original, 
-                settings, 
-                kernel_list=kernels_en_cadena,
-                aplicar_rotacion=aplicar_rot_preview # <-- MODIFICADO
+            obsoleta = lambda: version != self.version_preview
+            img = self._aplicar_pipeline_a_imagen(
+                imagen, settings, kernel_list=list(settings['kernels_dict'].values()),
+                aplicar_rotacion=angulo is not None, angulo=angulo, cancelado=obsoleta
             )
-            # --- FIN MODIFICADO ---
-
-            img_tk_procesada = self._crear_imagen_previsualizacion(self.img_muestra_procesada)
-            self.label_img_procesada.config(image=img_tk_procesada, text=""); self.label_img_procesada.image = img_tk_procesada
-            self._mostrar_matriz(self.text_matriz_procesada, np.array(self.img_muestra_procesada))
-            
-            self._mostrar_matriz(self.text_matriz_original, np.array(self.img_muestra_original))
-            logging.info(f"Previsualización actualizada.")
-            
+            if img is not None and not obsoleta():
+                self.cola_gui.put(("preview_listo", (version, img, es_proxy)))
         except Exception as e:
             logging.error(f"Error al actualizar preview: {e}", exc_info=True)
-            messagebox.showerror("Error de Previsualización", f"No se pudo aplicar la transformación: {e}")
-
-    def _mostrar_matriz(self, text_widget, matriz):
-        """(MODIFICADA) Helper para mostrar una matriz NumPy completa en un widget de Texto."""
-        text_widget.config(state="normal")
-        text_widget.delete("1.0", tk.END)
-        
-        info = ""
-        if matriz.ndim == 3:
-            matriz_display = matriz[:, :, 0]
-            info = f"Mostrando 1er Canal (Rojo) - Dimensiones: {matriz.shape}\n"
-        else:
-            matriz_display = matriz
-            info = f"Mostrando Canal Único (Gris) - Dimensiones: {matriz.shape}\n"
-        
-        text_widget.insert(tk.END, info + "-"*20 + "\n")
-        
-        # --- MODIFICADO: Imprimir matriz completa (Punto 3) ---
-        matriz_str = np.array2string(
-            matriz_display, 
-            precision=0, 
-            suppress_small=True,
-            threshold=np.inf, # <-- Fuerza a NumPy a no truncar
-            max_line_width=np.inf # <-- Evita saltos de línea
-        )
-        text_widget.insert(tk.END, matriz_str)
-        text_widget.config(state="disabled")
+            self.cola_gui.put(("preview_error", (version, str(e))))
 
+    def _mostrar_preview(self, img, es_proxy):
+        self.img_muestra_procesada = img
+        img_tk_procesada = self._crear_imagen_previsualizacion(img)
+        self.label_img_procesada.config(image=img_tk_procesada, text=""); self.label_img_procesada.image = img_tk_procesada
+        # La matriz original ya se mostró al cargar la muestra y no cambia con los filtros
+        self.visor_matriz_procesada.mostrar(np.asarray(img))
+        logging.info("Previsualización rápida actualizada." if es_proxy else "Previsualización actualizada.")
 
     def _generar_dataset_individual(self):
         """(MODIFICADO) Botón principal: Inicia el HILO para "Generar por Filtro Individual"."""
@@ -1548,16 +1674,17 @@ class App(tk.Tk):
         
         return settings
 
-    def _aplicar_pipeline_a_imagen(self, pil_img, settings, kernel_list, aplicar_rotacion=False):
+    def _aplicar_pipeline_a_imagen(self, pil_img, settings, kernel_list, aplicar_rotacion=False, angulo=None, cancelado=None):
         """
-        Aplica el pipeline. Acepta un booleano para aplicar rotación.
+        Aplica el pipeline. Acepta un booleano para aplicar rotación (con 'angulo'
+        fijo o aleatorio). Si 'cancelado()' devuelve True entre filtros, devuelve None.
         """
         procesada_pil = pil_img.copy()
         procesada_pil = procesada_pil.resize(settings['escala'], Image.Resampling.LANCZOS)
         
         # --- MODIFICADO (Punto 2) ---
         if aplicar_rotacion:
-            angulo = random.uniform(-15.0, 15.0)
+            if angulo is None: angulo = random.uniform(-15.0, 15.0)
             procesada_pil = procesada_pil.rotate(angulo, resample=Image.Resampling.BICUBIC, expand=False, fillcolor=0)
         # --- FIN MODIFICADO ---
 
@@ -1569,6 +1696,7 @@ class App(tk.Tk):
         matriz_procesada = np.array(procesada_pil)
         
         for kernel in kernel_list:
+            if cancelado is not None and cancelado(): return None
             if kernel is not None:
                 matriz_procesada = convolve_2d_manual(matriz_procesada, kernel, settings['usar_padding'])
         
@@ -0,0 +1,149 @@
+# perfilado.py
+"""
+Medición del tiempo de entrenamiento (y de carga/generación de datos) por fase.
+
+- PerfiladorFases: acumula tiempo de reloj (time.perf_counter) por fase,
+  agrupado por época ('forward', 'backward', 'actualizacion', 'metricas_train',
+  'metricas_val', 'registro', ...). Las fases medidas fuera del bucle de épocas
+  (ej. 'conversion_datos' o la lectura de imágenes) van a 'fuera_de_epoca'.
+  entrenar_bloque, los cargadores y el generador de datasets lo reciben como
+  parámetro opcional: sin perfilador no se mide nada (reloj_de devuelve un
+  reloj que siempre marca 0).
+  Se exporta a JSON (resumen + detalle por época) o CSV (una fila por época).
+- CapturaPerfil: cProfile (o pyinstrument, si está instalado) alrededor de un
+  bloque de código. Perfila el hilo que lo ejecuta.
+"""
+import io
+import csv
+import json
+import time
+import cProfile
+import pstats
+from contextlib import contextmanager
+
+try:
+    import pyinstrument
+except ImportError:
+    pyinstrument = None
+
+FUNCIONES_RESUMEN_PERFIL = 25   # Funciones que se listan en el resumen de cProfile
+
+def _reloj_apagado():
+    return 0.0
+
+def reloj_de(perfilador):
+    """time.perf_counter si hay perfilador; si no, un reloj que no mide (casi sin coste)."""
+    return time.perf_counter if perfilador is not None else _reloj_apagado
+
+class PerfiladorFases:
+    def __init__(self):
+        self.por_epoca = []          # [{"epoca": n, fase: segundos, ...}, ...]
+        self.fuera_de_epoca = {}     # fase -> segundos
+        self._epoca_actual = None
+
+    def iniciar_epoca(self, epoca):
+        self._epoca_actual = {"epoca": epoca}
+        self.por_epoca.append(self._epoca_actual)
+
+    def terminar_epoca(self):
+        self._epoca_actual = None
+
+    def agregar(self, fase, segundos):
+        destino = self._epoca_actual if self._epoca_actual is not None else self.fuera_de_epoca
+        destino[fase] = destino.get(fase, 0.0) + segundos
+
+    @contextmanager
+    def fase(self, nombre):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.agregar(nombre, time.perf_counter() - inicio)
+
+    def fases(self):
+        """Nombres de las fases por época, en el orden en que aparecieron."""
+        nombres = {}
+        for registro in self.por_epoca:
+            for fase in registro:
+                if fase != "epoca": nombres.setdefault(fase, None)
+        return list(nombres)
+
+    def resumen(self):
+        """Total, media por época y porcentaje (sobre el tiempo de las épocas) de cada fase."""
+        totales = {fase: 0.0 for fase in self.fases()}
+        for registro in self.por_epoca:
+            for fase, segundos in registro.items():
+                if fase != "epoca": totales[fase] += segundos
+        n_epocas = len(self.por_epoca)
+        tiempo_epocas = sum(totales.values())
+        return {
+            "epocas": n_epocas,
+            "segundos_epocas": tiempo_epocas,
+            "fases": {
+                fase: {
+                    "total_s": total,
+                    "media_por_epoca_s": total / n_epocas if n_epocas else 0.0,
+                    "porcentaje": 100.0 * total / tiempo_epocas if tiempo_epocas else 0.0
+                } for fase, total in totales.items()
+            },
+            "fuera_de_epoca": dict(self.fuera_de_epoca)
+        }
+
+    def texto_resumen(self):
+        """Resumen legible para la consola."""
+        resumen = self.resumen()
+        lineas = [f"Tiempo por fase ({resumen['epocas']} épocas, {resumen['segundos_epocas']:.2f}s):"]
+        for fase, datos in sorted(resumen["fases"].items(), key=lambda item: -item[1]["total_s"]):
+            lineas.append(f"  {fase:<16} {datos['total_s']:9.3f}s  {datos['porcentaje']:5.1f}%  "
+                          f"({datos['media_por_epoca_s'] * 1e3:.2f} ms/época)")
+        for fase, segundos in resumen["fuera_de_epoca"].items():
+            lineas.append(f"  {fase:<16} {segundos:9.3f}s  (fuera de las épocas)")
+        return "\n".join(lineas)
+
+    def exportar_json(self, ruta):
+        with open(ruta, 'w') as f:
+            json.dump({"resumen": self.resumen(), "por_epoca": self.por_epoca}, f, indent=2)
+
+    def exportar_csv(self, ruta):
+        """Una fila por época y una columna por fase (segundos)."""
+        with open(ruta, 'w', newline='') as f:
+            escritor = csv.DictWriter(f, fieldnames=["epoca"] + self.fases(), restval=0.0)
+            escritor.writeheader()
+            escritor.writerows(self.por_epoca)
+
+class CapturaPerfil:
+    """
+    Perfil de llamadas de un bloque 'with'. motor='pyinstrument' solo se usa si
+    el paquete está instalado; si no, cProfile.
+    """
+    def __init__(self, motor="cprofile"):
+        self.motor = motor if (motor != "pyinstrument" or pyinstrument is not None) else "cprofile"
+        self._perfil = None
+
+    def __enter__(self):
+        if self.motor == "pyinstrument":
+            self._perfil = pyinstrument.Profiler()
+            self._perfil.start()
+        else:
+            self._perfil = cProfile.Profile()
+            self._perfil.enable()
+        return self
+
+    def __exit__(self, *exc):
+        if self.motor == "pyinstrument": self._perfil.stop()
+        else: self._perfil.disable()
+        return False
+
+    def guardar(self, ruta_base):
+        """
+        Guarda el perfil (ruta_base + '.prof' con cProfile, '.html' con pyinstrument)
+        y devuelve un resumen en texto.
+        """
+        if self.motor == "pyinstrument":
+            with open(ruta_base + ".html", 'w') as f:
+                f.write(self._perfil.output_html())
+            return self._perfil.output_text()
+        self._perfil.dump_stats(ruta_base + ".prof")
+        salida = io.StringIO()
+        pstats.Stats(self._perfil, stream=salida).sort_stats("cumulative").print_stats(FUNCIONES_RESUMEN_PERFIL)
+        return salida.getvalue()
@@ -0,0 +1,150 @@
+# poda.py
+"""
+Poda estructurada de neuronas ocultas para modelos entrenados con MLP.
+
+1. Se puntúa cada neurona oculta ('magnitud' de sus pesos o 'varianza' de su
+   activación sobre el conjunto de validación).
+2. Se eliminan las menos importantes, recortando pesos_ih/sesgos_h (filas) y
+   pesos_ho (columnas). La activación media de las neuronas eliminadas se
+   suma a sesgos_o, así la salida apenas cambia antes del ajuste fino.
+3. Opcionalmente se re-entrena unas épocas (ajuste fino) y se guarda el
+   modelo reducido.
+"""
+import logging
+import numpy as np
+
+from backpropagation import MLP
+from procesador_datos import cargar_y_convertir_dataset
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', datefmt='%H:%M:%S')
+
+# --- CONFIGURACIÓN ---
+RUTA_MODELO = "./modelo_mlp.json"
+RUTA_MODELO_PODADO = "./modelo_mlp_podado.json"
+RUTA_DATASET = "./datasets_generados/dataset_Original"
+RUTA_TARGETS = "./binario.txt"
+PORCENTAJE_ENTRENAMIENTO = 0.8
+SEMILLA = 0
+CRITERIO = "varianza"          # 'magnitud' o 'varianza'
+FRACCIONES_A_PROBAR = [0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7]
+FRACCION_ELEGIDA = 0.3         # Fracción de neuronas ocultas a eliminar en el modelo final
+EPOCAS_AJUSTE_FINO = 50        # 0 = sin ajuste fino
+TASA_APRENDIZAJE = 0.01
+MOMENTUM = 0.9
+# ---------------------
+
+def puntuar_neuronas(mlp, criterio="magnitud", X_ref=None):
+    """
+    Devuelve una puntuación por neurona oculta (mayor = más importante).
+    - 'magnitud': ||pesos_ih[j]|| * ||pesos_ho[:, j]||.
+    - 'varianza': desviación de la activación de j sobre X_ref por ||pesos_ho[:, j]||,
+      es decir, cuánto varía lo que la neurona aporta a la capa de salida.
+    """
+    norma_salida = np.linalg.norm(mlp.pesos_ho, axis=0)
+    if criterio == "magnitud":
+        return np.linalg.norm(mlp.pesos_ih, axis=1) * norma_salida
+    if criterio == "varianza":
+        if X_ref is None or len(X_ref) == 0:
+            raise ValueError("El criterio 'varianza' necesita un conjunto de referencia (X_ref).")
+        salidas_ocultas, _ = mlp._forward_pass(mlp._preparar_entradas(X_ref).T)
+        return np.std(salidas_ocultas, axis=1, dtype=np.float64) * norma_salida
+    raise ValueError(f"Criterio '{criterio}' no reconocido. Use 'magnitud' o 'varianza'.")
+
+def podar_neuronas(mlp, indices_conservar, X_ref=None):
+    """
+    Devuelve un MLP nuevo con solo las neuronas ocultas 'indices_conservar'.
+    Si se da X_ref, la activación media de las neuronas eliminadas se pliega
+    en los sesgos de salida.
+    """
+    conservar = np.sort(np.asarray(indices_conservar, dtype=int))
+    eliminar = np.setdiff1d(np.arange(mlp.neuronas_ocultas), conservar)
+
+    sesgos_o = mlp.sesgos_o.astype(np.float64)
+    if X_ref is not None and len(X_ref) and len(eliminar):
+        salidas_ocultas, _ = mlp._forward_pass(mlp._preparar_entradas(X_ref).T)
+        media_eliminadas = np.mean(salidas_ocultas[eliminar], axis=1, dtype=np.float64).reshape(-1, 1)
+        sesgos_o = sesgos_o + mlp.pesos_ho[:, eliminar].astype(np.float64) @ media_eliminadas
+
+    podado = MLP.desde_pesos(mlp.pesos_ih[conservar], mlp.sesgos_h[conservar],
+                             mlp.pesos_ho[:, conservar], sesgos_o,
+                             mlp.activacion_oculta_str, mlp.activacion_salida_str, mlp.dtype)
+    # La poda no toca la capa de entrada: se conserva la máscara de píxeles
+    podado.mascara_entrada = mlp.mascara_entrada
+    podado.neuronas_entrada_original = mlp.neuronas_entrada_original
+    return podado
+
+def flops_inferencia(mlp):
+    """Operaciones de punto flotante por patrón (multiplicación + suma por peso, más sesgos)."""
+    return (2 * mlp.neuronas_ocultas * mlp.neuronas_entrada + mlp.neuronas_ocultas +
+            2 * mlp.neuronas_salida * mlp.neuronas_ocultas + mlp.neuronas_salida)
+
+def evaluar(mlp, X, Y, clases_info):
+    """Devuelve (mse, precision) sobre (X, Y)."""
+    mse, matriz = mlp._calcular_metricas(X, Y, clases_info)
+    precision = float(np.trace(matriz) / len(X)) if len(X) else 0.0
+    return mse, precision
+
+def podar_fraccion(mlp, fraccion, criterio, X_ref):
+    """Elimina la fracción dada de neuronas ocultas (siempre conserva al menos una)."""
+    puntuaciones = puntuar_neuronas(mlp, criterio, X_ref)
+    n_conservar = max(1, mlp.neuronas_ocultas - int(round(fraccion * mlp.neuronas_ocultas)))
+    indices_conservar = np.argsort(puntuaciones)[::-1][:n_conservar]
+    return podar_neuronas(mlp, indices_conservar, X_ref)
+
+def barrido_poda(mlp, X_val, Y_val, clases_info, fracciones=FRACCIONES_A_PROBAR, criterio=CRITERIO):
+    """Precisión vs. FLOPs para cada fracción podada (sin ajuste fino)."""
+    resultados = []
+    for fraccion in fracciones:
+        podado = podar_fraccion(mlp, fraccion, criterio, X_val)
+        mse, precision = evaluar(podado, X_val, Y_val, clases_info)
+        resultados.append({
+            "fraccion": fraccion,
+            "neuronas_ocultas": podado.neuronas_ocultas,
+            "flops": flops_inferencia(podado),
+            "mse_val": mse,
+            "precision_val": precision
+        })
+    return resultados
+
+def ajuste_fino(mlp, X_train, Y_train, X_val, Y_val, clases_info, epocas=EPOCAS_AJUSTE_FINO):
+    """Re-entrena el modelo podado unas pocas épocas con entrenar_bloque."""
+    if epocas <= 0: return mlp
+    mlp.entrenar_bloque(X_train, Y_train, X_val, Y_val, clases_info, TASA_APRENDIZAJE,
+                        error_deseado=0.0, momentum=MOMENTUM, epoca_inicio=0,
+                        max_epocas_bloque=epocas, cancel_event=lambda: False)
+    return mlp
+
+def podar_modelo():
+    logging.info("Iniciando poda de neuronas ocultas...")
+    mlp, clases_info = MLP.cargar_modelo(RUTA_MODELO)
+    if mlp is None:
+        logging.error(f"No se pudo cargar el modelo: {RUTA_MODELO}")
+        return
+
+    X_train, Y_train, X_val, Y_val, n_in, _, _, _ = cargar_y_convertir_dataset(
+        RUTA_DATASET, RUTA_TARGETS, PORCENTAJE_ENTRENAMIENTO, semilla=SEMILLA, dtype=mlp.dtype,
+        indices_entrada=mlp.mascara_entrada
+    )
+    if len(X_val) == 0 or n_in != mlp.neuronas_entrada:
+        logging.error(f"El conjunto de validación está vacío o no coincide con el modelo (N_in: {n_in}).")
+        return
+
+    logging.info(f"--- PRECISIÓN VS FLOPS (criterio: {CRITERIO}) ---")
+    flops_base = flops_inferencia(mlp)
+    for r in barrido_poda(mlp, X_val, Y_val, clases_info, FRACCIONES_A_PROBAR, CRITERIO):
+        logging.info(f"Poda {r['fraccion']:>4.0%} | Ocultas: {r['neuronas_ocultas']:>3} | "
+                     f"FLOPs: {r['flops']:>9} ({r['flops'] / flops_base:.0%}) | "
+                     f"MSE (Val): {r['mse_val']:.6f} | Precisión (Val): {r['precision_val']:.2%}")
+
+    podado = podar_fraccion(mlp, FRACCION_ELEGIDA, CRITERIO, X_val)
+    _, precision_antes = evaluar(podado, X_val, Y_val, clases_info)
+    if EPOCAS_AJUSTE_FINO > 0 and len(X_train):
+        logging.info(f"Ajuste fino del modelo podado ({podado.neuronas_ocultas} ocultas, {EPOCAS_AJUSTE_FINO} épocas)...")
+        ajuste_fino(podado, X_train, Y_train, X_val, Y_val, clases_info, EPOCAS_AJUSTE_FINO)
+    _, precision_despues = evaluar(podado, X_val, Y_val, clases_info)
+    logging.info(f"Precisión (Val) podado: {precision_antes:.2%} -> {precision_despues:.2%} tras ajuste fino")
+
+    podado.guardar_modelo(RUTA_MODELO_PODADO, clases_info=clases_info)
+
+if __name__ == "__main__":
+    podar_modelo()
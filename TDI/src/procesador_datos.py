@@ -3,21 +3,14 @@ import os
 import numpy as np
 from PIL import Image
 import random 
+from perfilado import reloj_de
 
-def cargar_y_convertir_dataset(ruta_dataset, ruta_targets, porcentaje_entrenamiento=0.8, semilla=0):
+# --- NUEVO: Lectura de targets separada (la usan también la búsqueda de hiperparámetros) ---
+def cargar_targets(ruta_targets):
     """
-    (Fase 6 - Modificado)
-    Carga un dataset de imágenes (que pueden ser grises 'L' o color 'RGB'),
-    las aplana a vectores, las normaliza, y las divide.
-    
-    Esta versión asume que las imágenes en la 'ruta_dataset' ya han sido 
-    pre-procesadas (escaladas, filtradas) y son consistentes.
+    Lee un archivo de targets ('clase, v1, v2, ...' por línea).
+    Devuelve (targets, tamano_salida): diccionario clase -> vector y la longitud de los vectores.
     """
-
-    if semilla != 0:
-        random.seed(semilla)
-
-    # 1. Cargar los patrones de salida (targets.txt) - (Sin cambios)
     targets = {}
     tamano_salida = -1
     with open(ruta_targets, 'r') as f:
@@ -27,25 +20,85 @@ def cargar_y_convertir_dataset(ruta_dataset, ruta_targets, porcentaje_entrenamie
             parts = [p.strip() for p in line.strip().split(',')]
             clase = parts[0].replace(',', '.') # Corregimos posible error de comas
             vector_salida = [float(val) for val in parts[1:]]
-            
+        
             if primera_linea:
                 tamano_salida = len(vector_salida)
                 primera_linea = False
             elif len(vector_salida) != tamano_salida:
                 raise ValueError(f"Inconsistencia en {ruta_targets}: La línea para '{clase}' no coincide.")
-            
+        
             targets[clase] = vector_salida
-            
+    return targets, tamano_salida
+
+def cargar_y_convertir_dataset(ruta_dataset, ruta_targets, porcentaje_entrenamiento=0.8, semilla=0, dtype=None,
+                               indices_entrada=None, perfilador=None):
+    """
+    (Fase 6 - Modificado)
+    Carga un dataset de imágenes (que pueden ser grises 'L' o color 'RGB'),
+    las aplana a vectores, las normaliza, y las divide.
+    
+    Esta versión asume que las imágenes en la 'ruta_dataset' ya han sido 
+    pre-procesadas (escaladas, filtradas) y son consistentes.
+
+    Si se indica 'dtype' (ej. np.float32), X e Y se devuelven como matrices
+    NumPy (N x D) de ese tipo en lugar de listas de Python.
+
+    Si se indica 'indices_entrada' (la máscara de píxeles de un modelo, ver
+    seleccion_pixeles.py), solo se guardan esos píxeles de cada imagen y el
+    n_in devuelto es len(indices_entrada).
+
+    'perfilador' (opcional, ver perfilado.py) recibe el tiempo de cada fase de la carga.
+    """
+
+    # 1. Cargar los patrones de salida (targets.txt)
+    targets, tamano_salida = cargar_targets(ruta_targets)
+
+    # 2. y 3. Imágenes, división estratificada y mezcla (ver cargar_imagenes_dataset)
+    X_train, clases_train, X_val, clases_val, tamano_vector_esperado, archivos_invalidos, rutas_totales = \
+        cargar_imagenes_dataset(ruta_dataset, targets.keys(), porcentaje_entrenamiento, semilla, dtype, indices_entrada, perfilador)
+
+    # 4. Devolver los resultados
+    # Devolvemos el 'tamano_vector_esperado' (n_in) que detectamos
+    reloj = reloj_de(perfilador)
+    inicio = reloj()
+    if dtype is not None:
+        # --- NUEVO: Matrices compactas en lugar de listas de floats de Python ---
+        Y_train = codificar_etiquetas(clases_train, targets, dtype)
+        Y_val = codificar_etiquetas(clases_val, targets, dtype)
+    else:
+        Y_train = [targets[c] for c in clases_train]
+        Y_val = [targets[c] for c in clases_val]
+    if perfilador is not None: perfilador.agregar("codificar_etiquetas", reloj() - inicio)
+    return X_train, Y_train, X_val, Y_val, tamano_vector_esperado, tamano_salida, archivos_invalidos, rutas_totales
+
+# --- NUEVO: Carga de imágenes independiente de los targets ---
+def cargar_imagenes_dataset(ruta_dataset, clases, porcentaje_entrenamiento=0.8, semilla=0, dtype=None,
+                            indices_entrada=None, perfilador=None):
+    """
+    Carga, aplana y divide las imágenes de las carpetas 'clases' de 'ruta_dataset'.
+    En lugar de vectores objetivo devuelve el nombre de la clase de cada patrón,
+    así el mismo dataset puede combinarse con varios archivos de targets sin
+    volver a decodificar las imágenes (ver codificar_etiquetas).
+
+    Devuelve (X_train, clases_train, X_val, clases_val, n_in, archivos_invalidos, rutas_totales).
+    Con 'dtype', X_train y X_val son matrices NumPy (N x n_in); si no, listas.
+    """
+    if semilla != 0:
+        random.seed(semilla)
+    clases = set(clases)
+
     # 2. Recorrer, convertir y agrupar imágenes por clase
     datos_por_clase = {}
     rutas_totales = []
     archivos_invalidos = []
     tamano_vector_esperado = -1 
     modo_esperado = None # --- NUEVO: Para 'L' o 'RGB' ---
+    reloj = reloj_de(perfilador) # --- NUEVO: Medición opcional por fase ---
+    inicio_lectura = reloj()
 
     print(f"Procesando dataset de imágenes desde: {ruta_dataset}...")
     for nombre_clase in sorted(os.listdir(ruta_dataset)):
-        if nombre_clase not in targets: continue
+        if nombre_clase not in clases: continue
         dir_clase = os.path.join(ruta_dataset, nombre_clase)
         if not os.path.isdir(dir_clase): continue
 
@@ -64,8 +117,11 @@ def cargar_y_convertir_dataset(ruta_dataset, ruta_targets, porcentaje_entrenamie
                     # Simplemente cargamos la imagen como esté (L o RGB)
                     img_array = np.array(img)
                     
-                    # --- MODIFICADO: Aplanar y normalizar ---
-                    vector_entrada = (img_array / 255.0).flatten()
+                    # --- MODIFICADO: Aplanar y normalizar (en el dtype pedido, si lo hay) ---
+                    if dtype is not None:
+                        vector_entrada = (img_array.astype(dtype) / 255.0).flatten()
+                    else:
+                        vector_entrada = (img_array / 255.0).flatten()
 
                     # --- MODIFICADO: Comprobación de consistencia (Tamaño y Modo) ---
                     if tamano_vector_esperado == -1:
@@ -81,8 +137,12 @@ def cargar_y_convertir_dataset(ruta_dataset, ruta_targets, porcentaje_entrenamie
                         print(f"  -> Recibido: {img.mode} (Tamañ: {vector_entrada.size})")
                         archivos_invalidos.append(nombre_archivo)
                         continue
+
+                    # --- NUEVO: Conservar solo los píxeles seleccionados ---
+                    if indices_entrada is not None:
+                        vector_entrada = vector_entrada[indices_entrada]
                     
-                    patrones_clase.append((vector_entrada.tolist(), targets[nombre_clase]))
+                    patrones_clase.append((vector_entrada if dtype is not None else vector_entrada.tolist(), nombre_clase))
             except Exception as e:
                 print(f"Error al procesar '{nombre_archivo}': {e}")
                 archivos_invalidos.append(nombre_archivo)
@@ -90,31 +150,79 @@ def cargar_y_convertir_dataset(ruta_dataset, ruta_targets, porcentaje_entrenamie
         datos_por_clase[nombre_clase] = patrones_clase
 
     # 3. División estratificada y mezcla aleatoria (Sin cambios)
-    X_train, Y_train, X_val, Y_val = [], [], [], []
+    inicio_division = reloj()
+    X_train, clases_train, X_val, clases_val = [], [], [], []
     for nombre_clase, patrones in datos_por_clase.items():
         random.shuffle(patrones)
         punto_division = int(len(patrones) * porcentaje_entrenamiento)
         
-        for vector_x, vector_y in patrones[:punto_division]:
+        for vector_x, clase in patrones[:punto_division]:
             X_train.append(vector_x)
-            Y_train.append(vector_y)
-        for vector_x, vector_y in patrones[punto_division:]:
+            clases_train.append(clase)
+        for vector_x, clase in patrones[punto_division:]:
             X_val.append(vector_x)
-            Y_val.append(vector_y)
+            clases_val.append(clase)
 
     print("Mezclando los conjuntos de datos finales...")
     if X_train:
-        temp_train = list(zip(X_train, Y_train))
+        temp_train = list(zip(X_train, clases_train))
         random.shuffle(temp_train)
-        X_train, Y_train = list(zip(*temp_train))
+        X_train, clases_train = list(zip(*temp_train))
     if X_val:
-        temp_val = list(zip(X_val, Y_val))
+        temp_val = list(zip(X_val, clases_val))
         random.shuffle(temp_val)
-        X_val, Y_val = list(zip(*temp_val))
+        X_val, clases_val = list(zip(*temp_val))
     
-    # 4. Devolver los resultados
-    # Devolvemos el 'tamano_vector_esperado' (n_in) que detectamos
-    return list(X_train), list(Y_train), list(X_val), list(Y_val), tamano_vector_esperado, tamano_salida, archivos_invalidos, rutas_totales
+    if indices_entrada is not None and tamano_vector_esperado != -1:
+        tamano_vector_esperado = len(indices_entrada)
+    inicio_matrices = reloj()
+    if dtype is not None:
+        # --- NUEVO: Matrices compactas en lugar de listas de floats de Python ---
+        n_in = max(tamano_vector_esperado, 0)
+        X_train = np.array(X_train, dtype=dtype).reshape(len(X_train), n_in)
+        X_val = np.array(X_val, dtype=dtype).reshape(len(X_val), n_in)
+    else:
+        X_train, X_val = list(X_train), list(X_val)
+    if perfilador is not None:
+        perfilador.agregar("lectura_imagenes", inicio_division - inicio_lectura)
+        perfilador.agregar("division_mezcla", inicio_matrices - inicio_division)
+        perfilador.agregar("matrices", reloj() - inicio_matrices)
+    return X_train, list(clases_train), X_val, list(clases_val), tamano_vector_esperado, archivos_invalidos, rutas_totales
+
+def codificar_etiquetas(clases_patrones, targets, dtype=np.float32):
+    """
+    Matriz (N x n_out) de vectores objetivo para una lista de nombres de clase.
+    Se construye indexando la tabla de targets (una fila por clase), sin tocar las imágenes.
+    """
+    nombres = list(targets.keys())
+    tabla = np.asarray([targets[c] for c in nombres], dtype=dtype)
+    posicion = {c: i for i, c in enumerate(nombres)}
+    indices = np.fromiter((posicion[c] for c in clases_patrones), dtype=np.intp, count=len(clases_patrones))
+    return tabla[indices].reshape(len(indices), tabla.shape[1])
+
+# --- NUEVO: Validación cruzada estratificada ---
+def k_fold_estratificado(clases_patrones, k=5, semilla=0):
+    """
+    Generador de k particiones estratificadas sobre el índice de patrones.
+    'clases_patrones' es la clase de cada patrón (ej. clases_train de
+    cargar_imagenes_dataset con porcentaje_entrenamiento=1.0).
+    En cada iteración devuelve (indices_entrenamiento, indices_validacion); cada
+    patrón cae en validación exactamente una vez y cada clase se reparte por
+    igual entre los pliegues.
+    """
+    if k < 2:
+        raise ValueError("k debe ser al menos 2.")
+    generador = np.random.default_rng(semilla if semilla != 0 else None)
+    clases_patrones = np.asarray(clases_patrones)
+    pliegue = np.empty(len(clases_patrones), dtype=np.intp)
+    desplazamiento = 0
+    for clase in np.unique(clases_patrones):
+        indices = generador.permutation(np.flatnonzero(clases_patrones == clase))
+        # Reparto circular; el desplazamiento evita que los restos caigan siempre en el pliegue 0
+        pliegue[indices] = (np.arange(len(indices)) + desplazamiento) % k
+        desplazamiento += len(indices)
+    for i in range(k):
+        yield np.flatnonzero(pliegue != i), np.flatnonzero(pliegue == i)
 
 def convertir_imagen_individual(ruta_imagen):
     """
@@ -0,0 +1,170 @@
+# seleccion_pixeles.py
+"""
+Selección de píxeles de entrada para modelos entrenados con MLP.
+
+Con imágenes grandes (ej. 48x48 = 2304 entradas) la mayoría de las columnas
+de pesos_ih multiplican píxeles de fondo. Este script:
+
+1. Puntúa cada píxel de entrada: 'pesos' (norma de su columna en pesos_ih) o
+   'informacion_mutua' (entre el píxel discretizado y la clase, sobre el
+   conjunto de entrenamiento).
+2. Conserva los k mejores: recorta las columnas de pesos_ih (la media de los
+   píxeles eliminados se suma a sesgos_h) y guarda la máscara en el modelo
+   (mascara_entrada). MLP.predecir y cargar_y_convertir_dataset (parámetro
+   indices_entrada) recogen solo esos píxeles.
+3. Opcionalmente re-entrena unas épocas (ajuste fino) y guarda el modelo.
+"""
+import logging
+import numpy as np
+
+from backpropagation import MLP
+from procesador_datos import cargar_y_convertir_dataset
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', datefmt='%H:%M:%S')
+
+# --- CONFIGURACIÓN ---
+RUTA_MODELO = "./modelo_mlp.json"
+RUTA_MODELO_SELECCION = "./modelo_mlp_pixeles.json"
+RUTA_DATASET = "./datasets_generados/dataset_Original"
+RUTA_TARGETS = "./binario.txt"
+PORCENTAJE_ENTRENAMIENTO = 0.8
+SEMILLA = 0
+CRITERIO = "informacion_mutua"  # 'pesos' o 'informacion_mutua'
+BINS_INFORMACION_MUTUA = 8      # Niveles en que se discretiza cada píxel (0..1)
+FRACCIONES_A_PROBAR = [1.0, 0.75, 0.5, 0.25, 0.1]
+FRACCION_ELEGIDA = 0.25         # Fracción de píxeles que se conservan en el modelo final
+EPOCAS_AJUSTE_FINO = 50         # 0 = sin ajuste fino
+TASA_APRENDIZAJE = 0.01
+MOMENTUM = 0.9
+# ---------------------
+
+def puntuar_pixeles_pesos(mlp):
+    """Norma de la columna de pesos_ih de cada entrada (mayor = más importante)."""
+    return np.linalg.norm(mlp.pesos_ih.astype(np.float64), axis=0)
+
+def puntuar_pixeles_informacion_mutua(X, etiquetas, bins=BINS_INFORMACION_MUTUA):
+    """
+    Información mutua I(píxel; clase) de cada columna de X (valores en 0..1).
+    Se calcula para todos los píxeles a la vez con un único histograma conjunto.
+    """
+    X = np.asarray(X)
+    etiquetas = np.asarray(etiquetas, dtype=np.intp)
+    n, d = X.shape
+    if n == 0: return np.zeros(d)
+    n_clases = int(etiquetas.max()) + 1
+
+    niveles = np.clip((X * bins).astype(np.intp), 0, bins - 1)
+    # Índice plano (píxel, nivel, clase) -> un solo bincount para todo el histograma
+    indices = (np.arange(d) * bins)[None, :] + niveles
+    indices = indices * n_clases + etiquetas[:, None]
+    conjunta = np.bincount(indices.ravel(), minlength=d * bins * n_clases)
+    conjunta = conjunta.reshape(d, bins, n_clases) / n
+
+    p_pixel = conjunta.sum(axis=2, keepdims=True)
+    p_clase = conjunta.sum(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        termino = conjunta * np.log(conjunta / (p_pixel * p_clase))
+    return np.nansum(termino, axis=(1, 2))
+
+def etiquetas_desde_targets(Y, clases_info):
+    """Índice de clase de cada vector objetivo (el target más cercano)."""
+    targets = np.asarray(list(clases_info.values()), dtype=np.float64)
+    Y = np.asarray(Y, dtype=np.float64)
+    return np.argmin(np.linalg.norm(Y[:, None, :] - targets[None, :, :], axis=2), axis=1)
+
+def puntuar_pixeles(mlp, criterio, X=None, Y=None, clases_info=None):
+    """Puntúa las entradas actuales de la red con el criterio elegido."""
+    if criterio == "pesos":
+        return puntuar_pixeles_pesos(mlp)
+    if criterio == "informacion_mutua":
+        if X is None or len(X) == 0:
+            raise ValueError("El criterio 'informacion_mutua' necesita un conjunto de entrenamiento.")
+        etiquetas = etiquetas_desde_targets(Y, clases_info)
+        return puntuar_pixeles_informacion_mutua(mlp._preparar_entradas(X), etiquetas)
+    raise ValueError(f"Criterio '{criterio}' no reconocido. Use 'pesos' o 'informacion_mutua'.")
+
+def crear_mascara(puntuaciones, k):
+    """Índices (ordenados) de los k píxeles con mayor puntuación."""
+    k = int(np.clip(k, 1, len(puntuaciones)))
+    return np.sort(np.argsort(puntuaciones)[::-1][:k]).astype(np.intp)
+
+def aplicar_mascara(mlp, mascara, X_ref=None):
+    """
+    Devuelve un MLP nuevo que solo recibe las entradas 'mascara' (índices sobre
+    las entradas actuales de 'mlp'). Si la red ya tenía máscara, se combinan.
+    Si se da X_ref, el valor medio de los píxeles eliminados se pliega en los
+    sesgos ocultos (un fondo constante se compensa exactamente).
+    """
+    mascara = np.asarray(mascara, dtype=np.intp)
+    eliminar = np.setdiff1d(np.arange(mlp.neuronas_entrada), mascara)
+
+    sesgos_h = mlp.sesgos_h.astype(np.float64)
+    if X_ref is not None and len(X_ref) and len(eliminar):
+        media_eliminados = np.mean(mlp._preparar_entradas(X_ref)[:, eliminar], axis=0, dtype=np.float64)
+        sesgos_h = sesgos_h + (mlp.pesos_ih[:, eliminar].astype(np.float64) @ media_eliminados).reshape(-1, 1)
+
+    reducido = MLP.desde_pesos(mlp.pesos_ih[:, mascara], sesgos_h, mlp.pesos_ho, mlp.sesgos_o,
+                               mlp.activacion_oculta_str, mlp.activacion_salida_str, mlp.dtype)
+    reducido.mascara_entrada = mascara if mlp.mascara_entrada is None else mlp.mascara_entrada[mascara]
+    reducido.neuronas_entrada_original = mlp.neuronas_entrada_original
+    return reducido
+
+def evaluar(mlp, X, Y, clases_info):
+    """Devuelve (mse, precision) sobre (X, Y)."""
+    mse, matriz = mlp._calcular_metricas(X, Y, clases_info)
+    precision = float(np.trace(matriz) / len(X)) if len(X) else 0.0
+    return mse, precision
+
+def barrido_pixeles(mlp, puntuaciones, X_val, Y_val, clases_info, fracciones=FRACCIONES_A_PROBAR, X_ref=None):
+    """Precisión vs. número de píxeles conservados (sin ajuste fino)."""
+    resultados = []
+    for fraccion in fracciones:
+        mascara = crear_mascara(puntuaciones, round(fraccion * mlp.neuronas_entrada))
+        reducido = aplicar_mascara(mlp, mascara, X_ref)
+        mse, precision = evaluar(reducido, X_val, Y_val, clases_info)
+        resultados.append({
+            "fraccion": fraccion,
+            "pixeles": reducido.neuronas_entrada,
+            "mse_val": mse,
+            "precision_val": precision
+        })
+    return resultados
+
+def seleccionar_pixeles():
+    logging.info("Iniciando selección de píxeles de entrada...")
+    mlp, clases_info = MLP.cargar_modelo(RUTA_MODELO)
+    if mlp is None:
+        logging.error(f"No se pudo cargar el modelo: {RUTA_MODELO}")
+        return
+
+    # Se carga la imagen completa; _preparar_entradas aplica la máscara que ya tenga el modelo
+    X_train, Y_train, X_val, Y_val, n_in, _, _, _ = cargar_y_convertir_dataset(
+        RUTA_DATASET, RUTA_TARGETS, PORCENTAJE_ENTRENAMIENTO, semilla=SEMILLA, dtype=mlp.dtype
+    )
+    if len(X_val) == 0 or n_in != mlp.neuronas_entrada_original:
+        logging.error(f"El conjunto de validación está vacío o no coincide con el modelo (N_in: {n_in}).")
+        return
+
+    puntuaciones = puntuar_pixeles(mlp, CRITERIO, X_train, Y_train, clases_info)
+
+    logging.info(f"--- PRECISIÓN VS PÍXELES (criterio: {CRITERIO}) ---")
+    for r in barrido_pixeles(mlp, puntuaciones, X_val, Y_val, clases_info, FRACCIONES_A_PROBAR, X_train):
+        logging.info(f"Píxeles {r['fraccion']:>4.0%} | Entradas: {r['pixeles']:>5} | "
+                     f"MSE (Val): {r['mse_val']:.6f} | Precisión (Val): {r['precision_val']:.2%}")
+
+    mascara = crear_mascara(puntuaciones, round(FRACCION_ELEGIDA * mlp.neuronas_entrada))
+    reducido = aplicar_mascara(mlp, mascara, X_train)
+    _, precision_antes = evaluar(reducido, X_val, Y_val, clases_info)
+    if EPOCAS_AJUSTE_FINO > 0 and len(X_train):
+        logging.info(f"Ajuste fino con {reducido.neuronas_entrada} entradas ({EPOCAS_AJUSTE_FINO} épocas)...")
+        reducido.entrenar_bloque(X_train, Y_train, X_val, Y_val, clases_info, TASA_APRENDIZAJE,
+                                 error_deseado=0.0, momentum=MOMENTUM, epoca_inicio=0,
+                                 max_epocas_bloque=EPOCAS_AJUSTE_FINO, cancel_event=lambda: False)
+    _, precision_despues = evaluar(reducido, X_val, Y_val, clases_info)
+    logging.info(f"Precisión (Val): {precision_antes:.2%} -> {precision_despues:.2%} tras ajuste fino")
+    logging.info(f"Pesos de la primera capa: {mlp.pesos_ih.size} -> {reducido.pesos_ih.size}")
+
+    reducido.guardar_modelo(RUTA_MODELO_SELECCION, clases_info=clases_info)
+
+if __name__ == "__main__":
+    seleccionar_pixeles()
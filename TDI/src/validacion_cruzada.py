@@ -0,0 +1,154 @@
+import os
+# Un hilo BLAS por proceso: el paralelismo lo dan los pliegues, no NumPy
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+os.environ.setdefault("MKL_NUM_THREADS", "1")
+
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+
+from backpropagation import MLP
+from procesador_datos import cargar_imagenes_dataset, cargar_targets, codificar_etiquetas, k_fold_estratificado
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', datefmt='%H:%M:%S')
+
+# --- CONFIGURACIÓN ---
+RUTA_DATASET = "./datasets_generados/dataset_Original"
+RUTA_TARGETS = "./binario.txt"
+K_PLIEGUES = 5
+SEMILLA_PLIEGUES = 42
+CONFIG = {
+    'neuronas_ocultas': 25,
+    'activacion_oculta': 'relu',
+    'activacion_salida': 'sigmoide',
+    'tasa_aprendizaje': 0.01,
+    'momentum': 0.9,
+    'semilla': 1
+}
+MAX_EPOCAS = 300
+ERROR_DESEADO = 0.001
+N_PROCESOS = min(K_PLIEGUES, os.cpu_count() or 1)
+DIR_CACHE = "./cache_busqueda"  # X e Y ordenados por pliegue en .npy; cada proceso los abre como memmap
+# ---------------------
+
+def preparar_dataset_compartido(ruta_dataset, ruta_targets, k=K_PLIEGUES, dir_cache=DIR_CACHE):
+    """
+    Decodifica todas las imágenes una sola vez (sin división) y guarda X e Y
+    como .npy para que los procesos los abran con mmap_mode='r'.
+
+    Las filas se guardan agrupadas por pliegue (P1..Pk) y repetidas dos veces
+    (P1..Pk P1..Pk). Así la validación del pliegue i es el tramo Pi y su
+    entrenamiento el tramo contiguo P(i+1)..P(i-1) de la segunda vuelta: cada
+    proceso trabaja con slices del memmap, sin copiar filas, y todos comparten
+    las mismas páginas del archivo (el doble del dataset en disco/caché, en vez
+    de una copia privada por proceso).
+    Devuelve (rutas, limites, clases_info) o None si no hay datos; 'limites'
+    tiene el (inicio, fin) de cada pliegue dentro de la primera vuelta.
+    """
+    clases_info, _ = cargar_targets(ruta_targets)
+    X, clases_patrones, _, _, _, _, _ = cargar_imagenes_dataset(
+        ruta_dataset, clases_info.keys(), porcentaje_entrenamiento=1.0, semilla=SEMILLA_PLIEGUES, dtype=np.float32
+    )
+    if len(X) == 0:
+        return None
+
+    indices_val = [idx_val for _, idx_val in k_fold_estratificado(clases_patrones, k, SEMILLA_PLIEGUES)]
+    orden = np.concatenate(indices_val)
+    fines = np.cumsum([len(idx) for idx in indices_val])
+    limites = [(int(fin - len(idx)), int(fin)) for idx, fin in zip(indices_val, fines)]
+    Y = codificar_etiquetas(clases_patrones, clases_info)
+
+    os.makedirs(dir_cache, exist_ok=True)
+    prefijo = os.path.join(dir_cache, f"{os.path.basename(os.path.normpath(ruta_dataset))}__"
+                                      f"{os.path.splitext(os.path.basename(ruta_targets))[0]}__k{k}")
+    rutas = {"X": f"{prefijo}__X.npy", "Y": f"{prefijo}__Y.npy"}
+    for clave, datos in (("X", X), ("Y", Y)):
+        destino = np.lib.format.open_memmap(rutas[clave], mode='w+', dtype=datos.dtype,
+                                            shape=(2 * len(orden),) + datos.shape[1:])
+        destino[:len(orden)] = datos[orden]; destino[len(orden):] = destino[:len(orden)]
+        destino.flush(); del destino
+    return rutas, limites, clases_info
+
+def entrenar_pliegue(numero, rutas, inicio_val, fin_val, clases_info, config=CONFIG, max_epocas=MAX_EPOCAS):
+    """
+    Entrena y evalúa un pliegue (se ejecuta en un proceso del pool). Train y
+    validación son slices del memmap (ver preparar_dataset_compartido).
+    """
+    X = np.load(rutas["X"], mmap_mode='r')
+    Y = np.load(rutas["Y"], mmap_mode='r')
+    n_patrones = len(X) // 2
+    X_train, Y_train = X[fin_val:inicio_val + n_patrones], Y[fin_val:inicio_val + n_patrones]
+    X_val, Y_val = X[inicio_val:fin_val], Y[inicio_val:fin_val]
+
+    inicio = time.perf_counter()
+    mlp = MLP(X.shape[1], config['neuronas_ocultas'], Y.shape[1],
+              activacion_oculta=config['activacion_oculta'], activacion_salida=config['activacion_salida'],
+              semilla=config['semilla'], dtype=np.float32)
+    epoca, _, _, _, _, _ = mlp.entrenar_bloque(
+        X_train, Y_train, X_val, Y_val, clases_info, config['tasa_aprendizaje'], ERROR_DESEADO,
+        config['momentum'], epoca_inicio=0, max_epocas_bloque=max_epocas, cancel_event=lambda: False
+    )
+    mse_train, _ = mlp._calcular_metricas(X_train, Y_train, clases_info)
+    mse_val, matriz_val = mlp._calcular_metricas(X_val, Y_val, clases_info)
+    return {
+        "pliegue": numero,
+        "epocas": epoca,
+        "mse_train": float(mse_train),
+        "mse_val": float(mse_val),
+        "precision_val": float(np.trace(matriz_val) / len(X_val)),
+        "matriz_val": matriz_val,
+        "segundos": time.perf_counter() - inicio
+    }
+
+def agregar_resultados(resultados):
+    """Media y desviación de MSE/precisión y matriz de confusión sumada de todos los pliegues."""
+    mse_val = np.array([r["mse_val"] for r in resultados])
+    precision_val = np.array([r["precision_val"] for r in resultados])
+    return {
+        "pliegues": len(resultados),
+        "mse_val_media": float(mse_val.mean()),
+        "mse_val_desv": float(mse_val.std()),
+        "precision_val_media": float(precision_val.mean()),
+        "precision_val_desv": float(precision_val.std()),
+        "matriz_val_total": np.sum([r["matriz_val"] for r in resultados], axis=0)
+    }
+
+def validacion_cruzada(ruta_dataset=RUTA_DATASET, ruta_targets=RUTA_TARGETS, k=K_PLIEGUES, config=CONFIG):
+    logging.info(f"Validación cruzada estratificada ({k} pliegues) sobre {ruta_dataset}...")
+    preparado = preparar_dataset_compartido(ruta_dataset, ruta_targets, k, DIR_CACHE)
+    if preparado is None:
+        logging.error(f"No se cargaron datos para {ruta_dataset}")
+        return None
+    rutas, limites, clases_info = preparado
+    logging.info(f"{limites[-1][1]} patrones. Configuración: {config}")
+
+    resultados = []
+    with ProcessPoolExecutor(max_workers=N_PROCESOS) as pool:
+        futuros = {pool.submit(entrenar_pliegue, i + 1, rutas, inicio, fin, clases_info, config, MAX_EPOCAS): i + 1
+                   for i, (inicio, fin) in enumerate(limites)}
+        for futuro in as_completed(futuros):
+            try:
+                r = futuro.result()
+            except Exception as e:
+                logging.error(f"El pliegue {futuros[futuro]}/{k} falló: {e}")
+                continue
+            resultados.append(r)
+            logging.info(f"Pliegue {r['pliegue']}/{k} | Épocas: {r['epocas']} | MSE (Val): {r['mse_val']:.6f} | "
+                         f"Precisión (Val): {r['precision_val']:.2%} ({r['segundos']:.1f}s)")
+
+    if not resultados:
+        logging.error("Ningún pliegue terminó; no hay resumen.")
+        return None
+    if len(resultados) < k:
+        logging.warning(f"El resumen solo incluye {len(resultados)} de {k} pliegues.")
+    resumen = agregar_resultados(resultados)
+    logging.info("--- RESUMEN DE LA VALIDACIÓN CRUZADA ---")
+    logging.info(f"MSE (Val): {resumen['mse_val_media']:.6f} ± {resumen['mse_val_desv']:.6f}")
+    logging.info(f"Precisión (Val): {resumen['precision_val_media']:.2%} ± {resumen['precision_val_desv']:.2%}")
+    logging.info(f"Matriz de confusión (suma de pliegues, filas = real):\n{resumen['matriz_val_total'].astype(int)}")
+    return resumen
+
+if __name__ == "__main__":
+    validacion_cruzada()
@@ -0,0 +1,157 @@
+# visor_matriz.py
+"""
+Visor de matrices de píxeles por ventana (viewport).
+
+Antes se formateaba la matriz completa con np.array2string (más de un millón
+de números para una foto de 736x1600) en cada actualización de la
+previsualización. VisorMatriz solo formatea las filas y columnas que caben en
+el widget:
+
+- Cada celda tiene un ancho fijo en caracteres, así que una fila formateada se
+  recorta por columnas con un simple slice del string.
+- Las filas formateadas se guardan en una caché LRU; al desplazarse solo se
+  formatean las filas nuevas.
+- Las barras de desplazamiento son "virtuales": indican la posición dentro de
+  la matriz, no dentro del texto (que solo contiene la ventana visible).
+- Rueda: desplaza filas; Shift+rueda: columnas; Ctrl+rueda: zoom (tamaño de letra).
+"""
+import tkinter as tk
+from tkinter import ttk, font as tkfont
+from collections import OrderedDict
+import numpy as np
+
+FUENTE_MATRIZ = "Courier"
+TAMANO_FUENTE = 9
+TAMANO_FUENTE_MIN = 6
+TAMANO_FUENTE_MAX = 20
+MAX_FILAS_CACHE = 512        # Filas formateadas que se conservan
+LINEAS_CABECERA = 2          # Línea de información + separador
+
+class VisorMatriz(ttk.Frame):
+    def __init__(self, master, height=10, **kwargs):
+        super().__init__(master, **kwargs)
+        self.fuente = tkfont.Font(family=FUENTE_MATRIZ, size=TAMANO_FUENTE)
+        self.scroll_v = ttk.Scrollbar(self, orient="vertical", command=self._desplazar_filas)
+        self.scroll_h = ttk.Scrollbar(self, orient="horizontal", command=self._desplazar_columnas)
+        self.texto = tk.Text(self, height=height, state="disabled", font=self.fuente, wrap="none")
+        self.scroll_v.pack(side="right", fill="y"); self.scroll_h.pack(side="bottom", fill="x")
+        self.texto.pack(fill="both", expand=True)
+
+        self.matriz = None
+        self.info = ""
+        self.fila0 = 0; self.col0 = 0
+        self.ancho_celda = 1
+        self._formato = None
+        self._filas_formateadas = OrderedDict()  # índice de fila -> string de la fila completa
+
+        self.texto.bind("<Configure>", lambda e: self._renderizar())
+        for secuencia in ("<MouseWheel>", "<Shift-MouseWheel>", "<Control-MouseWheel>",
+                          "<Button-4>", "<Button-5>", "<Shift-Button-4>", "<Shift-Button-5>",
+                          "<Control-Button-4>", "<Control-Button-5>"):
+            self.texto.bind(secuencia, self._al_usar_rueda)
+
+    def mostrar(self, matriz):
+        """
+        Muestra una matriz (imagen como array). Si tiene 3 dimensiones se muestra el
+        primer canal. Si la forma no cambia se conserva la posición del visor.
+        """
+        matriz = np.asarray(matriz)
+        if matriz.ndim == 3:
+            matriz_display = matriz[:, :, 0]
+            self.info = f"Mostrando 1er Canal (Rojo) - Dimensiones: {matriz.shape}"
+        else:
+            matriz_display = matriz
+            self.info = f"Mostrando Canal Único (Gris) - Dimensiones: {matriz.shape}"
+        matriz_display = np.atleast_2d(matriz_display)
+        if matriz_display.dtype == bool: matriz_display = matriz_display.astype(np.uint8)
+        if self.matriz is None or self.matriz.shape != matriz_display.shape:
+            self.fila0 = 0; self.col0 = 0
+        self.matriz = matriz_display
+        self._filas_formateadas.clear()
+
+        # Ancho fijo de celda: el del valor más largo (con signo) + 1 espacio de separación
+        formato_valor = "{:d}" if np.issubdtype(matriz_display.dtype, np.integer) else "{:.0f}"
+        extremos = (matriz_display.min(), matriz_display.max()) if matriz_display.size else (0,)
+        self.ancho_celda = max(len(formato_valor.format(v)) for v in extremos) + 1
+        self._formato = formato_valor.replace("{:", "{:>%d" % self.ancho_celda)
+        self._renderizar()
+
+    def vaciar(self):
+        self.matriz = None; self._filas_formateadas.clear()
+        self.texto.config(state="normal"); self.texto.delete("1.0", tk.END); self.texto.config(state="disabled")
+        self.scroll_v.set(0, 1); self.scroll_h.set(0, 1)
+
+    def _fila_formateada(self, i):
+        fila = self._filas_formateadas.get(i)
+        if fila is None:
+            fila = "".join(map(self._formato.format, self.matriz[i].tolist()))
+            self._filas_formateadas[i] = fila
+            if len(self._filas_formateadas) > MAX_FILAS_CACHE:
+                self._filas_formateadas.popitem(last=False)
+        else:
+            self._filas_formateadas.move_to_end(i)
+        return fila
+
+    def _tamano_ventana(self):
+        """(filas, columnas) de la matriz que caben en el widget con la fuente actual."""
+        alto_linea = max(1, self.fuente.metrics("linespace"))
+        ancho_caracter = max(1, self.fuente.measure("0"))
+        filas = max(1, self.texto.winfo_height() // alto_linea - LINEAS_CABECERA)
+        columnas = max(1, self.texto.winfo_width() // (ancho_caracter * self.ancho_celda))
+        return filas, columnas
+
+    def _limitar_posicion(self, filas, columnas):
+        alto, ancho = self.matriz.shape
+        self.fila0 = max(0, min(self.fila0, alto - filas))
+        self.col0 = max(0, min(self.col0, ancho - columnas))
+        return alto, ancho
+
+    def _renderizar(self):
+        if self.matriz is None: return
+        filas, columnas = self._tamano_ventana()
+        alto, ancho = self._limitar_posicion(filas, columnas)
+        fila_fin = min(alto, self.fila0 + filas); col_fin = min(ancho, self.col0 + columnas)
+        inicio_txt, fin_txt = self.col0 * self.ancho_celda, col_fin * self.ancho_celda
+        lineas = [self._fila_formateada(i)[inicio_txt:fin_txt] for i in range(self.fila0, fila_fin)]
+        cabecera = (f"{self.info} | Filas {self.fila0}-{fila_fin - 1}, Columnas {self.col0}-{col_fin - 1}\n"
+                    + "-" * 20 + "\n")
+
+        self.texto.config(state="normal")
+        self.texto.delete("1.0", tk.END)
+        self.texto.insert(tk.END, cabecera + "\n".join(lineas))
+        self.texto.config(state="disabled")
+        self.scroll_v.set(self.fila0 / max(alto, 1), fila_fin / max(alto, 1))
+        self.scroll_h.set(self.col0 / max(ancho, 1), col_fin / max(ancho, 1))
+
+    def _desplazar(self, args, eje):
+        """Interpreta los argumentos de la Scrollbar: ('moveto', fracción) o ('scroll', n, 'units'|'pages')."""
+        if self.matriz is None: return
+        filas, columnas = self._tamano_ventana()
+        total = self.matriz.shape[eje]
+        pagina = filas if eje == 0 else columnas
+        posicion = self.fila0 if eje == 0 else self.col0
+        if args[0] == "moveto":
+            posicion = int(float(args[1]) * total)
+        elif args[0] == "scroll":
+            paso = int(args[1]) * (pagina if args[2] == "pages" else 1)
+            posicion += paso
+        if eje == 0: self.fila0 = posicion
+        else: self.col0 = posicion
+        self._renderizar()
+
+    def _desplazar_filas(self, *args): self._desplazar(args, 0)
+    def _desplazar_columnas(self, *args): self._desplazar(args, 1)
+
+    def _al_usar_rueda(self, evento):
+        if getattr(evento, "num", None) in (4, 5):
+            sentido = -1 if evento.num == 4 else 1
+        else:
+            sentido = -1 if evento.delta > 0 else 1
+        if evento.state & 0x0004:    # Control: zoom
+            self.fuente.configure(size=max(TAMANO_FUENTE_MIN, min(TAMANO_FUENTE_MAX, self.fuente.cget("size") - sentido)))
+            self._renderizar()
+        elif evento.state & 0x0001:  # Shift: columnas
+            self._desplazar(("scroll", 3 * sentido, "units"), 1)
+        else:
+            self._desplazar(("scroll", 3 * sentido, "units"), 0)
+        return "break"